@@ -19,6 +19,8 @@ from blueprints.chat.routes import init_app as chat_init_app
 from blueprints.job.routes import job_bp
 from blueprints.extra.addon import addon_bp
 from blueprints.hire.routes import hire_bp
+from utils import instrumentation
+from extra import fixtures
 
 
 
@@ -39,6 +41,17 @@ app.config.update({
     'SESSION_COOKIE_HTTPONLY': True,
     'SESSION_COOKIE_SECURE': True,
     'SESSION_COOKIE_SAMESITE': 'Lax',
+    'PASSWORD_HASH_METHOD': os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1'),
+    'PASSWORD_HASH_OFFLOAD': os.getenv('PASSWORD_HASH_OFFLOAD', '1') == '1',
+    # per-endpoint query counts / timings, Server-Timing and /api/_metrics
+    'INSTRUMENTATION_ENABLED': os.getenv('INSTRUMENTATION_ENABLED', '0') == '1',
+    'SLOW_QUERY_THRESHOLD_MS': float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100')),
+    'SLOW_QUERY_TOP_N': int(os.getenv('SLOW_QUERY_TOP_N', '50')),
+    # /extra/add_items bulk seeding, for load-test environments only
+    'EXTRA_ENDPOINTS_ENABLED': os.getenv('EXTRA_ENDPOINTS_ENABLED', '0') == '1',
+    'ADD_ITEMS_MAX': int(os.getenv('ADD_ITEMS_MAX', '20000')),
+    'ADD_ITEMS_CHUNK': int(os.getenv('ADD_ITEMS_CHUNK', '1000')),
+    'ADD_ITEMS_HASH_WORKERS': int(os.getenv('ADD_ITEMS_HASH_WORKERS', str(os.cpu_count() or 4))),
 })
 
 csrf = CSRFProtect(app)
@@ -67,6 +80,8 @@ db.init_app(app)
 migrate = Migrate(app, db)
 socketio.init_app(app, cors_allowed_origins="*")
 login_manager.init_app(app)
+instrumentation.init_app(app)
+fixtures.init_app(app)
 
 # register blueprints
 app.register_blueprint(auth_bp,      url_prefix='/api/auth')
@@ -74,7 +89,8 @@ app.register_blueprint(client_bp,    url_prefix='/api/client')
 app.register_blueprint(candidate_bp, url_prefix='/api/candidate')
 app.register_blueprint(marketplace_bp)
 app.register_blueprint(job_bp)  # Register job blueprint without url_prefix to use /api/jobs
-app.register_blueprint(addon_bp )
+app.register_blueprint(addon_bp)
+csrf.exempt(addon_bp)
 app.register_blueprint(hire_bp)
 
 chat_init_app(app)
@@ -1,11 +1,49 @@
+import os
 from flask import Blueprint, request, jsonify, session
+from sqlalchemy import event
 from db.models import db, User
 from extensions import login_manager, limiter
 from flask_login import login_user, logout_user
+from utils.cache import TTLCache
 from utils.security import sanitize_html
 
 auth_bp = Blueprint('auth', __name__)
 
+# Flask-Login resolves ``current_user`` on every request and Socket.IO event;
+# keep the few fields it needs in memory instead of querying ``user`` each time.
+identity_cache = TTLCache(
+    maxsize=int(os.getenv('IDENTITY_CACHE_SIZE', 4096)),
+    ttl=float(os.getenv('IDENTITY_CACHE_TTL', 300)),
+)
+
+
+class SessionUser:
+    """Lightweight, detached stand-in for :class:`User` built from the cache."""
+
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+    def get_id(self):
+        return str(self.id)
+
+
+def invalidate_identity(user_id):
+    """Drop *user_id* from the identity cache (call after signup/role change)."""
+    identity_cache.invalidate(int(user_id))
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    if target.id is not None:
+        invalidate_identity(target.id)
+
 def login_required(func):
     """Decorator to ensure the user is authenticated (any role)."""
     def wrapper(*args, **kwargs):
@@ -17,7 +55,32 @@ def login_required(func):
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    identity = identity_cache.get(user_id)
+    if identity is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        identity = (user.id, user.username, user.role)
+        identity_cache.set(user_id, identity)
+    return SessionUser(*identity)
+
+PROFILE_SESSION_KEYS = {'client': 'company_id', 'candidate': 'candidate_id'}
+
+
+def resolve_profile_id(user_id, role):
+    """Return ``(session_key, profile_id)`` for the user's company/candidate row."""
+    key = PROFILE_SESSION_KEYS.get(role)
+    if key == 'company_id':
+        from db.company_models import Company
+        profile_id = db.session.query(Company.id).filter_by(user_id=user_id).scalar()
+    elif key == 'candidate_id':
+        from db.candidate_models import CandidateProfile
+        profile_id = db.session.query(CandidateProfile.id).filter_by(user_id=user_id).scalar()
+    else:
+        profile_id = None
+    return key, profile_id
+
 
 @auth_bp.route('/login', methods=['POST'])
 @limiter.limit("5 per minute")
@@ -25,23 +88,26 @@ def login():
     data = request.json
     user = User.query.filter_by(username=data['username']).first()
     if user and user.check_password(data['password']):
+        if user.password_needs_rehash():
+            # hashing parameters changed since this hash was stored
+            user.set_password(data['password'])
+            db.session.commit()
+        # drop the previous identity's cached profile ids; the CSRF token stays
+        for stale in PROFILE_SESSION_KEYS.values():
+            session.pop(stale, None)
         login_user(user)
         session.permanent = True
         session['user_id'] = user.id
         session['role'] = user.role
+        session['username'] = user.username
 
         response_data = {"message": "Logged in", "role": user.role, "user_id": user.id}
 
-        if user.role == 'client':
-            from db.company_models import Company
-            company = Company.query.filter_by(user_id=user.id).first()
-            if company:
-                response_data["company_id"] = company.id
-        elif user.role == 'candidate':
-            from db.candidate_models import CandidateProfile
-            candidate = CandidateProfile.query.filter_by(user_id=user.id).first()
-            if candidate:
-                response_data["candidate_id"] = candidate.id
+        # remember the profile id so /me can answer from the signed session
+        key, profile_id = resolve_profile_id(user.id, user.role)
+        if profile_id:
+            session[key] = profile_id
+            response_data[key] = profile_id
 
         return jsonify(response_data), 200
     return jsonify({"error": "Invalid credentials"}), 401
@@ -72,6 +138,7 @@ def signup():
         user.set_password(password)
         db.session.add(user)
         db.session.commit()
+        invalidate_identity(user.id)
 
         if user.role == 'candidate':
             from db.models import CandidateProfile
@@ -118,11 +185,34 @@ def signup():
 
 @auth_bp.route('/me', methods=['GET'])
 def me():
+    """Return the logged-in identity, straight from the session when possible.
+
+    ``login`` stores username, role and the company/candidate id in the
+    signed session cookie, so the common case touches no table at all.
+    Sessions created before that (no ``username``) are refreshed from the
+    ``user`` table once, and a profile created after login is looked up
+    until it exists.
+    """
     user_id = session.get('user_id')
     if not user_id:
         return jsonify({"error": "Not logged in"}), 401
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-    # Return user id along with username and role
-    return jsonify({"user_id": user.id, "username": user.username, "role": user.role}), 200
+
+    if 'username' not in session:
+        user = db.session.get(User, user_id)
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        session['username'] = user.username
+        session['role'] = user.role
+
+    role = session.get('role')
+    response_data = {"user_id": user_id, "username": session['username'], "role": role}
+
+    key = PROFILE_SESSION_KEYS.get(role)
+    if key:
+        if not session.get(key):
+            _, profile_id = resolve_profile_id(user_id, role)
+            if profile_id:
+                session[key] = profile_id
+        response_data[key] = session.get(key)
+
+    return jsonify(response_data), 200
@@ -1,14 +1,21 @@
 # blueprints/candidate/routes.py
-from flask import Blueprint, request, jsonify, session
-from sqlalchemy.orm import joinedload
+from flask import Blueprint, Response, request, jsonify, session
+from sqlalchemy.exc import IntegrityError
 from utils.security import sanitize_html
+from utils.candidate_profile import (
+    cached_full_profile,
+    current_version,
+    profile_etag,
+    touch_profile,
+)
+from utils.collection_sync import existing_keys, sync_collection
+from utils.skills import existing_skill_ids, get_or_create_skills, normalize_skill_name
 from db.models import (
     CandidateProfile,
     EmploymentHistory,
     LegalDocument,
     JobApplication,
     CandidateSkill,
-    Skill,
     Education,
     Hire,
     Conversation,
@@ -32,6 +39,26 @@ def candidate_required(func):
     wrapper.__name__ = func.__name__
     return wrapper
 
+def full_profile_response(candidate_id):
+    """Serve the cached full profile with an ETag; 304 when the client's copy is current."""
+    version = current_version(candidate_id)
+    if version is None:
+        return jsonify({"error": "Candidate not found"}), 404
+    etag = profile_etag(candidate_id, version)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        entry = cached_full_profile(candidate_id, version)
+        if entry is None:
+            return jsonify({"error": "Candidate not found"}), 404
+        version, payload = entry
+        response = jsonify(payload)
+        etag = profile_etag(candidate_id, version)
+    response.set_etag(etag)
+    # let browsers keep the copy but always revalidate it
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @candidate_bp.route('/<int:candidate_id>/full/public', methods=['GET'])
 @login_required
 def get_candidate_full_public(candidate_id):
@@ -39,94 +66,7 @@ def get_candidate_full_public(candidate_id):
     Public endpoint to retrieve a candidate and all related info by candidate ID.
     Accessible to any authenticated user.
     """
-    candidate = CandidateProfile.query.options(
-        joinedload(CandidateProfile.employments),
-        joinedload(CandidateProfile.documents),
-        joinedload(CandidateProfile.applications),
-        joinedload(CandidateProfile.candidate_skills).joinedload(CandidateSkill.skill),
-        joinedload(CandidateProfile.educations),
-    ).filter_by(id=candidate_id).first()
-
-    if not candidate:
-        return jsonify({"error": "Candidate not found"}), 404
-
-    profile = {
-        "id": candidate.id,
-        "user_id": candidate.user_id,
-        "full_name": candidate.full_name,
-        "email": candidate.email,
-        "phone": candidate.phone,
-        "city": candidate.city,
-        "country": candidate.country,
-        "profile_picture": candidate.profile_picture,
-        "summary": candidate.summary,
-    }
-
-    employments = [
-        {
-            "id": emp.id,
-            "company_name": emp.company_name,
-            "position": emp.position,
-            "start_date": emp.start_date.isoformat(),
-            "end_date": emp.end_date.isoformat() if emp.end_date else None,
-            "description": emp.description,
-        }
-        for emp in candidate.employments
-    ]
-
-    documents = [
-        {
-            "id": doc.id,
-            "doc_type": doc.doc_type,
-            "file_path": doc.file_path,
-            "uploaded_at": doc.uploaded_at.isoformat(),
-        }
-        for doc in candidate.documents
-    ]
-
-    applications = [
-        {
-            "id": app.id,
-            "job_title": app.job_position.title if app.job_position else None,
-            "company_name": app.job_position.company.name if app.job_position and app.job_position.company else None,
-            "applied_at": app.applied_at.isoformat(),
-            "status": app.status,
-            "resume_path": app.resume_path,
-            "cover_letter_path": app.cover_letter_path,
-        }
-        for app in candidate.applications
-    ]
-
-    skills = [
-        {
-            "skill_id": cs.skill.id,
-            "name": cs.skill.name,
-            "proficiency": cs.proficiency,
-        }
-        for cs in candidate.candidate_skills
-    ]
-
-    educations = [
-        {
-            "id": edu.id,
-            "institution": edu.institution,
-            "degree": edu.degree,
-            "field_of_study": edu.field_of_study,
-            "start_date": edu.start_date.isoformat() if edu.start_date else None,
-            "end_date": edu.end_date.isoformat() if edu.end_date else None,
-            "description": edu.description,
-        }
-        for edu in candidate.educations
-    ]
-
-    return jsonify({
-        "profile": profile,
-        "employments": employments,
-        "documents": documents,
-        "applications": applications,
-        "skills": skills,
-        "educations": educations,
-    })
+    return full_profile_response(candidate_id)
 
 @candidate_bp.route('/', methods=['GET'])
 @candidate_required
@@ -185,96 +125,7 @@ def get_candidate_full(candidate_id):
     """
     Retrieve a candidate and all related info by candidate ID.
     """
-    # Eager‑load all relationships
-    candidate = CandidateProfile.query.options(
-        joinedload(CandidateProfile.employments),
-        joinedload(CandidateProfile.documents),
-        joinedload(CandidateProfile.applications),
-        joinedload(CandidateProfile.candidate_skills).joinedload(CandidateSkill.skill),
-        joinedload(CandidateProfile.educations),
-    ).filter_by(id=candidate_id).first()
-
-    if not candidate:
-        return jsonify({"error": "Candidate not found"}), 404
-
-    # Serialize
-    profile = {
-        "id": candidate.id,
-        "user_id": candidate.user_id,
-        "full_name": candidate.full_name,
-        "email": candidate.email,
-        "phone": candidate.phone,
-        "city": candidate.city,
-        "country": candidate.country,
-        "profile_picture": candidate.profile_picture,
-        "summary": candidate.summary,
-    }
-
-    employments = [
-        {
-            "id": emp.id,
-            "company_name": emp.company_name,
-            "position": emp.position,
-            "start_date": emp.start_date.isoformat(),
-            "end_date": emp.end_date.isoformat() if emp.end_date else None,
-            "description": emp.description,
-        }
-        for emp in candidate.employments
-    ]
-
-    documents = [
-        {
-            "id": doc.id,
-            "doc_type": doc.doc_type,
-            "file_path": doc.file_path,
-            "uploaded_at": doc.uploaded_at.isoformat(),
-        }
-        for doc in candidate.documents
-    ]
-
-    applications = [
-        {
-            "id": app.id,
-            "job_title": app.job_position.title if app.job_position else None,
-            "company_name": app.job_position.company.name if app.job_position and app.job_position.company else None,
-            "applied_at": app.applied_at.isoformat(),
-            "status": app.status,
-            "resume_path": app.resume_path,
-            "cover_letter_path": app.cover_letter_path,
-        }
-        for app in candidate.applications
-    ]
-
-    skills = [
-        {
-            "skill_id": cs.skill.id,
-            "name": cs.skill.name,
-            "proficiency": cs.proficiency,
-        }
-        for cs in candidate.candidate_skills
-    ]
-
-    educations = [
-        {
-            "id": edu.id,
-            "institution": edu.institution,
-            "degree": edu.degree,
-            "field_of_study": edu.field_of_study,
-            "start_date": edu.start_date.isoformat() if edu.start_date else None,
-            "end_date": edu.end_date.isoformat() if edu.end_date else None,
-            "description": edu.description,
-        }
-        for edu in candidate.educations
-    ]
-
-    return jsonify({
-        "profile": profile,
-        "employments": employments,
-        "documents": documents,
-        "applications": applications,
-        "skills": skills,
-        "educations": educations,
-    })
+    return full_profile_response(candidate_id)
 
 @candidate_bp.route('/<int:candidate_id>/full', methods=['PATCH'])
 @candidate_required
@@ -284,21 +135,15 @@ def update_candidate_full(candidate_id):
     Expects JSON payload like:
     {
       "profile": { ... },          # only fields you want to change
-      "employments": [ {...}, ... ],  # sync logic as before
-      "documents": [ {...}, ... ],
+      "employments": [ {...}, ... ],  # rows with a known id are updated,
+      "documents": [ {...}, ... ],    # the rest inserted, missing ones deleted
       "applications": [ {...}, ... ],
-      "skills": [ { "skill_id": X, "proficiency": "..." }, ... ],
+      "skills": [ { "skill_id": X | "name": "...", "proficiency": "..." }, ... ],
       "educations": [ {...}, ... ]
     }
     """
     data = request.get_json() or {}
-    candidate = CandidateProfile.query.options(
-        joinedload(CandidateProfile.employments),
-        joinedload(CandidateProfile.documents),
-        joinedload(CandidateProfile.applications),
-        joinedload(CandidateProfile.candidate_skills),
-        joinedload(CandidateProfile.educations),
-    ).filter_by(id=candidate_id).first()
+    candidate = CandidateProfile.query.filter_by(id=candidate_id).first()
 
     if not candidate:
         return jsonify({"error": "Candidate not found"}), 404
@@ -314,54 +159,47 @@ def update_candidate_full(candidate_id):
                 value = sanitize_html(value)
             setattr(candidate, field, value)
 
-    # 2) Helper to sync collections (same as your PUT version)
-    def sync_collection(existing_objs, incoming_list, model, unique_key):
-        existing_index = {getattr(obj, unique_key): obj for obj in existing_objs if getattr(obj, unique_key) is not None}
-        incoming_ids = set()
-        for item in incoming_list:
-            item_id = item.get(unique_key)
-            if item_id and item_id in existing_index:
-                obj = existing_index[item_id]
-                for k, v in item.items():
-                    if hasattr(obj, k):
-                        setattr(obj, k, v)
-            else:
-                new_obj = model(**{k: v for k, v in item.items() if hasattr(model, k)})
-                existing_objs.append(new_obj)
-            if item_id:
-                incoming_ids.add(item_id)
-        for obj in list(existing_objs):
-            if getattr(obj, unique_key) not in incoming_ids:
-                existing_objs.remove(obj)
-
-    # 3) Sync each related list only if provided
-    if "employments" in data:
-        sync_collection(candidate.employments, data["employments"], EmploymentHistory, "id")
-    if "documents" in data:
-        sync_collection(candidate.documents, data["documents"], LegalDocument, "id")
-    if "applications" in data:
-        sync_collection(candidate.applications, data["applications"], JobApplication, "id")
-
-    if "skills" in data:
-        existing_skills = {cs.skill_id: cs for cs in candidate.candidate_skills}
-        incoming_skill_ids = set()
-        for item in data["skills"]:
-            sid = item["skill_id"]
-            incoming_skill_ids.add(sid)
-            if sid in existing_skills:
-                existing_skills[sid].proficiency = item.get("proficiency")
-            else:
-                skill = Skill.query.get(sid)
-                if skill:
-                    candidate.candidate_skills.append(
-                        CandidateSkill(skill_id=sid, proficiency=item.get("proficiency"))
-                    )
-        for sid, cs in list(existing_skills.items()):
-            if sid not in incoming_skill_ids:
-                candidate.candidate_skills.remove(cs)
-
-    if "educations" in data:
-        sync_collection(candidate.educations, data["educations"], Education, "id")
-
+    # 2) Sync each related list only if provided, a few statements per section
+    changes = {}
+    sections = (
+        ("employments", EmploymentHistory),
+        ("documents", LegalDocument),
+        ("applications", JobApplication),
+        ("educations", Education),
+    )
+    try:
+        for section, model in sections:
+            if section in data:
+                changes[section] = sync_collection(model, "candidate_id", candidate.id, data[section])
+
+        if "skills" in data:
+            # items name a skill by id or by name; unknown names are created
+            ids_by_name = get_or_create_skills(
+                item["name"] for item in data["skills"] if item.get("skill_id") is None and item.get("name")
+            )
+            incoming = {}
+            for item in data["skills"]:
+                sid = item.get("skill_id")
+                if sid is None:
+                    sid = ids_by_name.get(normalize_skill_name(item.get("name")))
+                if sid is not None:
+                    incoming[sid] = item.get("proficiency")
+
+            linked = existing_keys(CandidateSkill, "candidate_id", candidate.id, key="skill_id")
+            valid = linked | existing_skill_ids(sid for sid in incoming if sid not in linked)
+            changes["skills"] = sync_collection(
+                CandidateSkill, "candidate_id", candidate.id,
+                [{"skill_id": sid, "proficiency": p} for sid, p in incoming.items() if sid in valid],
+                key="skill_id", existing=linked,
+            )
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Conflicting related records"}), 409
+    except ValueError as e:
+        db.session.rollback()
+        # e.g. "start_date: invalid date 'soon'"
+        return jsonify({"error": str(e)}), 400
+
+    touch_profile(candidate.id)
     db.session.commit()
-    return jsonify({"status": "success"}), 200
+    return jsonify({"status": "success", "changes": changes}), 200
@@ -44,8 +44,18 @@ from flask import (
 )
 from flask_login import current_user, login_required
 from flask_socketio import disconnect, emit, join_room, leave_room
-
-from db.models import Conversation, Message, Participant, User, db
+from sqlalchemy import and_, func, or_
+
+from db.models import (
+    CandidateProfile,
+    Company,
+    Conversation,
+    Message,
+    Participant,
+    User,
+    db,
+)
+from utils.request_args import BadArgument, int_arg
 from utils.security import sanitize_html
 
 from flask_login import login_required, current_user
@@ -117,25 +127,129 @@ def get_conversation_or_404(conv_id: int) -> Tuple[Conversation, Participant]:
 def conversation_to_dict(conv: Conversation) -> Dict[str, Any]:
     """Lightweight serialiser for *Conversation* objects."""
     last_msg: Message | None = (
-        Message.query.filter_by(conversation_id=conv.id)
-        .order_by(Message.created_at.desc())
-        .first()
-    )
-    unread_count = (
-        Message.query.filter_by(conversation_id=conv.id, is_read=False)
-        .filter(Message.sender_id != current_user.id)
-        .count()
+        db.session.get(Message, conv.last_message_id)
+        if conv.last_message_id
+        else None
     )
+    part = db.session.get(Participant, (conv.id, current_user.id))
+    return _conversation_payload(conv, last_msg, part.unread_count if part else 0)
+
+
+def _conversation_payload(
+    conv: Conversation, last_msg: Message | None, unread_count: int
+) -> Dict[str, Any]:
+    """Build the JSON shape shared by single and inbox conversation views."""
     return {
         "id": conv.id,
         "title": getattr(conv, "title", None),
         "created_at": conv.created_at.isoformat(),
-        "updated_at": getattr(conv, "updated_at", conv.created_at).isoformat(),
+        "updated_at": (conv.last_message_at or conv.created_at).isoformat(),
         "last_message": message_to_dict(last_msg) if last_msg else None,
+        "message_count": conv.message_count or 0,
         "unread_count": unread_count,
     }
 
 
+def inbox_rows(user_id: int) -> List[Tuple[Conversation, Message | None, int]]:
+    """Return *(conversation, last_message, unread_count)* for *user_id*.
+
+    Reads only the denormalised summary kept by :func:`record_message`:
+    an indexed lookup on ``participants.user_id`` joined to the conversation
+    and its last message by primary key, ordered by recent activity.
+    """
+    rows = (
+        db.session.query(Conversation, Message, Participant.unread_count)
+        .select_from(Participant)
+        .join(Conversation, Conversation.id == Participant.conversation_id)
+        .outerjoin(Message, Message.id == Conversation.last_message_id)
+        .filter(Participant.user_id == user_id)
+        .order_by(
+            Conversation.last_message_at.desc().nulls_last(),
+            Conversation.created_at.desc(),
+        )
+        .all()
+    )
+    return [(conv, msg, unread or 0) for conv, msg, unread in rows]
+
+
+def resolve_display_names(user_ids) -> Dict[int, str]:
+    """Map each existing user id in *user_ids* to a display name.
+
+    Company name wins over candidate full name, falling back to the
+    username.  All ids are resolved with one outer-join ``IN`` query
+    instead of three lookups per user.  Unknown ids are omitted.
+    """
+    ids = {int(uid) for uid in user_ids if uid is not None}
+    if not ids:
+        return {}
+    rows = (
+        db.session.query(
+            User.id, User.username, Company.name, CandidateProfile.full_name
+        )
+        .outerjoin(Company, Company.user_id == User.id)
+        .outerjoin(CandidateProfile, CandidateProfile.user_id == User.id)
+        .filter(User.id.in_(ids))
+        .all()
+    )
+    names: Dict[int, str] = {}
+    for uid, username, company_name, full_name in rows:
+        if uid not in names:
+            names[uid] = company_name or full_name or username or "Unknown"
+    return names
+
+
+def participants_by_conversation(conv_ids) -> Dict[int, List[Dict[str, Any]]]:
+    """Return ``{conversation_id: [{user_id, display_name}, …]}`` in two queries."""
+    conv_ids = list(conv_ids)
+    if not conv_ids:
+        return {}
+    pairs = (
+        db.session.query(Participant.conversation_id, Participant.user_id)
+        .filter(Participant.conversation_id.in_(conv_ids))
+        .all()
+    )
+    names = resolve_display_names(uid for _, uid in pairs)
+    result: Dict[int, List[Dict[str, Any]]] = {cid: [] for cid in conv_ids}
+    for cid, uid in pairs:
+        if uid in names:
+            result[cid].append({"user_id": uid, "display_name": names[uid]})
+    return result
+
+
+def record_message(conv: Conversation, sender_id: int, body: str) -> Message:
+    """Persist a new message and update the conversation summary.
+
+    Counters are bumped with SQL-side increments so concurrent senders on
+    different workers cannot lose updates.  Commits once.
+    """
+    msg = Message(
+        conversation_id=conv.id,
+        sender_id=sender_id,
+        body=sanitize_html(body),
+        created_at=datetime.utcnow(),
+    )
+    db.session.add(msg)
+    db.session.flush()
+
+    Conversation.query.filter_by(id=conv.id).update(
+        {
+            Conversation.last_message_id: msg.id,
+            Conversation.last_message_at: msg.created_at,
+            Conversation.message_count: func.coalesce(Conversation.message_count, 0) + 1,
+        },
+        synchronize_session=False,
+    )
+    Participant.query.filter(
+        Participant.conversation_id == conv.id,
+        Participant.user_id != sender_id,
+    ).update(
+        {Participant.unread_count: Participant.unread_count + 1},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    return msg
+
+
 def message_to_dict(msg: Message) -> Dict[str, Any]:
     """Serialise *Message* objects for JSON responses."""
     return {
@@ -154,55 +268,50 @@ def message_to_dict(msg: Message) -> Dict[str, Any]:
 @inbox_bp.route("/conversations", methods=["GET"])
 @login_required
 def list_conversations() -> Tuple[Any, int]:
-    parts: List[Participant] = Participant.query.filter_by(
-        user_id=current_user.id
-    ).all()
-    conversations = [conversation_to_dict(p.conversation) for p in parts]
+    rows = inbox_rows(current_user.id)
+    participants = participants_by_conversation(conv.id for conv, _, _ in rows)
+    conversations = []
+    for conv, last_msg, unread in rows:
+        payload = _conversation_payload(conv, last_msg, unread)
+        payload["participants"] = participants.get(conv.id, [])
+        conversations.append(payload)
     return jsonify(conversations), 200
 
 @inbox_bp.route("/conversations/<int:conv_id>/participants", methods=["GET"])
 @login_required
 def get_conversation_participants(conv_id: int):
     conv, _ = get_conversation_or_404(conv_id)
-    participants = Participant.query.filter_by(conversation_id=conv.id).all()
-    result = []
-    for p in participants:
-        user = User.query.get(p.user_id)
-        if not user:
-            continue
-        # Determine display name: check if user is a company or candidate
-        company = None
-        candidate = None
-        try:
-            from db.company_models import Company
-            company = Company.query.filter_by(user_id=user.id).first()
-        except ImportError:
-            company = None
-        try:
-            from db.candidate_models import CandidateProfile
-            candidate = CandidateProfile.query.filter_by(user_id=user.id).first()
-        except ImportError:
-            candidate = None
-
-        display_name = None
-        if company:
-            display_name = company.name
-        elif candidate:
-            display_name = candidate.full_name
-        else:
-            display_name = user.username or "Unknown"
-
-        result.append({
-            "user_id": user.id,
-            "display_name": display_name,
-        })
-    return jsonify(result), 200
+    participants = participants_by_conversation([conv.id])[conv.id]
+    return jsonify(participants), 200
 
 
 @inbox_bp.route("/conversations/<int:conv_id>/messages", methods=["GET"])
 @login_required
 def get_messages(conv_id: int) -> Tuple[Any, int]:
+    """List messages newest-first.
+
+    Two modes are supported:
+
+    * **keyset** – triggered by any of ``before_id``, ``after_id`` or
+      ``limit``.  Walks the ``(conversation_id, created_at, id)`` index from
+      the anchor message, never counts the thread and returns
+      ``next_cursor`` (the id to pass as ``before_id``/``after_id`` next).
+      ``after_id`` pages forward in ascending order; passing both cursors
+      or a non-integer one is a 400.
+    * **offset** – the legacy ``page``/``per_page`` mode with totals.
+    """
     conv, _ = get_conversation_or_404(conv_id)
+    if {"before_id", "after_id", "limit"} & request.args.keys():
+        if "before_id" in request.args and "after_id" in request.args:
+            return jsonify({"error": "Pass either before_id or after_id, not both"}), 400
+        try:
+            page = _keyset_messages(conv.id)
+        except BadArgument as e:
+            return jsonify({"error": str(e)}), 400
+        if page is None:
+            return jsonify({"error": "Unknown cursor"}), 400
+        return jsonify(page), 200
+
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 50, type=int)
 
@@ -222,6 +331,58 @@ def get_messages(conv_id: int) -> Tuple[Any, int]:
     return jsonify(resp), 200
 
 
+def _keyset_messages(conv_id: int) -> Dict[str, Any] | None:
+    """Return one keyset page of *conv_id*'s messages (see :func:`get_messages`).
+
+    ``None`` means the cursor is not a message of this conversation.
+    """
+    limit = max(1, min(int_arg("limit", 50), 100))
+    before_id = int_arg("before_id")
+    after_id = int_arg("after_id")
+
+    query = Message.query.filter(Message.conversation_id == conv_id)
+    forward = after_id is not None
+    anchor_id = after_id if forward else before_id
+    if anchor_id is not None:
+        anchor = (
+            db.session.query(Message.created_at)
+            .filter(Message.id == anchor_id, Message.conversation_id == conv_id)
+            .scalar()
+        )
+        if anchor is None:
+            return None
+        if forward:
+            query = query.filter(
+                or_(
+                    Message.created_at > anchor,
+                    and_(Message.created_at == anchor, Message.id > anchor_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    Message.created_at < anchor,
+                    and_(Message.created_at == anchor, Message.id < anchor_id),
+                )
+            )
+
+    if forward:
+        query = query.order_by(Message.created_at.asc(), Message.id.asc())
+    else:
+        query = query.order_by(Message.created_at.desc(), Message.id.desc())
+
+    # one extra row tells us whether another page exists without a COUNT(*)
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [message_to_dict(m) for m in rows],
+        "next_cursor": rows[-1].id if has_more else None,
+        "has_more": has_more,
+        "limit": limit,
+    }
+
+
 @inbox_bp.route("/conversations/<int:conv_id>/messages", methods=["POST"])
 @login_required
 def send_message(conv_id: int) -> Tuple[Any, int]:
@@ -232,14 +393,7 @@ def send_message(conv_id: int) -> Tuple[Any, int]:
     if not body:
         abort(400, "'body' is required")
 
-    msg = Message(
-        conversation_id=conv.id,
-        sender_id=current_user.id,
-        body=sanitize_html(body),
-        created_at=datetime.utcnow(),
-    )
-    db.session.add(msg)
-    db.session.commit()
+    msg = record_message(conv, current_user.id, body)
 
     payload = message_to_dict(msg)
     room = f"conv_{conv.id}"
@@ -253,15 +407,18 @@ def send_message(conv_id: int) -> Tuple[Any, int]:
 def mark_read(conv_id: int) -> Tuple[str, int]:
     try:
         conv, part = get_conversation_or_404(conv_id)
+        now = datetime.utcnow()
         updated = (
             Message.query.filter(
                 Message.conversation_id == conv.id,
                 Message.sender_id != current_user.id,
                 Message.is_read.is_(False),
             )
-            .update({"is_read": True, "read_at": datetime.utcnow()})
+            .update({"is_read": True, "read_at": now})
         )
-        if updated:
+        if updated or part.unread_count:
+            part.unread_count = 0
+            part.last_read = now
             db.session.commit()
             logger.debug("Marked %s messages as read in conv %s", updated, conv.id)
         return "", 204  # <-- Fixes Werkzeug AssertionError
@@ -274,14 +431,16 @@ def mark_read(conv_id: int) -> Tuple[str, int]:
 @login_required
 def leave_conversation(conv_id: int) -> Tuple[str, int]:
     conv, part = get_conversation_or_404(conv_id)
+    # the participant row carries this user's unread counter, so deleting it
+    # keeps the summary consistent for everyone who remains
     db.session.delete(part)
-    db.session.commit()
+    db.session.flush()
 
     # if no more participants, clean up conversation & messages
     if not Participant.query.filter_by(conversation_id=conv.id).count():
         Message.query.filter_by(conversation_id=conv.id).delete()
         db.session.delete(conv)
-        db.session.commit()
+    db.session.commit()
 
     return "", 204
 
@@ -374,14 +533,7 @@ def register_socket_handlers() -> None:
             emit("error", {"message": "conversation not found"})
             return
 
-        msg = Message(
-            conversation_id=conv.id,
-            sender_id=user.id,
-            body=sanitize_html(body),
-            created_at=datetime.utcnow(),
-        )
-        db.session.add(msg)
-        db.session.commit()
+        msg = record_message(conv, user.id, body)
 
         payload = message_to_dict(msg)
         emit("new_message", payload, room=f"conv_{conv.id}")
@@ -1,6 +1,8 @@
 # blueprints/client/routes.py
 from flask import Blueprint, request, jsonify, session
-from db.models import Company, JobPosition, db
+from sqlalchemy import func
+from db.models import Company, Hire, JobApplication, JobPosition, Participant, db
+from utils.candidate_profile import touch_applicants
 from utils.security import sanitize_html
 
 client_bp = Blueprint('client', __name__)
@@ -64,26 +66,105 @@ def get_company_public(company_id):
 
     return jsonify(company_data), 200
 
+DASHBOARD_JOBS_LIMIT = 50
+
+def dashboard_summary(company_id: int, user_id: int, jobs_limit: int = DASHBOARD_JOBS_LIMIT) -> dict:
+    """Aggregate dashboard numbers for *company_id* with a fixed number of queries.
+
+    Counts come from grouped queries, so the cost does not grow with the
+    number of applications.  The job list is capped at the *jobs_limit* most
+    recent postings (``has_more`` says whether it was cut); ``job_count`` and
+    the application totals cover all of the company's jobs.
+    """
+    jobs = (
+        db.session.query(JobPosition.id, JobPosition.title, JobPosition.description,
+                         JobPosition.location, JobPosition.posted_at)
+        .filter(JobPosition.company_id == company_id)
+        .order_by(JobPosition.posted_at.desc(), JobPosition.id.desc())
+        .limit(jobs_limit)
+        .all()
+    )
+    job_count = db.session.query(func.count(JobPosition.id)).filter(JobPosition.company_id == company_id).scalar()
+
+    per_job = {}
+    if jobs:
+        status_rows = (
+            db.session.query(JobApplication.job_position_id, JobApplication.status, func.count(JobApplication.id))
+            .filter(JobApplication.job_position_id.in_([job.id for job in jobs]))
+            .group_by(JobApplication.job_position_id, JobApplication.status)
+        )
+        for job_id, status, count in status_rows:
+            per_job.setdefault(job_id, {})[status] = count
+    totals = dict(
+        db.session.query(JobApplication.status, func.count(JobApplication.id))
+        .join(JobPosition, JobPosition.id == JobApplication.job_position_id)
+        .filter(JobPosition.company_id == company_id)
+        .group_by(JobApplication.status)
+        .all()
+    )
+
+    active_hires = (
+        db.session.query(func.count(Hire.id))
+        .filter(Hire.client_id == user_id, Hire.status == 'active')
+        .scalar()
+    )
+    unread = (
+        db.session.query(func.coalesce(func.sum(Participant.unread_count), 0))
+        .filter(Participant.user_id == user_id)
+        .scalar()
+    )
+
+    return {
+        "job_positions": [
+            {
+                "id": job.id,
+                "title": job.title,
+                "description": job.description,
+                "location": job.location,
+                "posted_at": job.posted_at.isoformat(),
+                "applications": per_job.get(job.id, {}),
+                "application_count": sum(per_job.get(job.id, {}).values()),
+            }
+            for job in jobs
+        ],
+        "has_more": job_count > len(jobs),
+        "stats": {
+            "job_count": job_count,
+            "applications_by_status": totals,
+            "application_count": sum(totals.values()),
+            "active_hires": active_hires,
+            "unread_messages": unread,
+        },
+    }
+
 @client_bp.route('', methods=['GET'])
 @client_bp.route('/', methods=['GET'])
 @client_required  # ensure user is authenticated as client
 def client_dashboard():
-    """Client dashboard endpoint returning overview + full company data."""
-    print(f"Request to client_dashboard from user_id: {session.get('user_id')}, role: {session.get('role')}")
-    # Debug: print all company user_ids in the database
-    all_companies = Company.query.all()
-    print("All companies user_ids in DB:", [c.user_id for c in all_companies])
-    # Lookup the company for the logged-in user
-    company = Company.query.filter_by(user_id=session['user_id']).first()
-    print(f"Queried company: {company}")
+    """Client dashboard: company core fields, recent jobs with per-status
+    application counts, and totals for jobs, applications, active hires and
+    unread messages.
+
+    Query params: ``jobs_limit`` (default 50, max 100) caps the job list;
+    ``job_positions_has_more`` is set when it leaves jobs out and
+    ``stats.job_count`` is the full total.
+    """
+    user_id = session['user_id']
+    company = (
+        db.session.query(Company.id, Company.name, Company.address, Company.contact_email,
+                         Company.contact_phone, Company.created_at, Company.updated_at)
+        .filter(Company.user_id == user_id)
+        .first()
+    )
     if not company:
-        print("No company found for user_id:", session.get('user_id'))
         return jsonify({
             "message": "No company found",
             "company": None
         }), 404
 
-    # Serialize company and related job positions
+    jobs_limit = max(1, min(request.args.get('jobs_limit', default=DASHBOARD_JOBS_LIMIT, type=int), 100))
+    summary = dashboard_summary(company.id, user_id, jobs_limit)
+
     company_data = {
         "id": company.id,
         "name": company.name,
@@ -92,22 +173,15 @@ def client_dashboard():
         "contact_phone": company.contact_phone,
         "created_at": company.created_at.isoformat(),
         "updated_at": company.updated_at.isoformat(),
-        "job_positions": [
-            {
-                "id": job.id,
-                "title": job.title,
-                "description": job.description,
-                "location": job.location,
-                "posted_at": job.posted_at.isoformat()
-            }
-            for job in company.job_positions
-        ]
+        "job_positions": summary["job_positions"],
+        "job_positions_has_more": summary["has_more"],
     }
 
     overview = {
         "message": "Welcome to the client dashboard",
         "companyId": company.id,
-        "company": company_data
+        "company": company_data,
+        "stats": summary["stats"],
     }
     return jsonify(overview)
 
@@ -280,6 +354,9 @@ def update_company(company_id):
             return jsonify({"error": "Validation failed", "details": errors}), 400
 
         company.updated_at = datetime.utcnow()
+        if "name" in data:
+            # applicants' profiles show the company name
+            touch_applicants(JobPosition.company_id == company.id)
         db.session.commit()
         logging.info(f"Company {company_id} updated successfully")
 
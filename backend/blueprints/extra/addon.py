@@ -1,3 +1,343 @@
-from flask import Blueprint
+"""Bulk seeding endpoints used by the scripts in ``extra/``.
+
+``POST /extra/add_items`` creates client accounts (user + company) and
+candidate accounts (user + profile) from one JSON payload::
+
+    {"clients":    [{"username", "password", "company": {...}}, ...],
+     "candidates": [{"username", "password", "profile": {...}}, ...]}
+
+``/extra/add_jobs`` and ``/extra/add_applications`` do the same for
+``{"jobs": [...]}`` and ``{"applications": [...]}`` with the fields the
+single-row job routes accept.
+
+Rows are validated up front, passwords are hashed on a worker pool and the
+rest is written with multi-row INSERTs, ``ADD_ITEMS_CHUNK`` rows per
+savepoint.  A chunk that hits a constraint is retried row by row so a single
+bad row only fails itself.  Invalid rows are reported by section and index.
+
+Meant for load-test environments only: the routes answer 404 unless
+``EXTRA_ENDPOINTS_ENABLED`` is set, and is exempt from CSRF so scripts can
+call it.
+"""
+from datetime import date, datetime
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from blueprints.job.routes import job_count_cache
+from db.models import CandidateProfile, Company, JobApplication, JobPosition, User, db
+from utils.candidate_profile import touch_profiles
+from utils.passwords import hash_passwords
+from utils.request_args import parse_bool
+from utils.security import sanitize_html
 
 addon_bp = Blueprint('addon', __name__)
+
+COMPANY_FIELDS = (
+    'bio', 'profile_picture', 'website', 'industry', 'size', 'founded_date', 'address',
+    'city', 'country', 'latitude', 'longitude', 'contact_email', 'contact_phone',
+)
+PROFILE_FIELDS = ('phone', 'city', 'country', 'profile_picture', 'summary')
+SECTIONS = {'clients': 'client', 'candidates': 'candidate'}
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _existing(column, values, size):
+    found = set()
+    for chunk in _chunks(sorted(values), size):
+        found.update(db.session.scalars(select(column).where(column.in_(chunk))))
+    return found
+
+
+def _company_row(username, data):
+    row = {field: data.get(field) for field in COMPANY_FIELDS if field in data}
+    row['name'] = data.get('name') or f"Company of {username}"
+    row['bio'] = sanitize_html(row.get('bio', ''))
+    if row.get('founded_date'):
+        row['founded_date'] = date.fromisoformat(row['founded_date'])
+    return row
+
+
+def _profile_row(username, data):
+    row = {field: data.get(field) for field in PROFILE_FIELDS if field in data}
+    row['full_name'] = data.get('full_name') or username
+    row['email'] = data.get('email')
+    if not row['email']:
+        raise ValueError("email is required")
+    row['summary'] = sanitize_html(row.get('summary'))
+    return row
+
+
+def _validate(payload):
+    """Return ``(accounts, errors)``; each account is (section, index, username, password, row)."""
+    accounts, errors = [], []
+    seen = {'username': set(), 'name': set(), 'email': set()}
+    for section in SECTIONS:
+        for index, item in enumerate(payload.get(section) or []):
+            def fail(message):
+                errors.append({'section': section, 'index': index, 'error': message})
+
+            if not isinstance(item, dict):
+                fail('must be an object')
+                continue
+            username, password = item.get('username'), item.get('password')
+            if not username or not password:
+                fail('username and password are required')
+                continue
+            if not isinstance(username, str) or not isinstance(password, str):
+                fail('username and password must be strings')
+                continue
+            key, unique = ('company', 'name') if section == 'clients' else ('profile', 'email')
+            details = item.get(key) or {}
+            if not isinstance(details, dict):
+                fail(f'{key} must be an object')
+                continue
+            try:
+                row = (_company_row if section == 'clients' else _profile_row)(username, details)
+            except (TypeError, ValueError) as e:
+                fail(str(e))
+                continue
+            if not isinstance(row[unique], str):
+                fail(f'{unique} must be a string')
+                continue
+            if username in seen['username']:
+                fail('duplicate username in payload')
+                continue
+            if row[unique] in seen[unique]:
+                fail(f'duplicate {unique} in payload')
+                continue
+            seen['username'].add(username)
+            seen[unique].add(row[unique])
+            accounts.append((section, index, username, password, row))
+    return accounts, errors
+
+
+def _insert_accounts(accounts):
+    """Insert users plus their company/profile rows with one statement per table."""
+    users = [{'username': a[2], 'password_hash': a[3], 'role': SECTIONS[a[0]]} for a in accounts]
+    ids = dict(db.session.execute(insert(User).returning(User.username, User.id), users).all())
+    companies = [{**a[4], 'user_id': ids[a[2]]} for a in accounts if a[0] == 'clients']
+    profiles = [{**a[4], 'user_id': ids[a[2]]} for a in accounts if a[0] == 'candidates']
+    if companies:
+        db.session.execute(insert(Company), companies)
+    if profiles:
+        db.session.execute(insert(CandidateProfile), profiles)
+    return [ids[a[2]] for a in accounts]
+
+
+def _insert_rows(model):
+    """Chunk writer for items shaped ``(section, index, row)``; returns the new ids."""
+    def insert_chunk(items):
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(db.session.scalars(stmt, [item[2] for item in items]))
+    return insert_chunk
+
+
+def _write(items, errors, chunk_size, insert_chunk, before_commit=None):
+    """Write *items* ``chunk_size`` at a time, one savepoint and commit per chunk.
+
+    Items start with ``(section, index, ...)``.  A chunk that violates a
+    constraint is retried row by row and the failing rows are reported in
+    *errors*.  Returns ``(item, id)`` for every row written.
+    """
+    written = []
+    for chunk in _chunks(items, chunk_size):
+        try:
+            with db.session.begin_nested():
+                done = list(zip(chunk, insert_chunk(chunk)))
+        except IntegrityError:
+            # find the offending rows; the others still go in
+            done = []
+            for item in chunk:
+                try:
+                    with db.session.begin_nested():
+                        done.extend(zip([item], insert_chunk([item])))
+                except IntegrityError as e:
+                    errors.append({'section': item[0], 'index': item[1],
+                                   'error': str(e.orig).split('\n')[0]})
+        if before_commit and done:
+            before_commit([item for item, _ in done])
+        db.session.commit()
+        written.extend(done)
+    return written
+
+
+def _enabled_payload(sections):
+    """Common gatekeeping; returns ``(payload, None)`` or ``(None, error response)``."""
+    config = current_app.config
+    if not config.get('EXTRA_ENDPOINTS_ENABLED'):
+        return None, (jsonify({"error": "Not found"}), 404)
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return None, (jsonify({"error": "JSON object expected"}), 400)
+    for section in sections:
+        if not isinstance(payload.get(section) or [], list):
+            return None, (jsonify({"error": f"{section} must be a list"}), 400)
+    if sum(len(payload.get(s) or []) for s in sections) > config['ADD_ITEMS_MAX']:
+        return None, (jsonify({"error": f"At most {config['ADD_ITEMS_MAX']} items per request"}), 413)
+    return payload, None
+
+
+def _items(payload, section):
+    # _enabled_payload already checked the section is a list
+    return enumerate(payload.get(section) or [])
+
+
+def _datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _respond(created, errors, **extra):
+    errors.sort(key=lambda e: (e['section'], e['index']))
+    status = 201 if any(created.values()) or not errors else 400
+    return jsonify({"created": created, "errors": errors, **extra}), status
+
+
+@addon_bp.route('/extra/add_items', methods=['POST'])
+def add_items():
+    payload, error = _enabled_payload(SECTIONS)
+    if error:
+        return error
+
+    chunk_size = current_app.config['ADD_ITEMS_CHUNK']
+    accounts, errors = _validate(payload)
+
+    # rows clashing with data already in the database
+    taken = {
+        'username': _existing(User.username, {a[2] for a in accounts}, chunk_size),
+        'name': _existing(Company.name, {a[4]['name'] for a in accounts if a[0] == 'clients'}, chunk_size),
+        'email': _existing(CandidateProfile.email, {a[4]['email'] for a in accounts if a[0] == 'candidates'},
+                           chunk_size),
+    }
+    valid = []
+    for account in accounts:
+        unique = 'name' if account[0] == 'clients' else 'email'
+        if account[2] in taken['username']:
+            errors.append({'section': account[0], 'index': account[1], 'error': 'username already taken'})
+        elif account[4][unique] in taken[unique]:
+            errors.append({'section': account[0], 'index': account[1], 'error': f'{unique} already taken'})
+        else:
+            valid.append(account)
+
+    hashes = hash_passwords([a[3] for a in valid], workers=current_app.config['ADD_ITEMS_HASH_WORKERS'])
+    valid = [(s, i, u, h, row) for (s, i, u, _, row), h in zip(valid, hashes)]
+    written = _write(valid, errors, chunk_size, _insert_accounts)
+
+    created = {section: 0 for section in SECTIONS}
+    for account, _ in written:
+        created[account[0]] += 1
+    return _respond(created, errors)
+
+
+@addon_bp.route('/extra/add_jobs', methods=['POST'])
+def add_jobs():
+    """Bulk-create job postings: ``{"jobs": [{company_id, title, ...}, ...]}``.
+
+    The response lists the new ids in payload order of the accepted rows.
+    """
+    payload, error = _enabled_payload(('jobs',))
+    if error:
+        return error
+
+    chunk_size = current_app.config['ADD_ITEMS_CHUNK']
+    errors, rows = [], []
+    for index, item in _items(payload, 'jobs'):
+        if not isinstance(item, dict) or not item.get('company_id') or not item.get('title'):
+            errors.append({'section': 'jobs', 'index': index, 'error': 'company_id and title are required'})
+            continue
+        try:
+            row = {
+                'company_id': int(item['company_id']),
+                'title': item['title'],
+                'description': sanitize_html(item.get('description')),
+                'requirements': sanitize_html(item.get('requirements')),
+                'location': item.get('location'),
+                'employment_type': item.get('employment_type'),
+                'remote': parse_bool(item.get('remote', False)),
+                'posted_at': _datetime(item.get('posted_at')) or datetime.utcnow(),
+                'expires_at': _datetime(item.get('expires_at')),
+            }
+        except (TypeError, ValueError) as e:
+            errors.append({'section': 'jobs', 'index': index, 'error': str(e)})
+            continue
+        rows.append(('jobs', index, row))
+
+    companies = _existing(Company.id, {row[2]['company_id'] for row in rows}, chunk_size)
+    valid = []
+    for row in rows:
+        if row[2]['company_id'] in companies:
+            valid.append(row)
+        else:
+            errors.append({'section': 'jobs', 'index': row[1], 'error': 'company not found'})
+
+    written = _write(valid, errors, chunk_size, _insert_rows(JobPosition))
+    if written:
+        job_count_cache.clear()
+    return _respond({'jobs': len(written)}, errors, ids=[job_id for _, job_id in written])
+
+
+@addon_bp.route('/extra/add_applications', methods=['POST'])
+def add_applications():
+    """Bulk-create applications: ``{"applications": [{candidate_id, job_position_id, ...}, ...]}``.
+
+    Duplicates of an existing or earlier (candidate, job) pair are reported,
+    as ``apply_to_job`` would reject them.
+    """
+    payload, error = _enabled_payload(('applications',))
+    if error:
+        return error
+
+    chunk_size = current_app.config['ADD_ITEMS_CHUNK']
+    errors, rows = [], []
+    for index, item in _items(payload, 'applications'):
+        if not isinstance(item, dict) or not item.get('candidate_id') or not item.get('job_position_id'):
+            errors.append({'section': 'applications', 'index': index,
+                           'error': 'candidate_id and job_position_id are required'})
+            continue
+        try:
+            row = {
+                'candidate_id': int(item['candidate_id']),
+                'job_position_id': int(item['job_position_id']),
+                'status': item.get('status') or 'Applied',
+                'applied_at': _datetime(item.get('applied_at')) or datetime.utcnow(),
+                'resume_path': item.get('resume_path'),
+                'cover_letter_path': item.get('cover_letter_path'),
+            }
+        except (TypeError, ValueError) as e:
+            errors.append({'section': 'applications', 'index': index, 'error': str(e)})
+            continue
+        rows.append(('applications', index, row))
+
+    candidates = _existing(CandidateProfile.id, {row[2]['candidate_id'] for row in rows}, chunk_size)
+    jobs = _existing(JobPosition.id, {row[2]['job_position_id'] for row in rows}, chunk_size)
+    applied = set()
+    for chunk in _chunks(sorted(candidates), chunk_size):
+        applied.update((candidate_id, job_id) for candidate_id, job_id in db.session.execute(
+            select(JobApplication.candidate_id, JobApplication.job_position_id)
+            .where(JobApplication.candidate_id.in_(chunk))
+        ))
+    valid = []
+    for row in rows:
+        pair = (row[2]['candidate_id'], row[2]['job_position_id'])
+        if pair[0] not in candidates:
+            message = 'candidate not found'
+        elif pair[1] not in jobs:
+            message = 'job not found'
+        elif pair in applied:
+            message = 'candidate has already applied to this job'
+        else:
+            applied.add(pair)
+            valid.append(row)
+            continue
+        errors.append({'section': 'applications', 'index': row[1], 'error': message})
+
+    written = _write(
+        valid, errors, chunk_size, _insert_rows(JobApplication),
+        before_commit=lambda done: touch_profiles(row[2]['candidate_id'] for row in done),
+    )
+    return _respond({'applications': len(written)}, errors, ids=[app_id for _, app_id in written])
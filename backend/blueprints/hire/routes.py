@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, session
 from db.models import CandidateProfile, Hire, Conversation, Participant, db
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 
 hire_bp = Blueprint('hire', __name__, url_prefix='/api/hire')
 
@@ -55,6 +56,10 @@ def hire_candidate(candidate_id):
         db.session.commit()
 
         return jsonify({"status": "success", "hire_id": hire.id, "conversation_id": conv.id}), 201
+    except IntegrityError:
+        # concurrent hire of the same pair, rejected by uq_hires_active_client_candidate
+        db.session.rollback()
+        return jsonify({"error": "Candidate has already been hired by this client"}), 400
     except Exception as e:
         import traceback
         traceback.print_exc()
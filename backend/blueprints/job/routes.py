@@ -1,7 +1,16 @@
-from flask import Blueprint, request, jsonify, abort
-from sqlalchemy import or_, desc
+import math
+import os
+
+from flask import Blueprint, current_app, request, jsonify, abort
+from sqlalchemy import desc, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from utils.security import sanitize_html
-from datetime import datetime
+from utils.cache import TTLCache
+from utils.job_search import apply_search
+from utils.candidate_profile import touch_applicants, touch_profile
+from extensions import socketio
+from datetime import datetime, timedelta
 
 from db.models import db  # shared SQLAlchemy instance
 from db.job_models import JobPosition, JobApplication
@@ -14,6 +23,17 @@ from db.candidate_models import CandidateProfile
 
 job_bp = Blueprint("jobs", __name__, url_prefix="/api")
 
+# Totals for ``count=cached|async`` keyed by filter signature.  Approximate by
+# design: entries live for JOB_COUNT_TTL seconds and are dropped whenever a job
+# is written in this process.
+job_count_cache = TTLCache(
+    maxsize=int(os.getenv("JOB_COUNT_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("JOB_COUNT_TTL", "60")),
+)
+COUNT_MODES = ("exact", "none", "cached", "async")
+APPLICATIONS_MAX_LIMIT = 200
+_pending_counts = set()  # signatures with a background COUNT in flight
+
 # ---------------------------------------------------------------------------
 # Helper utilities
 # ---------------------------------------------------------------------------
@@ -34,6 +54,57 @@ def job_to_dict(job: JobPosition) -> dict:
         "expires_at": job.expires_at.isoformat() if job.expires_at else None,
     }
 
+def jobs_with_company():
+    """JobPosition query that loads ``job.company`` in the same SELECT.
+
+    ``job_to_dict`` reads the company name, so without this every serialized
+    job costs an extra ``SELECT companies``.
+    """
+    return JobPosition.query.options(joinedload(JobPosition.company))
+
+def filtered_jobs(base, q=None, location=None, remote=None, company_id=None):
+    """Apply the ``list_jobs`` filters to *base*; return ``(query, rank)``."""
+    query, rank = apply_search(base, q, location)
+    if remote is not None:
+        query = query.filter(JobPosition.remote.is_(remote.lower() == "true"))
+    if company_id:
+        query = query.filter_by(company_id=company_id)
+    return query, rank
+
+def count_jobs(filters: dict) -> int:
+    """Exact number of jobs matching *filters* (no eager loads, no ordering)."""
+    query, _ = filtered_jobs(JobPosition.query, **filters)
+    return query.order_by(None).count()
+
+def _count_in_background(app, signature, filters):
+    with app.app_context():
+        try:
+            job_count_cache.set(signature, count_jobs(filters))
+        finally:
+            _pending_counts.discard(signature)
+            db.session.remove()
+
+def cached_job_total(filters: dict, background: bool = False):
+    """Return the cached total for *filters*, computing it on a miss.
+
+    With *background* a miss schedules the COUNT on a background task and
+    returns ``None`` so the request does not wait for it.
+    """
+    signature = tuple(sorted(filters.items()))
+    total = job_count_cache.get(signature)
+    if total is not None:
+        return total
+    if background:
+        if signature not in _pending_counts:
+            _pending_counts.add(signature)
+            socketio.start_background_task(
+                _count_in_background, current_app._get_current_object(), signature, filters
+            )
+        return None
+    total = count_jobs(filters)
+    job_count_cache.set(signature, total)
+    return total
+
 def application_to_dict(app: JobApplication) -> dict:
     """Serialize a JobApplication object."""
     return {
@@ -77,6 +148,7 @@ def create_job():
     )
     db.session.add(job)
     db.session.commit()
+    job_count_cache.clear()
 
     return jsonify(job_to_dict(job)), 201
 
@@ -86,62 +158,82 @@ def list_jobs():
     """Return a paginated list of jobs.
 
     Query params:
-        - q:         free‑text search (title/description)
-        - location:  filter by location
+        - q:         free‑text search (title/description), ranked by relevance
+        - location:  filter by location (word prefix)
         - remote:    true/false for remote jobs
         - company:   filter by company_id
         - page:      page number (default 1)
         - per_page:  items per page (default 20, maximum 100)
-        - sort:      posted_at|expires_at (default posted_at)
+        - sort:      posted_at|expires_at (default posted_at, or relevance with q)
         - order:     asc|desc (default desc)
+        - count:     how to compute ``total_items``:
+                     exact  (default) run COUNT(*) on every request
+                     none   skip it; ``has_next`` only
+                     cached reuse a total cached per filter set for a short TTL
+                     async  like cached, but a miss is counted in the background
+                            and ``total_items`` is null until it is ready
     """
-    q            = request.args.get("q")
-    location     = request.args.get("location")
-    remote_str   = request.args.get("remote")
-    company_id   = request.args.get("company", type=int)
-    page         = request.args.get("page", default=1, type=int)
-    per_page     = min(request.args.get("per_page", default=20, type=int), 100)
-    sort         = request.args.get("sort", default="posted_at")
+    filters = {
+        "q":          request.args.get("q"),
+        "location":   request.args.get("location"),
+        "remote":     request.args.get("remote"),
+        "company_id": request.args.get("company", type=int),
+    }
+    page         = max(request.args.get("page", default=1, type=int), 1)
+    per_page     = max(min(request.args.get("per_page", default=20, type=int), 100), 1)
+    sort         = request.args.get("sort")
     order        = request.args.get("order", default="desc")
+    count_mode   = request.args.get("count", default="exact")
+    if count_mode not in COUNT_MODES:
+        count_mode = "exact"
 
-    query = JobPosition.query
-
-    if q:
-        query = query.filter(or_(JobPosition.title.ilike(f"%{q}%"), JobPosition.description.ilike(f"%{q}%")))
-    if location:
-        query = query.filter(JobPosition.location.ilike(f"%{location}%"))
-    if remote_str is not None:
-        query = query.filter(JobPosition.remote.is_(remote_str.lower() == "true"))
-    if company_id:
-        query = query.filter_by(company_id=company_id)
+    query, rank = filtered_jobs(jobs_with_company(), **filters)
 
     # Sorting
-    sort_attr = getattr(JobPosition, sort, JobPosition.posted_at)
-    if order == "desc":
-        sort_attr = desc(sort_attr)
-    query = query.order_by(sort_attr)
+    if rank is not None and sort is None:
+        query = query.order_by(rank, desc(JobPosition.posted_at))
+    else:
+        sort_attr = getattr(JobPosition, sort or "posted_at", JobPosition.posted_at)
+        if order == "desc":
+            sort_attr = desc(sort_attr)
+        query = query.order_by(sort_attr)
 
     # Pagination
-    page_obj = query.paginate(page=page, per_page=per_page, error_out=False)
-    jobs = [job_to_dict(j) for j in page_obj.items]
-
-    return jsonify({
-        "items": jobs,
-        "page": page_obj.page,
-        "total_pages": page_obj.pages,
-        "total_items": page_obj.total,
-    })
+    if count_mode == "exact":
+        page_obj = query.paginate(page=page, per_page=per_page, error_out=False)
+        jobs = [job_to_dict(j) for j in page_obj.items]
+
+        return jsonify({
+            "items": jobs,
+            "page": page_obj.page,
+            "total_pages": page_obj.pages,
+            "total_items": page_obj.total,
+            "has_next": page_obj.has_next,
+        })
+
+    # one extra row tells us whether there is a next page without a COUNT
+    rows = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+    result = {
+        "items": [job_to_dict(j) for j in rows[:per_page]],
+        "page": page,
+        "has_next": len(rows) > per_page,
+    }
+    if count_mode != "none":
+        total = cached_job_total(filters, background=count_mode == "async")
+        result["total_items"] = total
+        result["total_pages"] = math.ceil(total / per_page) if total is not None else None
+    return jsonify(result)
 
 
 @job_bp.route("/jobs/<int:job_id>", methods=["GET"])
 def get_job(job_id: int):
-    job = JobPosition.query.get_or_404(job_id)
+    job = jobs_with_company().get_or_404(job_id)
     return jsonify(job_to_dict(job))
 
 
 @job_bp.route("/jobs/<int:job_id>", methods=["PUT", "PATCH"])
 def update_job(job_id: int):
-    job = JobPosition.query.get_or_404(job_id)
+    job = jobs_with_company().get_or_404(job_id)
     data = request.get_json() or {}
 
     # Update allowed fields
@@ -155,7 +247,11 @@ def update_job(job_id: int):
             else:
                 setattr(job, field, val)
 
+    if "title" in data:
+        # applicants' profiles show the job title
+        touch_applicants(JobPosition.id == job.id)
     db.session.commit()
+    job_count_cache.clear()
     return jsonify(job_to_dict(job))
 
 
@@ -163,8 +259,10 @@ def update_job(job_id: int):
 def delete_job(job_id: int):
     """Delete a job posting (hard delete). In production consider soft‑delete."""
     job = JobPosition.query.get_or_404(job_id)
+    touch_applicants(JobPosition.id == job.id)
     db.session.delete(job)
     db.session.commit()
+    job_count_cache.clear()
     return "", 204
 
 
@@ -175,22 +273,83 @@ def delete_job(job_id: int):
 @job_bp.route("/companies/<int:company_id>/jobs", methods=["GET"])
 def list_company_jobs(company_id: int):
     company = Company.query.get_or_404(company_id)
-    jobs = [job_to_dict(j) for j in company.job_positions]
+    # the company is already in the identity map, so job.company costs nothing
+    jobs = [job_to_dict(j) for j in JobPosition.query.filter_by(company_id=company.id)]
     return jsonify(jobs)
 
 
 @job_bp.route("/jobs/<int:job_id>/applications", methods=["GET"])
 def list_job_applications(job_id: int):
+    """List applications for a job, candidate names loaded in the same query.
+
+    Without parameters the full list is returned (legacy shape).  Passing
+    ``limit``, ``after_id`` or ``status`` switches to keyset pages ordered by
+    id: ``{"items": [...], "next_cursor": id | null}``.
+    """
     try:
         job = JobPosition.query.get_or_404(job_id)
-        applications = [application_to_dict(a) for a in job.job_applications]
-        return jsonify(applications)
+        query = (
+            JobApplication.query
+            .options(joinedload(JobApplication.candidate))
+            .filter(JobApplication.job_position_id == job.id)
+            .order_by(JobApplication.id)
+        )
+        if not any(arg in request.args for arg in ("limit", "after_id", "status")):
+            return jsonify([application_to_dict(a) for a in query])
+
+        limit = max(1, min(request.args.get("limit", default=50, type=int), APPLICATIONS_MAX_LIMIT))
+        after_id = request.args.get("after_id", type=int)
+        status = request.args.get("status")
+        if after_id is not None:
+            query = query.filter(JobApplication.id > after_id)
+        if status:
+            query = query.filter(JobApplication.status == status)
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return jsonify({
+            "items": [application_to_dict(a) for a in rows],
+            "next_cursor": rows[-1].id if has_more else None,
+        })
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": "Failed to fetch applications", "details": str(e)}), 500
 
 
+@job_bp.route("/jobs/<int:job_id>/stats", methods=["GET"])
+def job_application_stats(job_id: int):
+    """Application funnel for a job: counts by status and by day applied.
+
+    Query params:
+        - days: only count the trailing N days in ``by_day`` (default: all)
+    """
+    job = JobPosition.query.get_or_404(job_id)
+    base = db.session.query(JobApplication).filter(JobApplication.job_position_id == job.id)
+
+    by_status = dict(
+        base.with_entities(JobApplication.status, func.count(JobApplication.id))
+        .group_by(JobApplication.status)
+    )
+
+    day = func.date(JobApplication.applied_at)
+    daily = base.with_entities(day.label("day"), func.count(JobApplication.id))
+    days = request.args.get("days", type=int)
+    if days:
+        daily = daily.filter(JobApplication.applied_at >= datetime.utcnow() - timedelta(days=days))
+    by_day = [
+        {"date": d.isoformat() if hasattr(d, "isoformat") else d, "count": n}
+        for d, n in daily.group_by(day).order_by(day)
+    ]
+
+    return jsonify({
+        "job_id": job.id,
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_day": by_day,
+    })
+
+
 @job_bp.route("/jobs/<int:job_id>/apply", methods=["POST"])
 def apply_to_job(job_id: int):
     """Endpoint for candidates to apply to a job."""
@@ -220,7 +379,13 @@ def apply_to_job(job_id: int):
         applied_at=datetime.utcnow(),
     )
     db.session.add(application)
-    db.session.commit()
+    try:
+        touch_profile(candidate.id)
+        db.session.commit()
+    except IntegrityError:
+        # a concurrent request won the race; the unique index caught it
+        db.session.rollback()
+        abort(409, description="Candidate has already applied to this job")
 
     return jsonify(application_to_dict(application)), 201
 
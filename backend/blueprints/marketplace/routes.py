@@ -1,73 +1,232 @@
+import json
 import logging
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from db.company_models import Company
 from db.models import CandidateProfile, db
 from db.job_models import JobPosition
+from utils.request_args import BadArgument, bool_arg, int_arg
 
 logger = logging.getLogger(__name__)
 
 marketplace_bp = Blueprint('marketplace', __name__, url_prefix='/api/marketplace')
 
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# rows fetched per round trip when streaming a full export
+STREAM_BATCH = 1000
+NDJSON = 'application/x-ndjson'
+
+# Public field name -> column for each listing.  ``fields=`` may select any
+# subset; the default keeps the original response shape.
+COMPANY_FIELDS = {
+    "id": Company.id,
+    "name": Company.name,
+    "bio": Company.bio,
+    "industry": Company.industry,
+    "size": Company.size,
+    "city": Company.city,
+    "country": Company.country,
+    "website": Company.website,
+    "profile_picture": Company.profile_picture,
+}
+COMPANY_DEFAULT_FIELDS = ("id", "name", "bio")
+
+CANDIDATE_FIELDS = {
+    "id": CandidateProfile.id,
+    "full_name": CandidateProfile.full_name,
+    "bio": CandidateProfile.summary,
+    "city": CandidateProfile.city,
+    "country": CandidateProfile.country,
+    "profile_picture": CandidateProfile.profile_picture,
+}
+CANDIDATE_DEFAULT_FIELDS = ("id", "full_name", "bio")
+
+JOB_FIELDS = {
+    "id": JobPosition.id,
+    "title": JobPosition.title,
+    "location": JobPosition.location,
+    "employment_type": JobPosition.employment_type,
+    "remote": JobPosition.remote,
+    "posted_at": JobPosition.posted_at,
+    "expires_at": JobPosition.expires_at,
+    "company_id": JobPosition.company_id,
+    "company_name": Company.name,
+    "industry": Company.industry,
+    "country": Company.country,
+}
+JOB_DEFAULT_FIELDS = ("id", "title", "location", "employment_type", "remote", "posted_at", "company_name")
+
+
+def _selected_fields(available, default):
+    """Parse ``fields=`` into a tuple of known field names (``id`` always kept)."""
+    raw = request.args.get('fields')
+    if not raw:
+        return default
+    wanted = [f.strip() for f in raw.split(',') if f.strip() in available]
+    return tuple(dict.fromkeys(["id"] + wanted))
+
+
+def _page_params():
+    limit = int_arg('limit', DEFAULT_LIMIT)
+    return max(1, min(limit, MAX_LIMIT)), int_arg('after_id')
+
+
+def _apply_filters(query, filters):
+    """Apply the equality filters present in the query string."""
+    for param, column in filters.items():
+        if param == 'remote':
+            remote = bool_arg(param)
+            if remote is not None:
+                query = query.filter(column.is_(remote))
+            continue
+        value = request.args.get(param)
+        if value is None or value == '':
+            continue
+        query = query.filter(column == value)
+    return query
+
+
+def _serialize(row, fields):
+    data = {}
+    for name in fields:
+        value = getattr(row, name)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        data[name] = value
+    return data
+
+
+def _paginate(query, id_column, fields):
+    """Run a keyset page ordered by *id_column* and return ``(items, next_cursor)``."""
+    limit, after_id = _page_params()
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = rows[-1].id if has_more else None
+    return [_serialize(r, fields) for r in rows], next_cursor
+
+
+def _wants_stream():
+    """True for ``?stream=1`` or a client that prefers NDJSON."""
+    if bool_arg('stream'):
+        return True
+    return request.accept_mimetypes.best == NDJSON
+
+
+def _stream(query, id_column, fields, label):
+    """Stream every matching row as one JSON document per line.
+
+    Rows are pulled from the database ``STREAM_BATCH`` at a time with
+    ``yield_per`` and written straight to the socket, so worker memory stays
+    flat regardless of table size.  ``after_id`` resumes an interrupted
+    export.
+    """
+    after_id = int_arg('after_id')
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    rows = query.order_by(id_column).yield_per(STREAM_BATCH)
+
+    def generate():
+        count = 0
+        try:
+            for row in rows:
+                count += 1
+                yield json.dumps(_serialize(row, fields)) + "\n"
+        except Exception:
+            # headers are already sent; all we can do is log and cut the stream
+            logger.exception(f"Failed while streaming {label} for marketplace")
+            raise
+        logger.info(f"Streamed {count} {label} for marketplace")
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON)
+
+
+def companies_query(fields):
+    query = Company.query.with_entities(*[COMPANY_FIELDS[f].label(f) for f in fields])
+    return _apply_filters(query, {
+        'industry': Company.industry,
+        'country': Company.country,
+    })
+
+
+def candidates_query(fields):
+    query = CandidateProfile.query.with_entities(*[CANDIDATE_FIELDS[f].label(f) for f in fields])
+    return _apply_filters(query, {
+        'country': CandidateProfile.country,
+    })
+
+
+def jobs_query(fields):
+    query = JobPosition.query.join(JobPosition.company).with_entities(
+        *[JOB_FIELDS[f].label(f) for f in fields]
+    )
+    return _apply_filters(query, {
+        'remote': JobPosition.remote,
+        'employment_type': JobPosition.employment_type,
+        'industry': Company.industry,
+        'country': Company.country,
+    })
+
+
 @marketplace_bp.route('/companies', methods=['GET'])
 def list_companies():
-    """Return list of all companies with only id, name and bio."""
+    """Return a page of companies (id, name and bio unless ``fields=`` says otherwise).
+
+    Query params: ``limit``, ``after_id``, ``fields``, ``industry``, ``country``.
+    ``stream=1`` (or ``Accept: application/x-ndjson``) streams all rows as NDJSON.
+    """
     try:
-        companies = Company.query.with_entities(
-            Company.id, Company.name, Company.bio
-        ).all()
-        data = [{"id": c.id, "name": c.name, "bio": c.bio} for c in companies]
+        fields = _selected_fields(COMPANY_FIELDS, COMPANY_DEFAULT_FIELDS)
+        if _wants_stream():
+            return _stream(companies_query(fields), Company.id, fields, "companies")
+        data, next_cursor = _paginate(companies_query(fields), Company.id, fields)
         logger.info(f"Retrieved {len(data)} companies for marketplace")
-        return jsonify({"companies": data}), 200
+        return jsonify({"companies": data, "next_cursor": next_cursor}), 200
+    except BadArgument as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.exception("Failed to load companies for marketplace")
         return jsonify({"error": "Internal server error"}), 500
 
 @marketplace_bp.route('/candidates', methods=['GET'])
 def list_candidates():
-    """Return list of all candidates with only id, full_name and summary (bio)."""
+    """Return a page of candidates (id, full_name and summary as bio by default).
+
+    Query params: ``limit``, ``after_id``, ``fields``, ``country``.
+    ``stream=1`` (or ``Accept: application/x-ndjson``) streams all rows as NDJSON.
+    """
     try:
-        candidates = CandidateProfile.query.with_entities(
-            CandidateProfile.id,
-            CandidateProfile.full_name,
-            CandidateProfile.summary
-        ).all()
-        data = [
-            {"id": c.id, "full_name": c.full_name, "bio": c.summary}
-            for c in candidates
-        ]
+        fields = _selected_fields(CANDIDATE_FIELDS, CANDIDATE_DEFAULT_FIELDS)
+        if _wants_stream():
+            return _stream(candidates_query(fields), CandidateProfile.id, fields, "candidates")
+        data, next_cursor = _paginate(candidates_query(fields), CandidateProfile.id, fields)
         logger.info(f"Retrieved {len(data)} candidates for marketplace")
-        return jsonify({"candidates": data}), 200
+        return jsonify({"candidates": data, "next_cursor": next_cursor}), 200
+    except BadArgument as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.exception("Failed to load candidates for marketplace")
         return jsonify({"error": "Internal server error"}), 500
 
 @marketplace_bp.route('/jobs', methods=['GET'])
 def list_jobs():
-    """Return list of all jobs with selected fields."""
+    """Return a page of jobs with selected fields.
+
+    Query params: ``limit``, ``after_id``, ``fields``, ``remote``,
+    ``employment_type``, ``industry`` and ``country`` (of the company).
+    ``stream=1`` (or ``Accept: application/x-ndjson``) streams all rows as NDJSON.
+    """
     try:
-        jobs = JobPosition.query.join(JobPosition.company).with_entities(
-            JobPosition.id,
-            JobPosition.title,
-            JobPosition.location,
-            JobPosition.employment_type,
-            JobPosition.remote,
-            JobPosition.posted_at,
-            Company.name.label('company_name')
-        ).all()
-        data = [
-            {
-                "id": j.id,
-                "title": j.title,
-                "location": j.location,
-                "employment_type": j.employment_type,
-                "remote": j.remote,
-                "posted_at": j.posted_at.isoformat() if j.posted_at else None,
-                "company_name": j.company_name
-            }
-            for j in jobs
-        ]
+        fields = _selected_fields(JOB_FIELDS, JOB_DEFAULT_FIELDS)
+        if _wants_stream():
+            return _stream(jobs_query(fields), JobPosition.id, fields, "jobs")
+        data, next_cursor = _paginate(jobs_query(fields), JobPosition.id, fields)
         logger.info(f"Retrieved {len(data)} jobs for marketplace")
-        return jsonify({"jobs": data}), 200
+        return jsonify({"jobs": data, "next_cursor": next_cursor}), 200
+    except BadArgument as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.exception("Failed to load jobs for marketplace")
         return jsonify({"error": "Internal server error"}), 500
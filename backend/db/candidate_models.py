@@ -3,14 +3,17 @@ from db.models import db
 class CandidateProfile(db.Model):
     __tablename__ = 'candidate_profiles'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     full_name = db.Column(db.String(150), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20), nullable=True)
     city = db.Column(db.String(100), nullable=True)
-    country = db.Column(db.String(100), nullable=True)
+    country = db.Column(db.String(100), nullable=True, index=True)
     profile_picture = db.Column(db.String(255), nullable=True)  # store file path or URL
     summary = db.Column(db.Text, nullable=True)
+    # bumped by every write to the profile or its collections; the full
+    # profile's cache key and ETag (see utils.candidate_profile)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
     user = db.relationship('User')
     employments = db.relationship('EmploymentHistory')
@@ -24,7 +27,7 @@ class CandidateProfile(db.Model):
 class EmploymentHistory(db.Model):
     __tablename__ = 'employment_histories'
     id = db.Column(db.Integer, primary_key=True)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False, index=True)
     company_name = db.Column(db.String(150), nullable=False)
     position = db.Column(db.String(150), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
@@ -35,7 +38,7 @@ class EmploymentHistory(db.Model):
 class LegalDocument(db.Model):
     __tablename__ = 'legal_documents'
     id = db.Column(db.Integer, primary_key=True)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False, index=True)
     doc_type = db.Column(db.String(100), nullable=False)  # e.g., 'ID', 'Passport', 'Work Authorization'
     file_path = db.Column(db.String(255), nullable=False)
     uploaded_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
@@ -51,7 +54,7 @@ class Skill(db.Model):
 class CandidateSkill(db.Model):
     __tablename__ = 'candidate_skills'
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), primary_key=True)
-    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True, index=True)
     proficiency = db.Column(db.String(50), nullable=True)  # e.g., Beginner, Intermediate, Expert
 
     skill = db.relationship('Skill')
@@ -61,7 +64,7 @@ class CandidateSkill(db.Model):
 class Education(db.Model):
     __tablename__ = 'educations'
     id = db.Column(db.Integer, primary_key=True)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False, index=True)
     institution = db.Column(db.String(150), nullable=False)
     degree = db.Column(db.String(150), nullable=True)
     field_of_study = db.Column(db.String(150), nullable=True)
@@ -7,17 +7,29 @@ class Conversation(db.Model):
     # For a group inbox, you could have a separate participants table
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Denormalised summary, maintained on write by the chat routes so the
+    # inbox never has to scan ``messages``.
+    last_message_id = db.Column(db.Integer, nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True, index=True)
+    message_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
 class Participant(db.Model):
     __tablename__ = "participants"
     conversation_id = db.Column(
         db.Integer, db.ForeignKey("conversations.id"), primary_key=True)
-    user_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True, index=True)
     # track last‐read timestamp for unread counts
     last_read = db.Column(db.DateTime, default=datetime.utcnow)
+    # messages from other participants not yet read by this user
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     conversation = db.relationship("Conversation", backref="participants")
 class Message(db.Model):
     __tablename__ = "messages"
+    __table_args__ = (
+        # keyset pagination walks a thread in (created_at, id) order
+        db.Index("ix_messages_conversation_created_id", "conversation_id", "created_at", "id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     conversation_id = db.Column(
         db.Integer, db.ForeignKey("conversations.id"), index=True)
@@ -10,6 +10,18 @@ class Hire(db.Model):
     hired_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     status = db.Column(db.String(50), nullable=False, default='active')
 
+    __table_args__ = (
+        # hire_candidate looks up (client_id, candidate_id, status)
+        db.Index('ix_hires_client_candidate_status', 'client_id', 'candidate_id', 'status'),
+        db.Index('ix_hires_candidate_id', 'candidate_id'),
+        # at most one active hire per client/candidate pair
+        db.Index(
+            'uq_hires_active_client_candidate', 'client_id', 'candidate_id', unique=True,
+            sqlite_where=db.text("status = 'active'"),
+            postgresql_where=db.text("status = 'active'"),
+        ),
+    )
+
     client = db.relationship('User', backref='hires')
     candidate = db.relationship('CandidateProfile', backref='hires')
     job_position = db.relationship('JobPosition', backref='hires')
@@ -1,17 +1,18 @@
 from db.models import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 class JobPosition(db.Model):
     __tablename__ = 'job_positions'
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False, index=True)
     
     title = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text, nullable=True)
     requirements = db.Column(db.Text, nullable=True)
     location = db.Column(db.String(150), nullable=True)  # if different from company HQ
-    employment_type = db.Column(db.String(50), nullable=True)  # e.g., 'Full-time', 'Part-time', 'Contract'
-    remote = db.Column(db.Boolean, nullable=False, default=False)
+    employment_type = db.Column(db.String(50), nullable=True, index=True)  # e.g., 'Full-time', 'Part-time', 'Contract'
+    remote = db.Column(db.Boolean, nullable=False, default=False, index=True)
     
     posted_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
     expires_at = db.Column(db.DateTime, nullable=True)
@@ -19,20 +20,64 @@ class JobPosition(db.Model):
     company = db.relationship('Company')
     job_applications = db.relationship('JobApplication', back_populates='job_position', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        # Postgres full-text search; the expression must match utils.job_search
+        db.Index(
+            'ix_job_positions_search',
+            db.text("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"),
+            postgresql_using='gin',
+        ).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f"<JobPosition {self.title} @ {self.company.name}>"
 
 
+# SQLite full-text search: an external-content FTS5 index over job_positions,
+# kept in sync by triggers so every writer (routes, seeding scripts, raw SQL)
+# is covered.  The Alembic migration creates the same objects.
+JOB_FTS_TABLE = 'job_positions_fts'
+JOB_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {JOB_FTS_TABLE} USING fts5("
+    "title, description, location, content='job_positions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {JOB_FTS_TABLE}_ai AFTER INSERT ON job_positions BEGIN "
+    f"INSERT INTO {JOB_FTS_TABLE}(rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+    f"CREATE TRIGGER IF NOT EXISTS {JOB_FTS_TABLE}_ad AFTER DELETE ON job_positions BEGIN "
+    f"INSERT INTO {JOB_FTS_TABLE}({JOB_FTS_TABLE}, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); END",
+    f"CREATE TRIGGER IF NOT EXISTS {JOB_FTS_TABLE}_au AFTER UPDATE OF title, description, location "
+    f"ON job_positions BEGIN "
+    f"INSERT INTO {JOB_FTS_TABLE}({JOB_FTS_TABLE}, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); "
+    f"INSERT INTO {JOB_FTS_TABLE}(rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+)
+
+for _statement in JOB_FTS_DDL:
+    event.listen(JobPosition.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(
+    JobPosition.__table__, 'before_drop',
+    DDL(f"DROP TABLE IF EXISTS {JOB_FTS_TABLE}").execute_if(dialect='sqlite'),
+)
+
+
 class JobApplication(db.Model):
     __tablename__ = 'job_applications'
     id = db.Column(db.Integer, primary_key=True)
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidate_profiles.id'), nullable=False)
-    job_position_id = db.Column(db.Integer, db.ForeignKey('job_positions.id'), nullable=False)
+    job_position_id = db.Column(db.Integer, db.ForeignKey('job_positions.id'), nullable=False, index=True)
     applied_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
     status = db.Column(db.String(50), nullable=False, default='Applied')  # e.g., Applied, Interview, Offer, Rejected
     resume_path = db.Column(db.String(255), nullable=True)
     cover_letter_path = db.Column(db.String(255), nullable=True)
 
+    __table_args__ = (
+        # apply_to_job rejects duplicates; this also serves lookups by candidate
+        db.Index('uq_job_applications_candidate_job', 'candidate_id', 'job_position_id', unique=True),
+    )
+
     candidate = db.relationship('CandidateProfile')
     job_position = db.relationship('JobPosition', back_populates='job_applications', cascade='all, delete-orphan', single_parent=True)
 
@@ -1,17 +1,20 @@
-from werkzeug.security import generate_password_hash, check_password_hash
 from db.models import db
+from utils.passwords import hash_password, needs_rehash, verify_password
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), nullable=False)  # 'client' or 'candidate'
 
     def set_password(self, pw):
-        self.password_hash = generate_password_hash(pw)
+        self.password_hash = hash_password(pw)
 
     def check_password(self, pw):
-        return check_password_hash(self.password_hash, pw)
+        return verify_password(self.password_hash, pw)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
 
     @property
     def is_authenticated(self):
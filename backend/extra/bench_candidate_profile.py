@@ -0,0 +1,121 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+"""
+Benchmark loading a heavy candidate profile: the old strategy (one query
+joining every collection) against the per-collection SELECT IN strategy used
+by the candidate routes.  Reports statements, rows returned by the database
+and load latency for a candidate with --items of every collection.
+Usage:
+    python bench_candidate_profile.py --items 10 --repeat 5
+"""
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'bench_candidate_profile.db')
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{_db_file}')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from app import app, db  # noqa: E402
+from utils.candidate_profile import FULL_PROFILE_OPTIONS  # noqa: E402
+from db.models import (  # noqa: E402
+    CandidateProfile, CandidateSkill, Company, Education, EmploymentHistory,
+    JobApplication, JobPosition, LegalDocument, Skill, User,
+)
+
+JOINED_OPTIONS = (
+    joinedload(CandidateProfile.employments),
+    joinedload(CandidateProfile.documents),
+    joinedload(CandidateProfile.applications),
+    joinedload(CandidateProfile.candidate_skills).joinedload(CandidateSkill.skill),
+    joinedload(CandidateProfile.educations),
+)
+
+
+def seed(items):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        owner = User(username='owner', role='client', password_hash='x')
+        person = User(username='heavy', role='candidate', password_hash='x')
+        db.session.add_all([owner, person])
+        db.session.flush()
+        company = Company(user_id=owner.id, name='Bench Co')
+        candidate = CandidateProfile(user_id=person.id, full_name='Heavy', email='heavy@x.com')
+        db.session.add_all([company, candidate])
+        db.session.flush()
+        for n in range(items):
+            job = JobPosition(company_id=company.id, title=f'Job {n}')
+            skill = Skill(name=f'skill-{n}')
+            db.session.add_all([job, skill])
+            db.session.flush()
+            db.session.add_all([
+                JobApplication(candidate_id=candidate.id, job_position_id=job.id),
+                CandidateSkill(candidate_id=candidate.id, skill_id=skill.id),
+                EmploymentHistory(candidate_id=candidate.id, company_name='X', position='Y',
+                                  start_date=date(2020, 1, 1)),
+                LegalDocument(candidate_id=candidate.id, doc_type='ID', file_path='/x'),
+                Education(candidate_id=candidate.id, institution='Uni'),
+            ])
+        db.session.commit()
+        return candidate.id
+
+
+def load(candidate_id, options):
+    """Load the profile and touch everything the serializer reads."""
+    candidate = CandidateProfile.query.options(*options).filter_by(id=candidate_id).first()
+    for app_ in candidate.applications:
+        if app_.job_position:
+            app_.job_position.company.name
+    for cs in candidate.candidate_skills:
+        cs.skill.name
+    return (len(candidate.employments), len(candidate.documents), len(candidate.educations))
+
+
+def measure(candidate_id, options, repeat):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    best = float('inf')
+    for i in range(repeat):
+        db.session.expunge_all()
+        if i == 0:
+            event.listen(db.engine, 'before_cursor_execute', record)
+        start = time.perf_counter()
+        load(candidate_id, options)
+        best = min(best, time.perf_counter() - start)
+        if i == 0:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    # replay the captured statements to count the rows the database sent back
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        rows = sum(len(cursor.execute(sql, params).fetchall()) for sql, params in statements)
+    finally:
+        raw.close()
+    return len(statements), rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark candidate full-profile loading strategies')
+    parser.add_argument('--items', type=int, default=10, help='Rows per collection')
+    parser.add_argument('--repeat', type=int, default=5, help='Loads per strategy (best is reported)')
+    args = parser.parse_args()
+
+    candidate_id = seed(args.items)
+    with app.app_context():
+        for label, options in (('joinedload', JOINED_OPTIONS), ('selectinload', FULL_PROFILE_OPTIONS)):
+            count, rows, best = measure(candidate_id, options, args.repeat)
+            print(f"{label:13} statements={count:3d} rows={rows:8d} latency={best * 1000:9.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
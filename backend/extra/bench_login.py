@@ -0,0 +1,122 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+"""
+Micro-benchmark for password hashing under the eventlet hub.
+
+Fires a burst of concurrent logins while a separate "chat" client keeps polling
+the inbox, and reports login latency and chat latency with the thread-pool
+offload switched off and on.  Runs against a throwaway SQLite database.
+Usage:
+    python bench_login.py --logins 40 --concurrency 8 --method scrypt:32768:8:1
+"""
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'bench_login.db')
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{_db_file}')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, db  # noqa: E402  (app.py monkey-patches eventlet)
+import eventlet  # noqa: E402
+from extensions import limiter  # noqa: E402
+from db.models import User, Conversation, Participant  # noqa: E402
+
+HTTPS = {'wsgi.url_scheme': 'https'}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def setup(users, method):
+    app.config.update({
+        'WTF_CSRF_ENABLED': False,
+        'PASSWORD_HASH_METHOD': method,
+    })
+    limiter.enabled = False
+    # the test client is plain HTTP; drop Talisman's HTTPS redirect
+    app.before_request_funcs[None] = [
+        f for f in app.before_request_funcs.get(None, []) if f.__name__ != '_force_https'
+    ]
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for i in range(users):
+            user = User(username=f'bench{i}', role='candidate')
+            user.set_password('pass')
+            db.session.add(user)
+        chatter = User(username='chatter', role='client')
+        chatter.set_password('pass')
+        db.session.add(chatter)
+        db.session.flush()
+        conv = Conversation()
+        db.session.add(conv)
+        db.session.flush()
+        db.session.add(Participant(conversation_id=conv.id, user_id=chatter.id))
+        db.session.commit()
+
+
+def run(logins, concurrency, offload):
+    app.config['PASSWORD_HASH_OFFLOAD'] = offload
+    login_latencies, chat_latencies = [], []
+    done = eventlet.event.Event()
+
+    chat = app.test_client()
+    chat.post('/api/auth/login', json={'username': 'chatter', 'password': 'pass'}, environ_base=HTTPS)
+
+    def chat_probe(interval=0.005):
+        # latency includes the time spent waiting for the hub to wake us up,
+        # which is exactly what a blocking hash steals from chat traffic
+        while not done.ready():
+            start = time.perf_counter()
+            eventlet.sleep(interval)
+            chat.get('/api/conversations', environ_base=HTTPS)
+            chat_latencies.append(time.perf_counter() - start - interval)
+
+    def do_login(i):
+        client = app.test_client()
+        start = time.perf_counter()
+        resp = client.post('/api/auth/login', json={'username': f'bench{i % concurrency}', 'password': 'pass'},
+                    environ_base=HTTPS)
+        login_latencies.append(time.perf_counter() - start)
+        assert resp.status_code == 200, resp.status_code
+
+    probe = eventlet.spawn(chat_probe)
+    started = time.perf_counter()
+    pool = eventlet.GreenPool(concurrency)
+    for i in range(logins):
+        pool.spawn_n(do_login, i)
+    pool.waitall()
+    elapsed = time.perf_counter() - started
+    done.send()
+    probe.wait()
+
+    ms = lambda v: v * 1000.0  # noqa: E731
+    print(f"offload={'on ' if offload else 'off'} "
+          f"logins/s={logins / elapsed:7.1f} "
+          f"login p50={ms(percentile(login_latencies, 50)):7.1f}ms p99={ms(percentile(login_latencies, 99)):7.1f}ms "
+          f"chat p50={ms(percentile(chat_latencies, 50)):7.1f}ms p99={ms(percentile(chat_latencies, 99)):7.1f}ms "
+          f"max={ms(max(chat_latencies or [0])):7.1f}ms samples={len(chat_latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark login and chat latency under concurrent login load')
+    parser.add_argument('--logins', type=int, default=40, help='Number of logins to perform')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent login greenlets')
+    parser.add_argument('--method', type=str, default='scrypt:32768:8:1', help='werkzeug password hash method')
+    args = parser.parse_args()
+
+    setup(args.concurrency, args.method)
+    with app.app_context():
+        for offload in (False, True):
+            run(args.logins, args.concurrency, offload)
+
+
+if __name__ == '__main__':
+    main()
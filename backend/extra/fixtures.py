@@ -0,0 +1,554 @@
+"""
+High-volume synthetic data, written straight into the database.
+
+``flask fixtures generate`` fills the tables used by the benchmarks (users,
+companies, candidate profiles with skills and applications, jobs,
+conversations with participants and messages) without going through HTTP
+or the ORM.  Every batch is a pure function of ``(seed, entity, batch)``:
+rows get explicit primary keys from id ranges reserved when the run starts,
+so batches are independent and run in a process pool, each as a few
+multi-row ``INSERT ... VALUES`` statements.  Only applications and messages
+take database-assigned ids, which follow the order batches commit in.
+
+Progress is recorded in ``fixture_batches`` in the same transaction as the
+batch itself.  Re-running an interrupted run (same ``--run``) skips the
+batches already committed, and the run's parameters are pinned in
+``fixture_runs`` so a resumed run produces the same data.  New runs reserve
+ids above every pinned range.  Postgres sequences are advanced past a range
+when it is reserved; elsewhere the application's inserts can still take ids
+in a paused run's range, and resuming it then fails with an explanation.
+
+Distributions: companies and jobs are picked with Zipf-like popularity
+(a few companies post most jobs and get most conversations), skills per
+candidate and applications per candidate are geometric around the given
+means, and messages per conversation are log-normal with a long tail.
+
+Usage (from backend/):
+    flask fixtures generate --run bench --companies 100000 --candidates 1000000 \\
+        --jobs 500000 --messages 10000000 --workers 8
+    flask fixtures status
+"""
+import bisect
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, func, select, text,
+)
+
+from db.models import (
+    CandidateProfile, CandidateSkill, Company, Conversation, JobApplication, JobPosition,
+    Message, Participant, User, db,
+)
+
+fixtures_cli = AppGroup('fixtures', help='Generate synthetic benchmark data.')
+
+# progress bookkeeping; not part of the application schema (see migrations/env.py)
+progress_metadata = MetaData()
+fixture_runs = Table(
+    'fixture_runs', progress_metadata,
+    Column('run', String(64), primary_key=True),
+    Column('params', Text, nullable=False),
+    Column('created_at', DateTime, nullable=False, default=datetime.utcnow),
+)
+fixture_batches = Table(
+    'fixture_batches', progress_metadata,
+    Column('run', String(64), primary_key=True),
+    Column('entity', String(32), primary_key=True),
+    Column('batch', Integer, primary_key=True),
+    Column('rows', Integer, nullable=False),
+)
+
+# phases in dependency order; each finishes before the next starts
+ENTITIES = ('users', 'companies', 'candidates', 'jobs', 'candidate_links', 'conversations')
+# tables whose ids the run reserves up front
+ID_TABLES = {
+    'users': User.__table__,
+    'companies': Company.__table__,
+    'candidates': CandidateProfile.__table__,
+    'jobs': JobPosition.__table__,
+    'conversations': Conversation.__table__,
+}
+# bound parameters per statement, under SQLite's 32766 and Postgres' 65535
+MAX_PARAMS = 30000
+EPOCH = datetime(2024, 1, 1)
+
+FIRST_NAMES = ('Ana Andrei Maria Ion Elena Mihai Ioana Alex Diana Vlad Irina Radu Carmen Dan Sofia '
+               'Paul Laura George Oana Stefan Emma Lucas Mia Noah Lena Jonas Clara Felix').split()
+LAST_NAMES = ('Popescu Ionescu Popa Radu Stan Dumitru Stoica Gheorghe Matei Ciobanu Rusu Moldovan '
+              'Muller Schmidt Smith Jones Brown Garcia Rossi Novak Kowalski Horvat').split()
+CITIES = (('Bucharest', 'Romania'), ('Cluj-Napoca', 'Romania'), ('Iasi', 'Romania'), ('Timisoara', 'Romania'),
+          ('Brasov', 'Romania'), ('Berlin', 'Germany'), ('Munich', 'Germany'), ('London', 'United Kingdom'),
+          ('Paris', 'France'), ('Madrid', 'Spain'), ('Warsaw', 'Poland'), ('Amsterdam', 'Netherlands'))
+INDUSTRIES = ('Technology', 'Finance', 'Healthcare', 'Education', 'Retail', 'Logistics', 'Manufacturing')
+SIZES = ('1-10', '11-50', '51-200', '201-500', '501-1000', '1000+')
+COMPANY_WORDS = ('Blue Nova Apex Delta Vertex Quantum Bright Iron Silver North Green Solid Rapid '
+                 'Prime Cloud Data Smart Open Core Pixel').split()
+COMPANY_SUFFIXES = ('Labs', 'Systems', 'Solutions', 'Group', 'Works', 'Partners', 'Digital', 'Soft')
+SKILLS = ('Python Java JavaScript TypeScript React Angular Vue Django Flask Spring Node.js Go Rust C++ C# '
+          '.NET SQL PostgreSQL MySQL MongoDB Redis Docker Kubernetes AWS Azure GCP Terraform Linux Git '
+          'CI/CD Kafka Spark Pandas Machine-Learning Data-Analysis Excel Accounting Sales Marketing SEO '
+          'Figma UX-Design Project-Management Scrum Customer-Support Recruiting Negotiation English German '
+          'French Spanish Copywriting Android iOS Swift Kotlin PHP Laravel Ruby Rails Elixir Scala').split()
+JOB_ROLES = ('Engineer Developer Analyst Designer Manager Consultant Specialist Architect Accountant '
+             'Recruiter Administrator Tester').split()
+JOB_LEVELS = ('Junior', 'Mid', 'Senior', 'Lead', 'Principal')
+EMPLOYMENT_TYPES = ('Full-time', 'Full-time', 'Full-time', 'Part-time', 'Contract', 'Internship')
+APPLICATION_STATUSES = ('Applied', 'Applied', 'Applied', 'Interview', 'Rejected', 'Offer')
+PHRASES = ('Sounds good', 'Thanks for reaching out', 'Could we schedule a call?', 'I am available tomorrow',
+           'Please find my CV attached', 'What is the salary range?', 'Looking forward to it',
+           'Is the role remote friendly?', 'We would like to move forward', 'Let me check and get back to you')
+
+
+def _totals(options):
+    """Parent rows per entity; batches are ``batch_size`` of these."""
+    return {
+        'users': options['companies'] + options['candidates'],
+        'companies': options['companies'],
+        'candidates': options['candidates'],
+        'jobs': options['jobs'],
+        'candidate_links': options['candidates'],
+        'conversations': options['conversations'],
+    }
+
+
+def _plan(params):
+    """Batch count per entity."""
+    return {entity: math.ceil(total / params['batch_size']) for entity, total in params['totals'].items()}
+
+
+# ---------------------------------------------------------------------------
+# Deterministic batch builders; each returns [(table, rows), ...]
+# ---------------------------------------------------------------------------
+
+_samplers = {}
+
+
+def _zipf(n, exponent=1.1):
+    """Cumulative Zipf weights over n ranks (cached per process)."""
+    key = (n, exponent)
+    if key not in _samplers:
+        _samplers[key] = list(itertools.accumulate(1.0 / (rank + 1) ** exponent for rank in range(n)))
+    return _samplers[key]
+
+
+def _pick(rng, cumulative):
+    return bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+
+
+def _geometric(rng, mean, cap):
+    """0, 1, 2, ... with the given mean, truncated at *cap*."""
+    if mean <= 0:
+        return 0
+    p = 1.0 / (mean + 1)
+    return min(cap, int(math.log(1.0 - rng.random()) / math.log(1.0 - p)))
+
+
+def _when(rng, days=365):
+    return EPOCH - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _build_users(p, start, stop, rng):
+    rows = []
+    for i in range(start, stop):
+        client = i < p['companies']
+        rows.append({
+            'id': p['bases']['users'] + i,
+            'username': f"fx-{p['run']}-{'client' if client else 'cand'}-{i}",
+            'password_hash': p['password_hash'],
+            'role': 'client' if client else 'candidate',
+        })
+    return [(User.__table__, rows)]
+
+
+def _build_companies(p, start, stop, rng):
+    rows = []
+    for i in range(start, stop):
+        city, country = rng.choice(CITIES)
+        rows.append({
+            'id': p['bases']['companies'] + i,
+            'user_id': p['bases']['users'] + i,
+            'name': f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {p['run']}-{i}",
+            'bio': f"{rng.choice(INDUSTRIES)} company based in {city}.",
+            'industry': rng.choice(INDUSTRIES),
+            'size': SIZES[min(len(SIZES) - 1, _geometric(rng, 1.2, len(SIZES)))],
+            'city': city,
+            'country': country,
+            'founded_date': (EPOCH - timedelta(days=rng.randrange(40 * 365))).date(),
+            'created_at': _when(rng, 3 * 365),
+            'updated_at': EPOCH,
+        })
+    return [(Company.__table__, rows)]
+
+
+def _build_candidates(p, start, stop, rng):
+    rows = []
+    for i in range(start, stop):
+        city, country = rng.choice(CITIES)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append({
+            'id': p['bases']['candidates'] + i,
+            'user_id': p['bases']['users'] + p['companies'] + i,
+            'full_name': f"{first} {last}",
+            'email': f"{first.lower()}.{last.lower()}.{i}@{p['run']}.fixtures.test",
+            'city': city,
+            'country': country,
+            'summary': f"{rng.choice(JOB_LEVELS)} {rng.choice(JOB_ROLES).lower()} from {city}.",
+            'version': 1,
+        })
+    return [(CandidateProfile.__table__, rows)]
+
+
+def _build_jobs(p, start, stop, rng):
+    companies = _zipf(p['companies'])
+    rows = []
+    for i in range(start, stop):
+        city, _ = rng.choice(CITIES)
+        skills = rng.sample(SKILLS, 3)
+        posted = _when(rng, 180)
+        rows.append({
+            'id': p['bases']['jobs'] + i,
+            'company_id': p['bases']['companies'] + _pick(rng, companies),
+            'title': f"{rng.choice(JOB_LEVELS)} {skills[0]} {rng.choice(JOB_ROLES)}",
+            'description': f"We are looking for someone with {', '.join(skills)} experience in {city}.",
+            'requirements': ', '.join(skills),
+            'location': city,
+            'employment_type': rng.choice(EMPLOYMENT_TYPES),
+            'remote': rng.random() < 0.3,
+            'posted_at': posted,
+            'expires_at': posted + timedelta(days=rng.choice((30, 60, 90))),
+        })
+    return [(JobPosition.__table__, rows)]
+
+
+def _build_candidate_links(p, start, stop, rng):
+    """Skills and applications, generated per candidate so pairs stay unique."""
+    skill_weights = _zipf(len(p['skill_ids']), 1.0)
+    jobs = _zipf(p['jobs']) if p['jobs'] else None
+    skills, applications = [], []
+    for i in range(start, stop):
+        candidate_id = p['bases']['candidates'] + i
+        picked = set()
+        for _ in range(_geometric(rng, p['skills_per_candidate'], 30)):
+            picked.add(_pick(rng, skill_weights))
+        for index in sorted(picked):
+            skills.append({
+                'candidate_id': candidate_id,
+                'skill_id': p['skill_ids'][index],
+                'proficiency': rng.choice(('Beginner', 'Intermediate', 'Intermediate', 'Expert')),
+            })
+        if jobs is None:
+            continue
+        applied = set()
+        for _ in range(_geometric(rng, p['applications_per_candidate'], 50)):
+            applied.add(_pick(rng, jobs))
+        for index in sorted(applied):
+            applications.append({
+                'candidate_id': candidate_id,
+                'job_position_id': p['bases']['jobs'] + index,
+                'applied_at': _when(rng, 120),
+                'status': rng.choice(APPLICATION_STATUSES),
+            })
+    return [(CandidateSkill.__table__, skills), (JobApplication.__table__, applications)]
+
+
+def _build_conversations(p, start, stop, rng):
+    """Conversations between a company owner and a candidate, with their messages."""
+    owners = _zipf(p['companies'])
+    mean = p['messages'] / max(1, p['conversations'])
+    mu = math.log(max(mean, 1.0)) - 0.5  # log-normal with sigma=1 has mean exp(mu + 1/2)
+    conversations, participants, messages = [], [], []
+    for i in range(start, stop):
+        conversation_id = p['bases']['conversations'] + i
+        client = p['bases']['users'] + _pick(rng, owners)
+        candidate = p['bases']['users'] + p['companies'] + rng.randrange(p['candidates'])
+        count = max(1, min(5000, int(rng.lognormvariate(mu, 1.0))))
+        unread = min(count, _geometric(rng, 0.7, 20))
+        at = _when(rng, 365)
+        unread_for = {client: 0, candidate: 0}
+        for n in range(count):
+            at += timedelta(seconds=rng.randrange(30, 6 * 3600))
+            sender = client if (n == 0 or rng.random() < 0.5) else candidate
+            is_read = n < count - unread
+            if not is_read:
+                unread_for[candidate if sender == client else client] += 1
+            messages.append({
+                'conversation_id': conversation_id,
+                'sender_id': sender,
+                'body': rng.choice(PHRASES),
+                'is_read': is_read,
+                'read_at': at + timedelta(minutes=5) if is_read else None,
+                'created_at': at,
+            })
+        conversations.append({
+            'id': conversation_id,
+            'created_at': messages[-count]['created_at'],
+            'last_message_at': at,
+            'message_count': count,
+        })
+        for user_id in (client, candidate):
+            participants.append({
+                'conversation_id': conversation_id,
+                'user_id': user_id,
+                'last_read': at if not unread_for[user_id]
+                else messages[-unread]['created_at'] - timedelta(seconds=1),
+                'unread_count': unread_for[user_id],
+            })
+    return [(Conversation.__table__, conversations), (Participant.__table__, participants),
+            (Message.__table__, messages)]
+
+
+BUILDERS = {
+    'users': _build_users,
+    'companies': _build_companies,
+    'candidates': _build_candidates,
+    'jobs': _build_jobs,
+    'candidate_links': _build_candidate_links,
+    'conversations': _build_conversations,
+}
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+_engines = {}
+
+
+def _engine(url):
+    if url not in _engines:
+        options = {'connect_args': {'timeout': 60}} if url.startswith('sqlite') else {}
+        _engines[url] = create_engine(url, **options)
+    return _engines[url]
+
+
+def _insert(conn, table, rows):
+    if not rows:
+        return
+    # every row carries the same keys, so one VALUES tuple costs len(rows[0]) params
+    per_statement = max(1, MAX_PARAMS // len(rows[0]))
+    for offset in range(0, len(rows), per_statement):
+        conn.execute(table.insert().values(rows[offset:offset + per_statement]))
+
+
+def run_batch(url, params, entity, batch):
+    """Build and insert one batch, recording it in ``fixture_batches``.  Returns rows written."""
+    size = params['batch_size']
+    start = batch * size
+    stop = min(start + size, params['totals'][entity])
+    rng = random.Random(f"{params['seed']}:{entity}:{batch}")
+    written = 0
+    with _engine(url).begin() as conn:
+        for table, rows in BUILDERS[entity](params, start, stop, rng):
+            _insert(conn, table, rows)
+            written += len(rows)
+        if entity == 'conversations' and stop > start:
+            # messages get database ids; point each conversation at its newest
+            lo = params['bases']['conversations'] + start
+            hi = params['bases']['conversations'] + stop - 1
+            newest = (
+                select(func.max(Message.id))
+                .where(Message.conversation_id == Conversation.id)
+                .scalar_subquery()
+            )
+            conn.execute(
+                Conversation.__table__.update()
+                .where(Conversation.id.between(lo, hi))
+                .values(last_message_id=newest)
+            )
+        conn.execute(fixture_batches.insert().values(
+            run=params['run'], entity=entity, batch=batch, rows=written))
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def _reserved_ends(conn):
+    """Per table, the first id past every range pinned by a run so far."""
+    ends = dict.fromkeys(ID_TABLES, 1)
+    for raw in conn.execute(select(fixture_runs.c.params)).scalars():
+        params = json.loads(raw)
+        for entity in ID_TABLES:
+            ends[entity] = max(ends[entity], params['bases'][entity] + params['totals'][entity])
+    return ends
+
+
+def _reserve_ids(conn, totals):
+    """First id of the range the run owns in each table.
+
+    Ranges start above existing rows and above the ranges of other runs,
+    finished or not.  On Postgres the sequences are moved past the range
+    right away, so the application's own inserts stay clear of it while
+    the run is in progress.
+    """
+    ends = _reserved_ends(conn)
+    bases = {}
+    for entity, table in ID_TABLES.items():
+        top = conn.execute(select(func.max(table.c.id))).scalar() or 0
+        bases[entity] = max(ends[entity], top + 1)
+        if conn.dialect.name == 'postgresql':
+            sequence = f"pg_get_serial_sequence('\"{table.name}\"', 'id')"
+            bases[entity] = max(bases[entity], conn.execute(text(f"SELECT nextval({sequence})")).scalar())
+            conn.execute(text(f"SELECT setval({sequence}, :last)"),
+                         {'last': max(bases[entity] + totals[entity] - 1, 1)})
+    return bases
+
+
+def _foreign_rows(conn, params, done):
+    """Tables where rows not written by the run sit in its reserved ranges."""
+    size = params['batch_size']
+    tables = []
+    for entity, table in ID_TABLES.items():
+        base, total = params['bases'][entity], params['totals'][entity]
+        expected = sum(min(size, total - batch * size) for name, batch in done if name == entity)
+        found = conn.execute(
+            select(func.count()).select_from(table).where(table.c.id.between(base, base + total - 1))
+        ).scalar()
+        if found > expected:
+            tables.append(table.name)
+    return tables
+
+
+def _skill_ids(count):
+    from utils.skills import get_or_create_skills
+
+    names = list(SKILLS)
+    for n in itertools.count(2):
+        if len(names) >= count:
+            break
+        names.extend(f"{name} {n}" for name in SKILLS)
+    ids = get_or_create_skills(names[:count])
+    db.session.commit()
+    return [ids[name] for name in names[:count]]
+
+
+@fixtures_cli.command('generate')
+@click.option('--run', 'run_name', default='bench', show_default=True,
+              help='Run name; re-running a name resumes it.')
+@click.option('--seed', default=42, show_default=True)
+@click.option('--companies', default=1000, show_default=True)
+@click.option('--candidates', default=10000, show_default=True)
+@click.option('--jobs', default=5000, show_default=True)
+@click.option('--messages', default=100000, show_default=True, help='Approximate total messages.')
+@click.option('--conversations', default=None, type=int, help='Defaults to messages / 25.')
+@click.option('--skills', 'skill_count', default=300, show_default=True, help='Size of the skill vocabulary.')
+@click.option('--skills-per-candidate', default=5.0, show_default=True)
+@click.option('--applications-per-candidate', default=2.0, show_default=True)
+@click.option('--batch-size', default=5000, show_default=True, help='Parent rows per batch.')
+@click.option('--workers', default=max(1, multiprocessing.cpu_count() - 1), show_default=True,
+              help='Worker processes; 0 runs batches in this process.')
+@click.option('--password', default='fixture-password', show_default=True, help='Password of every user.')
+def generate(run_name, seed, companies, candidates, jobs, messages, conversations, skill_count,
+             skills_per_candidate, applications_per_candidate, batch_size, workers, password):
+    """Generate (or resume) a deterministic synthetic dataset."""
+    from utils.passwords import hash_password
+
+    if jobs and not companies:
+        raise click.UsageError('--jobs needs at least one company')
+    if (messages or conversations) and not (companies and candidates):
+        raise click.UsageError('conversations need companies and candidates')
+    if skills_per_candidate > 0 and not skill_count:
+        raise click.UsageError('--skills-per-candidate needs at least one skill (--skills)')
+    options = {
+        'seed': seed, 'companies': companies, 'candidates': candidates, 'jobs': jobs,
+        'messages': messages,
+        'conversations': conversations if conversations is not None else messages // 25,
+        'skill_count': skill_count, 'skills_per_candidate': skills_per_candidate,
+        'applications_per_candidate': applications_per_candidate, 'batch_size': batch_size,
+    }
+
+    engine = db.engine
+    progress_metadata.create_all(engine)
+    with engine.begin() as conn:
+        stored = conn.execute(select(fixture_runs.c.params).where(fixture_runs.c.run == run_name)).scalar()
+        if stored is None:
+            totals = _totals(options)
+            params = {**options, 'run': run_name, 'bases': _reserve_ids(conn, totals), 'totals': totals}
+            conn.execute(fixture_runs.insert().values(run=run_name, params=json.dumps(params)))
+            click.echo(f"Starting run {run_name!r}")
+        else:
+            params = json.loads(stored)
+            if {key: params[key] for key in options} != options:
+                raise click.UsageError(f"Run {run_name!r} exists with different parameters; "
+                                       f"resume it with the same options or pick another --run")
+            click.echo(f"Resuming run {run_name!r}")
+        done = {(entity, batch) for entity, batch in conn.execute(
+            select(fixture_batches.c.entity, fixture_batches.c.batch).where(fixture_batches.c.run == run_name)
+        )}
+        # only Postgres keeps other inserts out of a paused run's ranges
+        taken = _foreign_rows(conn, params, done)
+        if taken:
+            raise click.UsageError(f"Rows written outside run {run_name!r} use ids it reserved in "
+                                   f"{', '.join(taken)}; it cannot be resumed, start another --run")
+
+    # shared, small and not worth a batch: one password hash, the skill vocabulary
+    params['password_hash'] = hash_password(password)
+    params['skill_ids'] = _skill_ids(skill_count)
+
+    url = engine.url.render_as_string(hide_password=False)
+    if workers == 0 or engine.url.database in (None, '', ':memory:'):
+        workers = 0
+        _engines[url] = engine
+    plan = _plan(params)
+
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) if workers else None
+    try:
+        for entity in ENTITIES:
+            if not plan[entity]:
+                continue
+            batches = [n for n in range(plan[entity]) if (entity, n) not in done]
+            start, rows = time.perf_counter(), 0
+            if pool:
+                futures = [pool.submit(run_batch, url, params, entity, n) for n in batches]
+                for future in as_completed(futures):
+                    rows += future.result()
+            else:
+                for n in batches:
+                    rows += run_batch(url, params, entity, n)
+            elapsed = time.perf_counter() - start
+            skipped = plan[entity] - len(batches)
+            click.echo(f"{entity:16} {len(batches):6d} batches {rows:10d} rows in {elapsed:8.1f}s "
+                       f"({rows / elapsed if elapsed else 0:10.0f} rows/s)"
+                       + (f", {skipped} batches already done" if skipped else ""))
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    click.echo(f"Run {run_name!r} complete")
+
+
+@fixtures_cli.command('status')
+@click.option('--run', 'run_name', default=None, help='Only this run.')
+def status(run_name):
+    """Show generated runs and their progress."""
+    engine = db.engine
+    progress_metadata.create_all(engine)
+    with engine.connect() as conn:
+        query = select(fixture_runs.c.run, fixture_runs.c.params)
+        if run_name:
+            query = query.where(fixture_runs.c.run == run_name)
+        for name, raw in conn.execute(query).all():
+            params = json.loads(raw)
+            plan = _plan(params)
+            counts = dict(conn.execute(
+                select(fixture_batches.c.entity, func.count())
+                .where(fixture_batches.c.run == name)
+                .group_by(fixture_batches.c.entity)
+            ).all())
+            click.echo(f"{name}: seed={params['seed']}")
+            for entity in ENTITIES:
+                click.echo(f"  {entity:16} {counts.get(entity, 0):6d}/{plan[entity]} batches")
+
+
+def init_app(app):
+    app.cli.add_command(fixtures_cli)
@@ -6,6 +6,7 @@ import random
 
 """
 Standalone script to generate fake clients and candidates JSON and post to the Flask add_items endpoint.
+The server must run with EXTRA_ENDPOINTS_ENABLED=1 (see blueprints/extra/addon.py).
 Usage:
     python generate_data.py --host http://localhost:5000 --clients 10 --candidates 20
 """
@@ -1,14 +1,25 @@
 import argparse
-import json
-import requests
-from faker import Faker
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+import requests
+from faker import Faker
+from requests.adapters import HTTPAdapter
+
 """
-Standalone script to generate fake job postings and applications JSON and post to the Flask job endpoints.
+Standalone script to generate fake job postings and applications and post them to the Flask app.
+Doubles as a write-path load generator: requests share a pooled HTTP session, run --concurrency
+at a time, and each phase reports rows/sec and request latency percentiles.
+
+By default every row is one request to the regular job routes.  With --batch-size N rows are
+sent N at a time to /extra/add_jobs and /extra/add_applications instead (the server must run
+with EXTRA_ENDPOINTS_ENABLED=1, see blueprints/extra/addon.py).
 Usage:
-    python generate_job_data.py --host http://localhost:5000 --jobs 10 --applications 20
+    python generate_job_data.py --host http://localhost:5000 --jobs 10 --applications 20 \
+        --company-ids 1 2 --candidate-ids 1 2 3 --concurrency 16 [--batch-size 500]
 """
 
 def generate_job_postings(n, fake, company_ids):
@@ -56,6 +67,73 @@ def generate_job_applications(n, fake, candidate_ids, job_ids):
         })
     return applications
 
+
+class Poster:
+    """Posts JSON on a pooled session from a thread pool and records latencies."""
+
+    def __init__(self, host, concurrency):
+        self.host = host
+        self.concurrency = concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.latencies = []
+        self._lock = threading.Lock()
+        # the job routes are CSRF protected; the token is bound to the session cookie
+        try:
+            token = self.session.get(f"{host}/api/csrf-token", timeout=30).json()['csrf_token']
+            self.session.headers['X-CSRFToken'] = token
+        except (requests.RequestException, ValueError, KeyError):
+            print("Could not fetch a CSRF token; posting without one")
+
+    def post(self, path, payload):
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(f"{self.host}{path}", json=payload, timeout=300)
+        except requests.RequestException as e:
+            resp = e
+        with self._lock:
+            self.latencies.append(time.perf_counter() - start)
+        return resp
+
+    def run(self, label, requests_, handle):
+        """Send ``(path, payload, rows)`` requests concurrently; *handle* returns rows created."""
+        self.latencies = []
+        start = time.perf_counter()
+        created = failed = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            responses = pool.map(lambda r: (r, self.post(r[0], r[1])), requests_)
+            for (path, payload, rows), resp in responses:
+                if isinstance(resp, Exception):
+                    print(f"Request to {path} failed: {resp}")
+                    failed += rows
+                    continue
+                ok = handle(resp, payload)
+                created += ok
+                failed += rows - ok
+        report(label, created, failed, time.perf_counter() - start, self.latencies)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label, created, failed, elapsed, latencies):
+    if not latencies:
+        print(f"{label}: nothing to send")
+        return
+    ms = [seconds * 1000 for seconds in latencies]
+    print(f"{label}: {created} created, {failed} failed in {elapsed:.2f}s "
+          f"({created / elapsed if elapsed else 0:.1f} rows/s, {len(ms)} requests, "
+          f"p50 {percentile(ms, 50):.1f}ms, p99 {percentile(ms, 99):.1f}ms, max {max(ms):.1f}ms)")
+
+
+def batched(rows, size):
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate fake job postings and applications and post to Flask job endpoints')
     parser.add_argument('--host', type=str, default='http://localhost:5000', help='Base URL of the Flask app')
@@ -63,46 +141,84 @@ def main():
     parser.add_argument('--applications', type=int, default=0, help='Number of job applications to generate')
     parser.add_argument('--company-ids', type=int, nargs='*', default=[], help='List of company IDs to assign jobs to')
     parser.add_argument('--candidate-ids', type=int, nargs='*', default=[], help='List of candidate IDs to assign applications to')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help='Rows per request to the /extra bulk endpoints (0 = one request per row)')
+    parser.add_argument('--verbose', action='store_true', help='Print every created row')
     args = parser.parse_args()
 
     fake = Faker()
+    poster = Poster(args.host, max(1, args.concurrency))
+    job_ids = []
 
     # Generate and post job postings
-    job_postings = generate_job_postings(args.jobs, fake, args.company_ids)
-    job_ids = []
-    headers = {'Content-Type': 'application/json'}
-    for job in job_postings:
-        if job['company_id'] is None:
-            print("Skipping job posting with no company_id")
-            continue
-        url = f"{args.host}/api/jobs"
-        resp = requests.post(url, headers=headers, data=json.dumps(job))
-        if resp.status_code == 201:
+    job_postings = [job for job in generate_job_postings(args.jobs, fake, args.company_ids) if job['company_id']]
+    if len(job_postings) < args.jobs:
+        print(f"Skipping {args.jobs - len(job_postings)} job postings with no company_id")
+
+    if args.batch_size:
+        def handle_jobs(resp, payload):
+            if resp.status_code not in (201, 400):
+                print(f"Failed to create jobs: {resp.status_code} {resp.text[:200]}")
+                return 0
+            data = resp.json()
+            job_ids.extend(data['ids'])
+            for error in data['errors'][:5]:
+                print(f"Rejected job: {error}")
+            return data['created']['jobs']
+        work = [('/extra/add_jobs', {'jobs': chunk}, len(chunk)) for chunk in batched(job_postings, args.batch_size)]
+    else:
+        def handle_jobs(resp, payload):
+            if resp.status_code != 201:
+                print(f"Failed to create job: {resp.status_code} {resp.text[:200]}")
+                return 0
             job_data = resp.json()
             job_ids.append(job_data['id'])
-            print(f"Created job: {job_data['title']} (ID: {job_data['id']})")
-        else:
-            print(f"Failed to create job: {resp.status_code} {resp.text}")
+            if args.verbose:
+                print(f"Created job: {job_data['title']} (ID: {job_data['id']})")
+            return 1
+        work = [('/api/jobs', job, 1) for job in job_postings]
+    poster.run('jobs', work, handle_jobs)
 
     # Generate and post job applications
-    job_applications = generate_job_applications(args.applications, fake, args.candidate_ids, job_ids)
-    for app in job_applications:
-        if app['candidate_id'] is None or app['job_position_id'] is None:
-            print("Skipping application with missing candidate_id or job_position_id")
-            continue
-        url = f"{args.host}/api/jobs/{app['job_position_id']}/apply"
-        # Only send candidate_id, resume_path, cover_letter_path in payload as per route
-        payload = {
-            'candidate_id': app['candidate_id'],
-            'resume_path': app.get('resume_path'),
-            'cover_letter_path': app.get('cover_letter_path'),
-        }
-        resp = requests.post(url, headers=headers, data=json.dumps(payload))
-        if resp.status_code == 201:
+    job_applications = [
+        app for app in generate_job_applications(args.applications, fake, args.candidate_ids, job_ids)
+        if app['candidate_id'] and app['job_position_id']
+    ]
+    if len(job_applications) < args.applications:
+        print(f"Skipping {args.applications - len(job_applications)} applications "
+              f"with missing candidate_id or job_position_id")
+
+    if args.batch_size:
+        def handle_applications(resp, payload):
+            if resp.status_code not in (201, 400):
+                print(f"Failed to create applications: {resp.status_code} {resp.text[:200]}")
+                return 0
+            data = resp.json()
+            for error in data['errors'][:5]:
+                print(f"Rejected application: {error}")
+            return data['created']['applications']
+        work = [('/extra/add_applications', {'applications': chunk}, len(chunk))
+                for chunk in batched(job_applications, args.batch_size)]
+    else:
+        def handle_applications(resp, payload):
+            if resp.status_code != 201:
+                if args.verbose:
+                    print(f"Failed to create application: {resp.status_code} {resp.text[:200]}")
+                return 0
             app_data = resp.json()
-            print(f"Created application for candidate {app_data['candidate_name']} to job ID {app_data['job_position_id']}")
-        else:
-            print(f"Failed to create application: {resp.status_code} {resp.text}")
+            if args.verbose:
+                print(f"Created application for candidate {app_data['candidate_name']} "
+                      f"to job ID {app_data['job_position_id']}")
+            return 1
+        # Only send candidate_id, resume_path, cover_letter_path in payload as per route
+        work = [
+            (f"/api/jobs/{app['job_position_id']}/apply",
+             {'candidate_id': app['candidate_id'], 'resume_path': app['resume_path'],
+              'cover_letter_path': app['cover_letter_path']}, 1)
+            for app in job_applications
+        ]
+    poster.run('applications', work, handle_applications)
 
 if __name__ == '__main__':
     main()
@@ -90,9 +90,18 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # FTS5 virtual tables (and their shadow tables) are managed by hand in
+    # the migrations, and the fixture generator's progress tables
+    # (extra/fixtures.py) by the generator; neither by autogenerate
+    def include_name(name, type_, parent_names):
+        if type_ == 'table':
+            return not (name or '').startswith(('job_positions_fts', 'fixture_'))
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
@@ -0,0 +1,58 @@
+"""add job full text search
+
+Revision ID: 9d3e6a1f4b82
+Revises: 5e2b8d41c7a9
+Create Date: 2026-10-18 12:02:37.915044
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3e6a1f4b82'
+down_revision = '5e2b8d41c7a9'
+branch_labels = None
+depends_on = None
+
+PG_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_positions_fts USING fts5("
+    "title, description, location, content='job_positions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS job_positions_fts_ai AFTER INSERT ON job_positions BEGIN "
+    "INSERT INTO job_positions_fts(rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+    "CREATE TRIGGER IF NOT EXISTS job_positions_fts_ad AFTER DELETE ON job_positions BEGIN "
+    "INSERT INTO job_positions_fts(job_positions_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); END",
+    "CREATE TRIGGER IF NOT EXISTS job_positions_fts_au AFTER UPDATE OF title, description, location "
+    "ON job_positions BEGIN "
+    "INSERT INTO job_positions_fts(job_positions_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); "
+    "INSERT INTO job_positions_fts(rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+    # index the rows that already exist
+    "INSERT INTO job_positions_fts(job_positions_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.create_index('ix_job_positions_search', 'job_positions', [sa.text(PG_DOCUMENT)],
+                        unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS job_positions_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS job_positions_fts")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_job_positions_search', table_name='job_positions')
@@ -0,0 +1,63 @@
+"""add conversation summary columns
+
+Revision ID: b6684ab70af4
+Revises: 736b48dc188d
+Create Date: 2026-10-18 09:12:44.318201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6684ab70af4'
+down_revision = '736b48dc188d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_message_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_message_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('message_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_conversations_last_message_at'), ['last_message_at'], unique=False)
+
+    with op.batch_alter_table('participants', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_participants_user_id'), ['user_id'], unique=False)
+
+    # Backfill the summary from existing messages.
+    op.execute("""
+        UPDATE conversations SET
+            message_count = (
+                SELECT COUNT(*) FROM messages m WHERE m.conversation_id = conversations.id
+            ),
+            last_message_id = (
+                SELECT m.id FROM messages m WHERE m.conversation_id = conversations.id
+                ORDER BY m.created_at DESC, m.id DESC LIMIT 1
+            ),
+            last_message_at = (
+                SELECT MAX(m.created_at) FROM messages m WHERE m.conversation_id = conversations.id
+            )
+    """)
+    op.execute("""
+        UPDATE participants SET unread_count = (
+            SELECT COUNT(*) FROM messages m
+            WHERE m.conversation_id = participants.conversation_id
+              AND m.sender_id != participants.user_id
+              AND (m.is_read IS NULL OR m.is_read = false)
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('participants', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_participants_user_id'))
+        batch_op.drop_column('unread_count')
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_conversations_last_message_at'))
+        batch_op.drop_column('message_count')
+        batch_op.drop_column('last_message_at')
+        batch_op.drop_column('last_message_id')
@@ -0,0 +1,224 @@
+"""Candidate full-profile serialisation, caching and versioning.
+
+``CandidateProfile.version`` is bumped (``touch_profile``) by every writer of
+a profile or its collections.  The serialised profile is cached per
+candidate together with the version it was built from, and the version is
+the profile's ``ETag``:
+
+* ``If-None-Match`` is answered from ``profile_versions`` without touching
+  the database while the entry is fresh (``PROFILE_VERSION_TTL`` seconds);
+* otherwise one ``SELECT version`` decides between a 304, the cached
+  payload, or a fresh load.
+
+Both caches are per worker process.  Writes through this process invalidate
+them on commit; writes made by another worker become visible once the
+version entry expires.
+"""
+import os
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from db.candidate_models import CandidateProfile, CandidateSkill
+from db.job_models import JobApplication, JobPosition
+from db.models import db
+from utils.cache import TTLCache
+
+# Load each collection of a full profile with its own ``SELECT ... IN``.
+# Joined-loading several one-to-many collections at once multiplies their
+# sizes into one huge result set (10 rows each -> 100k rows).  Many-to-one
+# hops (skill, job, company) are safe to join onto their collection query.
+FULL_PROFILE_OPTIONS = (
+    selectinload(CandidateProfile.employments),
+    selectinload(CandidateProfile.documents),
+    selectinload(CandidateProfile.applications)
+        .joinedload(JobApplication.job_position)
+        .joinedload(JobPosition.company),
+    selectinload(CandidateProfile.candidate_skills).joinedload(CandidateSkill.skill),
+    selectinload(CandidateProfile.educations),
+)
+
+# candidate id -> (version, payload)
+profile_cache = TTLCache(
+    maxsize=int(os.getenv("PROFILE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PROFILE_CACHE_TTL", "300")),
+)
+# candidate id -> version; short-lived so other workers' writes show up
+profile_versions = TTLCache(
+    maxsize=int(os.getenv("PROFILE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PROFILE_VERSION_TTL", "30")),
+)
+
+_TOUCHED = "touched_candidate_profiles"
+
+
+def invalidate_profile(candidate_id: int) -> None:
+    profile_cache.invalidate(candidate_id)
+    profile_versions.invalidate(candidate_id)
+
+
+def touch_profile(candidate_id: int) -> None:
+    """Bump the version of *candidate_id* in the current transaction.
+
+    Call this from anything that changes what ``serialize_full_profile``
+    returns; cached copies are dropped when the transaction commits.
+    """
+    if candidate_id is None:
+        return
+    touch_profiles([candidate_id])
+
+
+def touch_profiles(candidate_ids) -> None:
+    """``touch_profile`` for many candidates with a single UPDATE."""
+    candidate_ids = {cid for cid in candidate_ids if cid is not None}
+    if not candidate_ids:
+        return
+    db.session.execute(
+        update(CandidateProfile)
+        .where(CandidateProfile.id.in_(candidate_ids))
+        .values(version=CandidateProfile.version + 1)
+    )
+    db.session.info.setdefault(_TOUCHED, set()).update(candidate_ids)
+    for candidate_id in candidate_ids:
+        invalidate_profile(candidate_id)
+
+
+def touch_applicants(*criteria) -> None:
+    """``touch_profiles`` every candidate who applied to a job matching *criteria*.
+
+    Profiles embed the title and company name of each application's job, so
+    call this when those change or before the jobs are deleted (the
+    applications go with them).
+    """
+    touch_profiles(db.session.scalars(
+        select(JobApplication.candidate_id)
+        .join(JobApplication.job_position)
+        .where(*criteria)
+        .distinct()
+    ))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_touched(session):
+    for candidate_id in session.info.pop(_TOUCHED, ()):
+        invalidate_profile(candidate_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched(session):
+    session.info.pop(_TOUCHED, None)
+
+
+def profile_etag(candidate_id: int, version: int) -> str:
+    return f"candidate-{candidate_id}-v{version}"
+
+
+def current_version(candidate_id: int):
+    """Version of *candidate_id*, from the cache when fresh; None if missing."""
+    version = profile_versions.get(candidate_id)
+    if version is None:
+        version = (
+            db.session.query(CandidateProfile.version)
+            .filter(CandidateProfile.id == candidate_id)
+            .scalar()
+        )
+        if version is not None:
+            profile_versions.set(candidate_id, version)
+    return version
+
+
+def cached_full_profile(candidate_id: int, version: int):
+    """Return ``(version, payload)`` for *candidate_id*, loading it unless the
+    cached payload is at *version*.  None when the candidate does not exist.
+    """
+    entry = profile_cache.get(candidate_id)
+    if entry is not None and entry[0] == version:
+        return entry
+    candidate = CandidateProfile.query.options(*FULL_PROFILE_OPTIONS).filter_by(id=candidate_id).first()
+    if candidate is None:
+        return None
+    entry = (candidate.version, serialize_full_profile(candidate))
+    profile_cache.set(candidate.id, entry)
+    profile_versions.set(candidate.id, candidate.version)
+    return entry
+
+
+def serialize_full_profile(candidate: CandidateProfile) -> dict:
+    """Serialize a candidate and all related sections (load with FULL_PROFILE_OPTIONS)."""
+    profile = {
+        "id": candidate.id,
+        "user_id": candidate.user_id,
+        "full_name": candidate.full_name,
+        "email": candidate.email,
+        "phone": candidate.phone,
+        "city": candidate.city,
+        "country": candidate.country,
+        "profile_picture": candidate.profile_picture,
+        "summary": candidate.summary,
+    }
+
+    employments = [
+        {
+            "id": emp.id,
+            "company_name": emp.company_name,
+            "position": emp.position,
+            "start_date": emp.start_date.isoformat(),
+            "end_date": emp.end_date.isoformat() if emp.end_date else None,
+            "description": emp.description,
+        }
+        for emp in candidate.employments
+    ]
+
+    documents = [
+        {
+            "id": doc.id,
+            "doc_type": doc.doc_type,
+            "file_path": doc.file_path,
+            "uploaded_at": doc.uploaded_at.isoformat(),
+        }
+        for doc in candidate.documents
+    ]
+
+    applications = [
+        {
+            "id": app.id,
+            "job_title": app.job_position.title if app.job_position else None,
+            "company_name": app.job_position.company.name if app.job_position and app.job_position.company else None,
+            "applied_at": app.applied_at.isoformat(),
+            "status": app.status,
+            "resume_path": app.resume_path,
+            "cover_letter_path": app.cover_letter_path,
+        }
+        for app in candidate.applications
+    ]
+
+    skills = [
+        {
+            "skill_id": cs.skill.id,
+            "name": cs.skill.name,
+            "proficiency": cs.proficiency,
+        }
+        for cs in candidate.candidate_skills
+    ]
+
+    educations = [
+        {
+            "id": edu.id,
+            "institution": edu.institution,
+            "degree": edu.degree,
+            "field_of_study": edu.field_of_study,
+            "start_date": edu.start_date.isoformat() if edu.start_date else None,
+            "end_date": edu.end_date.isoformat() if edu.end_date else None,
+            "description": edu.description,
+        }
+        for edu in candidate.educations
+    ]
+
+    return {
+        "profile": profile,
+        "employments": employments,
+        "documents": documents,
+        "applications": applications,
+        "skills": skills,
+        "educations": educations,
+    }
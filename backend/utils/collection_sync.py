@@ -0,0 +1,101 @@
+"""Set-based sync of a parent's child rows against a submitted list.
+
+``sync_collection`` replaces the per-object ORM sync previously used by the
+candidate PATCH endpoint.  It reads the keys the parent already owns with one
+``SELECT``, diffs them against the payload, and writes each kind of change in
+one statement: a multi-row ``INSERT``, an executemany ``UPDATE`` by primary
+key and a single ``DELETE ... WHERE key IN (...)``.  The statements bypass the
+ORM unit of work, so callers must not rely on relationship collections that
+were loaded before the sync.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, bindparam, delete, insert, select, update
+
+from db.models import db
+
+
+def existing_keys(model, owner_key: str, owner_id, key: str = "id") -> set:
+    """Keys of the *model* rows that belong to *owner_id*."""
+    column = getattr(model, key)
+    owner = getattr(model, owner_key)
+    return set(db.session.scalars(select(column).where(owner == owner_id)))
+
+
+def _coerce(column, value):
+    # JSON carries dates as ISO strings; DBAPI drivers want date objects
+    if isinstance(value, str) and value:
+        try:
+            if isinstance(column.type, DateTime):
+                return datetime.fromisoformat(value)
+            if isinstance(column.type, Date):
+                return date.fromisoformat(value[:10])
+        except ValueError:
+            raise ValueError(f"{column.key}: invalid date {value!r}") from None
+    return value
+
+
+def _row(columns, item: dict) -> dict:
+    return {name: _coerce(columns[name], value) for name, value in item.items() if name in columns}
+
+
+def sync_collection(model, owner_key: str, owner_id, items, key: str = "id", existing=None) -> dict:
+    """Make the *owner_id* rows of *model* match *items*.
+
+    Items whose *key* is already owned are updated, the rest inserted (an
+    unknown surrogate id is dropped rather than trusted) and owned rows that
+    are not submitted are deleted.  Unknown fields are ignored and
+    *owner_key* is always forced to *owner_id*.  Pass *existing* when the
+    caller already fetched ``existing_keys``.  Returns the number of rows
+    ``inserted``, ``updated`` and ``deleted``; raises ``ValueError`` naming
+    the field when a date string does not parse.
+    """
+    table = model.__table__
+    columns = {c.key: c for c in table.columns if c.key != owner_key}
+    pk = [c.key for c in table.primary_key.columns]
+    surrogate = pk == [key]
+    if existing is None:
+        existing = existing_keys(model, owner_key, owner_id, key)
+
+    inserts, updates, seen = [], [], set()
+    for item in items:
+        row = _row(columns, item)
+        item_key = row.get(key)
+        if item_key is not None and item_key in existing:
+            if item_key in seen:
+                continue
+            seen.add(item_key)
+            values = {name: value for name, value in row.items() if name not in pk}
+            if values:
+                row[owner_key] = owner_id
+                values.update({f"_{name}": row[name] for name in pk})
+                updates.append(values)
+        else:
+            if surrogate:
+                row.pop(key, None)
+            elif item_key is None or item_key in seen:
+                continue
+            else:
+                seen.add(item_key)
+            row[owner_key] = owner_id
+            inserts.append(row)
+    stale = existing - seen
+
+    if inserts:
+        db.session.execute(insert(model), inserts)
+    if updates:
+        # executemany by primary key; rows with different fields get their
+        # own statement since SET is built from each batch's first row
+        where = [table.c[name] == bindparam(f"_{name}") for name in pk]
+        by_shape = {}
+        for row in updates:
+            by_shape.setdefault(frozenset(row), []).append(row)
+        for rows in by_shape.values():
+            db.session.execute(update(table).where(*where), rows)
+    if stale:
+        db.session.execute(
+            delete(model)
+            .where(getattr(model, owner_key) == owner_id, getattr(model, key).in_(stale))
+            .execution_options(synchronize_session=False)
+        )
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(stale)}
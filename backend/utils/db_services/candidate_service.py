@@ -5,19 +5,25 @@ from db.candidate_models import (
 from db.job_models import JobApplication
 from db.models import db
 from sqlalchemy.exc import SQLAlchemyError
+from utils.candidate_profile import invalidate_profile
+from utils.db_services import unit_of_work
+from utils.skills import invalidate_skill
 
 
 class CandidateProfileService:
+    # ``with CandidateProfileService.batch(): ...`` commits once for the block
+    batch = staticmethod(unit_of_work.batch)
+
     @staticmethod
     def create_profile(user_id: int, **kwargs) -> CandidateProfile:
         """Create a new candidate profile."""
         profile = CandidateProfile(user_id=user_id, **kwargs)
         try:
             db.session.add(profile)
-            db.session.commit()
+            unit_of_work.commit(flush=True)
             return profile
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -35,10 +41,11 @@ class CandidateProfileService:
             if hasattr(profile, key):
                 setattr(profile, key, value)
         try:
-            db.session.commit()
+            unit_of_work.touch(profile.id)
+            unit_of_work.commit()
             return profile
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -49,10 +56,11 @@ class CandidateProfileService:
             return False
         try:
             db.session.delete(profile)
-            db.session.commit()
+            unit_of_work.commit()
+            unit_of_work.on_commit(invalidate_profile, profile_id)
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
 
@@ -63,10 +71,11 @@ class EmploymentHistoryService:
         employment = EmploymentHistory(candidate_id=candidate_id, **kwargs)
         try:
             db.session.add(employment)
-            db.session.commit()
+            unit_of_work.touch(candidate_id)
+            unit_of_work.commit()
             return employment
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -84,10 +93,11 @@ class EmploymentHistoryService:
             if hasattr(emp, key):
                 setattr(emp, key, value)
         try:
-            db.session.commit()
+            unit_of_work.touch(emp.candidate_id)
+            unit_of_work.commit()
             return emp
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -98,10 +108,11 @@ class EmploymentHistoryService:
             return False
         try:
             db.session.delete(emp)
-            db.session.commit()
+            unit_of_work.touch(emp.candidate_id)
+            unit_of_work.commit()
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
 
@@ -112,10 +123,11 @@ class LegalDocumentService:
         doc = LegalDocument(candidate_id=candidate_id, **kwargs)
         try:
             db.session.add(doc)
-            db.session.commit()
+            unit_of_work.touch(candidate_id)
+            unit_of_work.commit()
             return doc
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -129,10 +141,11 @@ class LegalDocumentService:
             return False
         try:
             db.session.delete(doc)
-            db.session.commit()
+            unit_of_work.touch(doc.candidate_id)
+            unit_of_work.commit()
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
 
@@ -143,10 +156,11 @@ class JobApplicationService:
         app = JobApplication(candidate_id=candidate_id, **kwargs)
         try:
             db.session.add(app)
-            db.session.commit()
+            unit_of_work.touch(candidate_id)
+            unit_of_work.commit()
             return app
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -162,10 +176,11 @@ class JobApplicationService:
             if hasattr(app, key):
                 setattr(app, key, value)
         try:
-            db.session.commit()
+            unit_of_work.touch(app.candidate_id)
+            unit_of_work.commit()
             return app
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -175,10 +190,11 @@ class JobApplicationService:
             return False
         try:
             db.session.delete(app)
-            db.session.commit()
+            unit_of_work.touch(app.candidate_id)
+            unit_of_work.commit()
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
 
@@ -188,10 +204,10 @@ class SkillService:
         skill = Skill(name=name)
         try:
             db.session.add(skill)
-            db.session.commit()
+            unit_of_work.commit(flush=True)
             return skill
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -203,12 +219,14 @@ class SkillService:
         skill = SkillService.get_skill(skill_id)
         if not skill:
             return False
+        name = skill.name
         try:
             db.session.delete(skill)
-            db.session.commit()
+            unit_of_work.commit()
+            unit_of_work.on_commit(invalidate_skill, name)
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
 
@@ -218,10 +236,11 @@ class CandidateSkillService:
         cs = CandidateSkill(candidate_id=candidate_id, skill_id=skill_id, proficiency=proficiency)
         try:
             db.session.add(cs)
-            db.session.commit()
+            unit_of_work.touch(candidate_id)
+            unit_of_work.commit()
             return cs
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -231,10 +250,11 @@ class CandidateSkillService:
             return False
         try:
             db.session.delete(cs)
-            db.session.commit()
+            unit_of_work.touch(candidate_id)
+            unit_of_work.commit()
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
 
@@ -244,10 +264,11 @@ class EducationService:
         edu = Education(candidate_id=candidate_id, **kwargs)
         try:
             db.session.add(edu)
-            db.session.commit()
+            unit_of_work.touch(candidate_id)
+            unit_of_work.commit()
             return edu
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -263,10 +284,11 @@ class EducationService:
             if hasattr(edu, key):
                 setattr(edu, key, value)
         try:
-            db.session.commit()
+            unit_of_work.touch(edu.candidate_id)
+            unit_of_work.commit()
             return edu
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
 
     @staticmethod
@@ -276,8 +298,9 @@ class EducationService:
             return False
         try:
             db.session.delete(edu)
-            db.session.commit()
+            unit_of_work.touch(edu.candidate_id)
+            unit_of_work.commit()
             return True
         except SQLAlchemyError:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise
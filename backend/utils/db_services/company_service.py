@@ -1,17 +1,22 @@
 from db.models import Company, JobPosition, db
 from sqlalchemy.exc import SQLAlchemyError
+from utils.candidate_profile import touch_applicants
+from utils.db_services import unit_of_work
 
 class CompanyService:
+    # ``with CompanyService.batch(): ...`` commits once for the block
+    batch = staticmethod(unit_of_work.batch)
+
     @staticmethod
     def create_company(user_id: int, **kwargs) -> Company:
         """Create a new company."""
         company = Company(user_id=user_id, **kwargs)
         try:
             db.session.add(company)
-            db.session.commit()
+            unit_of_work.commit(flush=True)
             return company
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise e
 
     @staticmethod
@@ -29,10 +34,12 @@ class CompanyService:
             if hasattr(company, key):
                 setattr(company, key, value)
         try:
-            db.session.commit()
+            if "name" in kwargs:
+                touch_applicants(JobPosition.company_id == company.id)
+            unit_of_work.commit()
             return company
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise e
 
     @staticmethod
@@ -42,11 +49,12 @@ class CompanyService:
         if not company:
             return False
         try:
+            touch_applicants(JobPosition.company_id == company.id)
             db.session.delete(company)
-            db.session.commit()
+            unit_of_work.commit()
             return True
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise e
 
 class JobPositionService:
@@ -56,10 +64,10 @@ class JobPositionService:
         job = JobPosition(company_id=company_id, **kwargs)
         try:
             db.session.add(job)
-            db.session.commit()
+            unit_of_work.commit()
             return job
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise e
 
     @staticmethod
@@ -77,10 +85,12 @@ class JobPositionService:
             if hasattr(job, key):
                 setattr(job, key, value)
         try:
-            db.session.commit()
+            if "title" in kwargs:
+                touch_applicants(JobPosition.id == job.id)
+            unit_of_work.commit()
             return job
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise e
 
     @staticmethod
@@ -90,9 +100,10 @@ class JobPositionService:
         if not job:
             return False
         try:
+            touch_applicants(JobPosition.id == job.id)
             db.session.delete(job)
-            db.session.commit()
+            unit_of_work.commit()
             return True
         except SQLAlchemyError as e:
-            db.session.rollback()
+            unit_of_work.rollback()
             raise e
@@ -0,0 +1,81 @@
+"""Shared commit handling for the db services.
+
+Service methods commit on every call by default.  Inside ``batch()`` they
+only stage their changes: the batch flushes and commits once on exit (or
+rolls back if the block raises), candidate profile versions are bumped once
+per touched candidate, and post-commit hooks such as cache invalidation run
+after that single commit.  Batches nest; only the outermost one commits.
+
+    with CandidateProfileService.batch():
+        profile = CandidateProfileService.create_profile(user_id, ...)
+        for row in employments:
+            EmploymentHistoryService.create_employment(profile.id, **row)
+
+Creating a profile, company or skill flushes so its id can be used inside
+the batch; other writes are flushed together at commit.
+"""
+from contextlib import contextmanager
+
+from db.models import db
+from utils.candidate_profile import touch_profile, touch_profiles
+
+_DEPTH = "service_batch_depth"
+_TOUCHED = "service_batch_touched"
+_CALLBACKS = "service_batch_callbacks"
+
+
+def in_batch() -> bool:
+    return db.session.info.get(_DEPTH, 0) > 0
+
+
+@contextmanager
+def batch():
+    """Run service calls in one transaction, committed when the block exits."""
+    info = db.session.info
+    depth = info.get(_DEPTH, 0)
+    info[_DEPTH] = depth + 1
+    try:
+        yield db.session
+        if depth == 0:
+            touch_profiles(info.pop(_TOUCHED, ()))
+            db.session.commit()
+            for callback, args in info.pop(_CALLBACKS, ()):
+                callback(*args)
+    except BaseException:
+        if depth == 0:
+            info.pop(_TOUCHED, None)
+            info.pop(_CALLBACKS, None)
+            db.session.rollback()
+        raise
+    finally:
+        info[_DEPTH] = depth
+
+
+def touch(candidate_id: int) -> None:
+    """``touch_profile`` now, or once per candidate when the batch commits."""
+    if in_batch():
+        db.session.info.setdefault(_TOUCHED, set()).add(candidate_id)
+    else:
+        touch_profile(candidate_id)
+
+
+def commit(flush: bool = False) -> None:
+    """Commit, or inside a batch defer it (flushing first if *flush*)."""
+    if not in_batch():
+        db.session.commit()
+    elif flush:
+        db.session.flush()
+
+
+def rollback() -> None:
+    # inside a batch the exception propagates and the batch rolls back
+    if not in_batch():
+        db.session.rollback()
+
+
+def on_commit(callback, *args) -> None:
+    """Run ``callback(*args)`` after the commit that persists the current call."""
+    if in_batch():
+        db.session.info.setdefault(_CALLBACKS, []).append((callback, args))
+    else:
+        callback(*args)
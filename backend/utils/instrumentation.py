@@ -0,0 +1,346 @@
+"""Per-endpoint request instrumentation.
+
+When ``INSTRUMENTATION_ENABLED`` is set every request records its SQL
+statement count, time spent in the database, time spent serialising JSON,
+total latency and response size.  The numbers are
+
+* attached to the response as a ``Server-Timing`` header (visible in the
+  browser's network panel), and
+* aggregated per endpoint and served in Prometheus text format at
+  ``/api/_metrics``.
+
+Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are also logged and
+grouped by fingerprint (the SQL with its literals replaced by ``?``) in a
+rolling top-N table served as JSON at ``/api/_metrics/slow_queries``.  Only
+the types of the bound parameters are kept: their values include usernames,
+emails and password hashes.
+
+The hooks are always installed but return immediately while the flag is off,
+so it can be flipped at runtime (tests do).  Counters live in the worker
+process; each worker exposes its own.
+"""
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+from flask import current_app, g, has_app_context, has_request_context, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = '/api/_metrics'
+SLOW_QUERIES_PATH = '/api/_metrics/slow_queries'
+# upper bounds (seconds) of the request latency histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'queries', 'sql_seconds', 'serialize_seconds',
+                 'duration_seconds', 'response_bytes', 'buckets')
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.duration_seconds = 0.0
+        self.response_bytes = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+
+class MetricsRegistry:
+    """Thread-safe per-(endpoint, method) counters."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, method, queries, sql_seconds, serialize_seconds,
+                duration_seconds, response_bytes):
+        with self._lock:
+            stats = self._stats.get((endpoint, method))
+            if stats is None:
+                stats = self._stats[(endpoint, method)] = EndpointStats()
+            stats.requests += 1
+            stats.queries += queries
+            stats.sql_seconds += sql_seconds
+            stats.serialize_seconds += serialize_seconds
+            stats.duration_seconds += duration_seconds
+            stats.response_bytes += response_bytes
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration_seconds <= bound:
+                    stats.buckets[i] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {key: _copy(stats) for key, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def render(self) -> str:
+        """Return all counters in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, kind, help_text, attr):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (endpoint, method), stats in snapshot:
+                lines.append(f'{name}{{{_labels(endpoint, method)}}} {getattr(stats, attr)}')
+
+        snapshot = sorted(self.snapshot().items())
+        family('nigbot_http_requests_total', 'counter', 'Requests handled.', 'requests')
+        family('nigbot_db_queries_total', 'counter', 'SQL statements executed.', 'queries')
+        family('nigbot_db_seconds_total', 'counter', 'Time spent executing SQL.', 'sql_seconds')
+        family('nigbot_serialize_seconds_total', 'counter', 'Time spent serialising JSON.',
+               'serialize_seconds')
+        family('nigbot_response_bytes_total', 'counter', 'Response body bytes sent.', 'response_bytes')
+
+        name = 'nigbot_http_request_duration_seconds'
+        lines.append(f"# HELP {name} Request latency.")
+        lines.append(f"# TYPE {name} histogram")
+        for (endpoint, method), stats in snapshot:
+            labels = _labels(endpoint, method)
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {stats.requests}')
+            lines.append(f'{name}_sum{{{labels}}} {stats.duration_seconds}')
+            lines.append(f'{name}_count{{{labels}}} {stats.requests}')
+        return "\n".join(lines) + "\n"
+
+
+def _copy(stats):
+    clone = EndpointStats()
+    for attr in EndpointStats.__slots__:
+        value = getattr(stats, attr)
+        setattr(clone, attr, list(value) if isinstance(value, list) else value)
+    return clone
+
+
+def _labels(endpoint, method):
+    endpoint = endpoint.replace('\\', '\\\\').replace('"', '\\"')
+    return f'endpoint="{endpoint}",method="{method}"'
+
+
+registry = MetricsRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Slow-query log
+# ---------------------------------------------------------------------------
+
+_FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                  # string literals
+    (re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s"), '?'),          # bound parameters
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b"), '?'),       # numbers
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), '(?+)'),      # IN (?, ?, ...)
+    (re.compile(r"(\(\?\+\))(?:\s*,\s*\(\?\+\))+"), r'\1'),   # multi-row VALUES
+    (re.compile(r"\s+"), ' '),
+)
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise *statement* so queries differing only in literals group together."""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def param_types(parameters):
+    """The shape of *parameters* with every value replaced by its type name."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the first row stands for all of them
+            return {'rows': len(parameters), 'first': param_types(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+class SlowQueryLog:
+    """Rolling top-N of slow statements, keyed by fingerprint.
+
+    When the table is full a new fingerprint evicts the entry with the least
+    total time, so the expensive offenders stay put.
+    """
+
+    SAMPLES = 500  # durations kept per fingerprint for the percentiles
+
+    def __init__(self, top_n: int = 50):
+        self.top_n = top_n
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement, parameters, seconds, endpoint):
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.top_n:
+                    cheapest = min(self._entries, key=lambda k: self._entries[k]['total'])
+                    del self._entries[cheapest]
+                entry = self._entries[key] = {
+                    'count': 0, 'total': 0.0, 'max': 0.0,
+                    'durations': deque(maxlen=self.SAMPLES), 'endpoints': {},
+                }
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['durations'].append(seconds)
+            entry['endpoints'][endpoint] = entry['endpoints'].get(endpoint, 0) + 1
+            entry['param_types'] = param_types(parameters)
+
+    def top(self, limit=None) -> list:
+        """Entries sorted by total time, slowest first (times in milliseconds)."""
+        with self._lock:
+            rows = [
+                {
+                    'fingerprint': key,
+                    'count': e['count'],
+                    'total_ms': round(e['total'] * 1000, 3),
+                    'p50_ms': round(_percentile(e['durations'], 50) * 1000, 3),
+                    'p99_ms': round(_percentile(e['durations'], 99) * 1000, 3),
+                    'max_ms': round(e['max'] * 1000, 3),
+                    'param_types': e['param_types'],
+                    'endpoints': dict(sorted(e['endpoints'].items(), key=lambda i: -i[1])),
+                }
+                for key, e in self._entries.items()
+            ]
+        rows.sort(key=lambda r: r['total_ms'], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_queries = SlowQueryLog()
+
+
+def enabled() -> bool:
+    return bool(current_app.config.get('INSTRUMENTATION_ENABLED'))
+
+
+def _active() -> bool:
+    return has_app_context() and enabled()
+
+
+def _current():
+    """Metrics of the request being handled, or None when not instrumented."""
+    if not has_request_context():
+        return None
+    return g.get('_metrics')
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy hooks (all engines)
+# ---------------------------------------------------------------------------
+
+# The start time lives on the execution context, which is discarded with the
+# statement, so a statement that raises leaves nothing behind.
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _active():
+        context._query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_query_start', None)
+    if start is None or not _active():
+        return
+    elapsed = time.perf_counter() - start
+    metrics = _current()
+    if metrics is not None:
+        metrics['queries'] += 1
+        metrics['sql'] += elapsed
+
+    threshold = current_app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    if threshold is not None and elapsed * 1000 >= threshold:
+        endpoint = '<background>'
+        if has_request_context():
+            endpoint = request.url_rule.rule if request.url_rule else '<unmatched>'
+        slow_queries.record(statement, parameters, elapsed, endpoint)
+        logger.warning("Slow query (%.1fms) on %s: %s", elapsed * 1000, endpoint, fingerprint(statement))
+
+
+# ---------------------------------------------------------------------------
+# Flask hooks
+# ---------------------------------------------------------------------------
+
+class TimingJSONProvider(DefaultJSONProvider):
+    """JSON provider that charges serialisation time to the current request."""
+
+    def dumps(self, obj, **kwargs):
+        metrics = _current()
+        if metrics is None:
+            return super().dumps(obj, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            metrics['serialize'] += time.perf_counter() - start
+
+
+def _start_request():
+    if enabled() and not request.path.startswith(METRICS_PATH):
+        g._metrics = {'start': time.perf_counter(), 'queries': 0, 'sql': 0.0, 'serialize': 0.0}
+
+
+def _finish_request(response):
+    metrics = g.pop('_metrics', None)
+    if metrics is None:
+        return response
+    duration = time.perf_counter() - metrics['start']
+    # streamed bodies have no length yet; count them as 0
+    size = 0 if response.is_streamed else (response.calculate_content_length() or 0)
+    response.headers.add(
+        'Server-Timing',
+        f'db;dur={metrics["sql"] * 1000:.2f};desc="{metrics["queries"]} queries", '
+        f'serialize;dur={metrics["serialize"] * 1000:.2f}, '
+        f'total;dur={duration * 1000:.2f}',
+    )
+    endpoint = request.url_rule.rule if request.url_rule else '<unmatched>'
+    registry.observe(endpoint, request.method, metrics['queries'], metrics['sql'],
+                     metrics['serialize'], duration, size)
+    return response
+
+
+def metrics_view():
+    if not enabled():
+        return "Not Found", 404
+    return registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+def slow_queries_view():
+    if not enabled():
+        return "Not Found", 404
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        'threshold_ms': current_app.config.get('SLOW_QUERY_THRESHOLD_MS'),
+        'queries': slow_queries.top(limit),
+    })
+
+
+def init_app(app):
+    """Install the request hooks, JSON provider and the metrics routes."""
+    app.config.setdefault('INSTRUMENTATION_ENABLED', False)
+    app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', 100)
+    slow_queries.top_n = app.config.setdefault('SLOW_QUERY_TOP_N', 50)
+    app.json = TimingJSONProvider(app)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule(METRICS_PATH, 'metrics', metrics_view, methods=['GET'])
+    app.add_url_rule(SLOW_QUERIES_PATH, 'slow_queries', slow_queries_view, methods=['GET'])
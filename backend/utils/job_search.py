@@ -0,0 +1,89 @@
+"""Full-text search over job postings.
+
+SQLite uses the ``job_positions_fts`` FTS5 index (see ``db.job_models``),
+Postgres the GIN ``to_tsvector`` expression index ``ix_job_positions_search``.
+Other backends fall back to the old ``ILIKE`` scans.  All paths return the
+query filtered to matching jobs plus an ordering expression for relevance.
+"""
+import re
+
+from sqlalchemy import Float, Integer, false, func, or_, text
+
+from db.job_models import JOB_FTS_TABLE, JobPosition
+from db.models import db
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# bm25 column weights for (title, description, location): a hit in the title
+# counts for much more than one buried in the description
+FTS_WEIGHTS = (10.0, 1.0, 1.0)
+
+# must stay identical to the indexed expression in db.job_models
+_PG_DOCUMENT = func.to_tsvector(
+    'english',
+    func.coalesce(JobPosition.title, '') + ' ' + func.coalesce(JobPosition.description, ''),
+)
+
+
+def _dialect() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def fts_query(terms: str, column: str | None = None) -> str | None:
+    """Turn user input into a safe FTS5 query: every word must match as a prefix.
+
+    Quoting each token keeps FTS5 operators (``AND``, ``NEAR``, ``*``, ``:``)
+    typed by users from being interpreted.
+    """
+    tokens = _TOKEN.findall(terms or '')
+    if not tokens:
+        return None
+    expr = ' '.join(f'"{t}"*' for t in tokens)
+    return f"{column} : ({expr})" if column else expr
+
+
+def _fts_matches(match: str):
+    weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+    return (
+        text(
+            f"SELECT rowid AS job_id, bm25({JOB_FTS_TABLE}, {weights}) AS rank "
+            f"FROM {JOB_FTS_TABLE} WHERE {JOB_FTS_TABLE} MATCH :match"
+        )
+        .bindparams(match=match)
+        .columns(job_id=Integer, rank=Float)
+        .subquery()
+    )
+
+
+def apply_search(query, q: str | None = None, location: str | None = None):
+    """Filter *query* (over ``JobPosition``) by free text and location.
+
+    Returns ``(query, rank)`` where *rank* orders the best matches first, or
+    ``None`` when no text search was applied.  Input without a single word
+    character (e.g. ``"!!!"``) matches nothing rather than everything.
+    """
+    dialect = _dialect()
+
+    if dialect == 'sqlite':
+        text_match = fts_query(q)
+        location_match = fts_query(location, 'location')
+        if (q and q.strip() and not text_match) or (location and location.strip() and not location_match):
+            return query.filter(false()), None
+        parts = [p for p in (text_match, location_match) if p]
+        if not parts:
+            return query, None
+        matches = _fts_matches(' AND '.join(parts))
+        query = query.join(matches, JobPosition.id == matches.c.job_id)
+        # bm25 rank: lower is better
+        return query, matches.c.rank.asc() if text_match else None
+
+    rank = None
+    if q and dialect == 'postgresql':
+        tsquery = func.websearch_to_tsquery('english', q)
+        query = query.filter(_PG_DOCUMENT.op('@@')(tsquery))
+        rank = func.ts_rank(_PG_DOCUMENT, tsquery).desc()
+    elif q:
+        query = query.filter(or_(JobPosition.title.ilike(f"%{q}%"), JobPosition.description.ilike(f"%{q}%")))
+    if location:
+        query = query.filter(JobPosition.location.ilike(f"%{location}%"))
+    return query, rank
@@ -0,0 +1,86 @@
+"""Password hashing helpers.
+
+Key derivation (scrypt / PBKDF2) is deliberately slow and runs entirely in C,
+so under the eventlet hub a single hash freezes every other greenlet on the
+worker – including all Socket.IO traffic.  When eventlet has monkey-patched
+threading we therefore hand the work to ``eventlet.tpool``, a pool of real OS
+threads, and let the hub keep serving other requests meanwhile.
+
+The algorithm and cost are taken from ``PASSWORD_HASH_METHOD`` (any werkzeug
+method string, e.g. ``scrypt:32768:8:1`` or ``pbkdf2:sha256:600000``);
+``PASSWORD_HASH_OFFLOAD`` can switch the thread pool off.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:
+    from eventlet import GreenPool, patcher, tpool
+except ImportError:  # pragma: no cover - eventlet is optional outside the server
+    GreenPool = patcher = tpool = None
+
+DEFAULT_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+
+
+def _config(key, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def hash_method() -> str:
+    """Return the configured werkzeug hashing method string."""
+    return _config('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+
+
+def _offloading() -> bool:
+    return (
+        tpool is not None
+        and _config('PASSWORD_HASH_OFFLOAD', True)
+        and patcher.is_monkey_patched('thread')
+    )
+
+
+def _offload(func, *args):
+    """Run *func* in the OS thread pool when the eventlet hub is active."""
+    if _offloading():
+        return tpool.execute(func, *args)
+    return func(*args)
+
+
+def hash_password(password: str, method: str | None = None) -> str:
+    return _offload(generate_password_hash, password, method or hash_method())
+
+
+def hash_passwords(passwords, workers: int | None = None, method: str | None = None) -> list:
+    """Hash many passwords concurrently, preserving order.
+
+    The KDFs release the GIL, so *workers* OS threads hash in parallel:
+    eventlet's ``tpool`` when the hub is active (greenlets keep it busy),
+    otherwise a plain thread pool.
+    """
+    func = partial(generate_password_hash, method=method or hash_method())
+    workers = workers or os.cpu_count() or 1
+    if _offloading():
+        return list(GreenPool(workers).imap(partial(tpool.execute, func), passwords))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, passwords))
+
+
+def verify_password(pwhash: str, password: str) -> bool:
+    return _offload(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash: str, method: str | None = None) -> bool:
+    """True when *pwhash* was produced with a different method or cost.
+
+    Only the parts spelled out in the configured method are compared, so
+    ``pbkdf2:sha256`` accepts any iteration count while
+    ``pbkdf2:sha256:600000`` pins it.
+    """
+    wanted = (method or hash_method()).split(':')
+    stored = pwhash.split('$', 1)[0].split(':')
+    return stored[:len(wanted)] != wanted
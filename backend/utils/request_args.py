@@ -0,0 +1,46 @@
+"""Strict query-string and boolean parsing.
+
+``request.args.get(name, type=int)`` turns a malformed value into the
+default, so ``?after_id=abc`` quietly serves the first page again, and
+``value.lower() == 'true'`` reads ``?remote=1`` as false.  These helpers
+raise ``BadArgument`` instead; routes answer it with a 400.
+"""
+from flask import request
+
+
+class BadArgument(ValueError):
+    """A query-string value that is present but does not parse."""
+
+
+_BOOLEANS = {True: True, False: False, 'true': True, 'false': False, '1': True, '0': False}
+
+
+def parse_bool(value) -> bool:
+    """``True``/``False`` or ``"true"``/``"false"``/``"1"``/``"0"`` (any case)."""
+    key = value.lower() if isinstance(value, str) else value
+    # bool("false") is True; accept only unambiguous spellings
+    if isinstance(key, (bool, str)) and key in _BOOLEANS:
+        return _BOOLEANS[key]
+    raise ValueError(f"invalid boolean: {value!r}")
+
+
+def int_arg(name: str, default: int | None = None) -> int | None:
+    """``request.args[name]`` as an int, *default* when absent or empty."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadArgument(f"{name} must be an integer") from None
+
+
+def bool_arg(name: str, default: bool | None = None) -> bool | None:
+    """``request.args[name]`` via ``parse_bool``, *default* when absent or empty."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return parse_bool(value)
+    except ValueError:
+        raise BadArgument(f"{name} must be true, false, 1 or 0") from None
@@ -0,0 +1,107 @@
+"""Skill vocabulary lookups.
+
+The vocabulary is small and read-heavy, so name -> id is cached in process.
+Entries never go stale on their own (names are unique and ids never change)
+and are dropped when a skill is deleted through ``SkillService``.
+"""
+import os
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db.candidate_models import Skill
+from db.models import db
+from utils.cache import TTLCache
+
+skill_ids_cache = TTLCache(
+    maxsize=int(os.getenv("SKILL_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("SKILL_CACHE_TTL", "3600")),
+)
+
+_CREATED = "created_skill_names"
+
+
+def normalize_skill_name(name) -> str | None:
+    name = " ".join(str(name or "").split())
+    return name or None
+
+
+def existing_skill_ids(skill_ids) -> set:
+    """Return the subset of *skill_ids* that exist, with one ``IN`` query."""
+    skill_ids = {int(sid) for sid in skill_ids if sid is not None}
+    if not skill_ids:
+        return set()
+    return set(db.session.scalars(select(Skill.id).where(Skill.id.in_(skill_ids))))
+
+
+def _lookup(names) -> dict:
+    rows = db.session.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names)))
+    found = {name: sid for name, sid in rows}
+    for name, sid in found.items():
+        skill_ids_cache.set(name, sid)
+    return found
+
+
+def _insert_missing(names) -> None:
+    rows = [{"name": name} for name in names]
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else pg_insert
+        # a concurrent request may create the same names; let theirs win
+        db.session.execute(insert(Skill).on_conflict_do_nothing(index_elements=["name"]), rows)
+        return
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(Skill.__table__.insert(), row)
+        except IntegrityError:
+            pass
+
+
+def get_or_create_skills(names) -> dict:
+    """Map each skill name to its id, creating the missing ones in bulk.
+
+    Costs nothing when every name is cached, otherwise one ``IN`` lookup and,
+    if needed, one multi-row insert plus a second lookup.  New rows are part
+    of the caller's transaction.
+    """
+    # dict keeps first-seen order, so new skills get ids in input order
+    names = dict.fromkeys(n for n in (normalize_skill_name(name) for name in names) if n)
+    result, missing = {}, []
+    for name in names:
+        sid = skill_ids_cache.get(name)
+        if sid is None:
+            missing.append(name)
+        else:
+            result[name] = sid
+    if not missing:
+        return result
+
+    found = _lookup(missing)
+    result.update(found)
+    to_create = [name for name in missing if name not in found]
+    if to_create:
+        _insert_missing(to_create)
+        created = _lookup(to_create)
+        result.update(created)
+        # ids of rows this transaction created must not outlive a rollback
+        db.session.info.setdefault(_CREATED, set()).update(created)
+    return result
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_created(session):
+    session.info.pop(_CREATED, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_created(session):
+    for name in session.info.pop(_CREATED, ()):
+        skill_ids_cache.invalidate(name)
+
+
+def invalidate_skill(name) -> None:
+    skill_ids_cache.invalidate(normalize_skill_name(name))
@@ -2,7 +2,7 @@ import React from 'react';
 import './Conversation.css';
 
 
-export default function Conversation({ conversation, isActive, onSelect }) {
+export default function Conversation({ conversation, isActive, onSelect, currentUserId }) {
   const handleClick = (e) => {
     e.preventDefault();
     if (typeof onSelect === 'function') {
@@ -18,9 +18,10 @@ export default function Conversation({ conversation, isActive, onSelect }) {
     );
   }
 
-  // TODO: Replace mock avatar and name with real data from conversation participants
+  // TODO: Replace mock avatar with real data from conversation participants
   const mockAvatarUrl = 'https://via.placeholder.com/40';
-  const mockName = `User ${conversation.id}`;
+  const counterpart = (conversation.participants || []).find(p => p.user_id !== currentUserId);
+  const mockName = counterpart?.display_name || `User ${conversation.id}`;
 
   // Format last message timestamp if available
   const lastMessageTime = conversation.last_message?.created_at
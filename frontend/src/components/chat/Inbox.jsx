@@ -45,12 +45,16 @@ export default function Inbox() {
     { refreshInterval: 10000 }
   );
 
+  useEffect(() => {
+    chatService.primeParticipants(convos);
+  }, [convos]);
+
   // 2. Messages pagination
   const getKey = (pageIndex, previousPage) => {
     if (!activeConv) return null;
     if (pageIndex === 0) return `/api/conversations/${activeConv}/messages?limit=50`;
-    if (!previousPage.nextCursor) return null;
-    return `/api/conversations/${activeConv}/messages?cursor=${previousPage.nextCursor}&limit=50`;
+    if (!previousPage.next_cursor) return null;
+    return `/api/conversations/${activeConv}/messages?before_id=${previousPage.next_cursor}&limit=50`;
   };
 
   const {
@@ -73,7 +77,7 @@ export default function Inbox() {
       setLocalMessages([]);
     }
   }, [pages]);
-  const hasNextPage = pages && pages[pages.length - 1].nextCursor;
+  const hasNextPage = pages && pages[pages.length - 1].next_cursor;
 
   // 3. Fetch participants when activeConv changes
   useEffect(() => {
@@ -140,7 +144,7 @@ export default function Inbox() {
       oldPages => {
         if (!oldPages) {
           // If no pages exist yet, create the first page with the optimistic message
-          return [{ items: [optimisticMsg], nextCursor: null }];
+          return [{ items: [optimisticMsg], next_cursor: null }];
         }
         // Add the optimistic message to the last of the first page's items array
         return [
@@ -240,6 +244,7 @@ export default function Inbox() {
               conversation={conv}
               isActive={activeConv === conv.id}
               onSelect={setActiveConv}
+              currentUserId={user?.userId}
             />
           </div>
         ))}
@@ -1,16 +1,18 @@
 import React, { useEffect, useState, useContext } from 'react';
-import { fetchCompanies, fetchCandidates, fetchJobs } from '../../services/marketplaceService';
+import { fetchMarketplacePage } from '../../services/marketplaceService';
 import { Link } from 'react-router-dom';
 import { UserContext } from '../../contexts/UserContext';
 import './Marketplace.css';
 
 const ITEMS_PER_PAGE = 12;
+const FETCH_LIMIT = 100;
 
 export default function Marketplace() {
   const { user } = useContext(UserContext);
   const [companies, setCompanies] = useState([]);
   const [candidates, setCandidates] = useState([]);
   const [jobs, setJobs] = useState([]);
+  const [cursors, setCursors] = useState({ companies: null, candidates: null, jobs: null });
   const [error, setError] = useState(null);
   const [view, setView] = useState(
     user?.role === 'client' ? 'candidates' : user?.role === 'candidate' ? 'jobs' : 'companies'
@@ -23,13 +25,14 @@ export default function Marketplace() {
     async function load() {
       try {
         const [cs, cds, js] = await Promise.all([
-          fetchCompanies(),
-          fetchCandidates(),
-          fetchJobs(),
+          fetchMarketplacePage('companies', { limit: FETCH_LIMIT }),
+          fetchMarketplacePage('candidates', { limit: FETCH_LIMIT }),
+          fetchMarketplacePage('jobs', { limit: FETCH_LIMIT }),
         ]);
-        setCompanies(cs);
-        setCandidates(cds);
-        setJobs(js);
+        setCompanies(cs.items);
+        setCandidates(cds.items);
+        setJobs(js.items);
+        setCursors({ companies: cs.nextCursor, candidates: cds.nextCursor, jobs: js.nextCursor });
       } catch (err) {
         setError('Unable to load marketplace data.');
       }
@@ -88,6 +91,17 @@ export default function Marketplace() {
     setCurrentPage(1);
   };
 
+  const loadMore = async () => {
+    try {
+      const page = await fetchMarketplacePage(view, { limit: FETCH_LIMIT, after_id: cursors[view] });
+      const append = view === 'companies' ? setCompanies : view === 'candidates' ? setCandidates : setJobs;
+      append(prev => [...prev, ...page.items]);
+      setCursors(prev => ({ ...prev, [view]: page.nextCursor }));
+    } catch (err) {
+      setError('Unable to load marketplace data.');
+    }
+  };
+
   const goToPage = (page) => {
     setCurrentPage(page);
   };
@@ -184,6 +198,9 @@ export default function Marketplace() {
           >
             Next
           </button>
+          {cursors[view] && (
+            <button onClick={loadMore}>Load more</button>
+          )}
         </div>
       </div>
     </div>
@@ -14,6 +14,8 @@ export default function JobPortal() {
   const navigate = useNavigate();
   const [jobData, setJobData] = useState(null);
   const [applications, setApplications] = useState([]);
+  const [applicationsCursor, setApplicationsCursor] = useState(null);
+  const [stats, setStats] = useState(null);
   const [posting, setPosting] = useState(false);
   const [jobTitle, setJobTitle] = useState('');
   const [jobCreated, setJobCreated] = useState(null);
@@ -64,15 +66,31 @@ export default function JobPortal() {
     jobService.getJob(jobId)
       .then((job) => {
         setJobData(job);
-        return jobService.getJobApplications(job.id);
+        return Promise.all([
+          jobService.getJobStats(job.id),
+          jobService.getJobApplicationsPage(job.id),
+        ]);
       })
-      .then((apps) => {
-        setApplications(apps);
+      .then(([jobStats, page]) => {
+        setStats(jobStats);
+        setApplications(page.items);
+        setApplicationsCursor(page.next_cursor);
       })
       .catch(console.error)
       .finally(() => setLoading(false));
   }, [jobId]);
 
+  const loadMoreApplications = async () => {
+    if (!applicationsCursor) return;
+    try {
+      const page = await jobService.getJobApplicationsPage(jobData.id, { after_id: applicationsCursor });
+      setApplications((prev) => [...prev, ...page.items]);
+      setApplicationsCursor(page.next_cursor);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   const profileFields = [
     { name: 'title', label: 'Job Title' },
     { name: 'description', label: 'Description' },
@@ -190,6 +208,15 @@ export default function JobPortal() {
                 editable={jobData.company_id === fullCompany.id}
               />
 
+              {stats && (
+                <div className="job-portal__stats">
+                  <strong>{stats.total} applications</strong>
+                  {Object.entries(stats.by_status).map(([status, count]) => (
+                    <span key={status}> · {status}: {count}</span>
+                  ))}
+                </div>
+              )}
+
               <EntityList
                 title="Applications"
                 items={applications}
@@ -201,6 +228,9 @@ export default function JobPortal() {
                   </li>
                 )}
               />
+              {applicationsCursor && (
+                <Button onClick={loadMoreApplications}>Load more</Button>
+              )}
             </>
           )}
         </>
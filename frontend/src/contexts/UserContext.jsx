@@ -13,15 +13,14 @@ export const UserProvider = ({ children }) => {
       const role = response.data.role;
       const username = response.data.username;
 
+      // /auth/me already carries the profile id resolved at login
       let candidateId = null;
       let company = null;
       if (role === 'candidate') {
-        const candidateResponse = await api.get('/candidate/profile');
-        candidateId = candidateResponse.data.profile?.id || null;
+        candidateId = response.data.candidate_id || null;
         console.log("UserContext: fetched candidateId =", candidateId);
       } else if (role === 'client') {
-        const companyResponse = await api.get('/client/');
-        company = companyResponse.data.company || null;
+        company = response.data.company_id ? { id: response.data.company_id } : null;
         console.log("UserContext: fetched company =", company);
       }
 
@@ -45,6 +45,19 @@ class ChatService {
     }
   }
 
+  primeParticipants(conversations) {
+    // Inbox rows already carry resolved participant names; seed the cache so
+    // opening a thread does not need a separate participants request.
+    if (!this.participantCache) this.participantCache = {};
+    for (const conv of conversations || []) {
+      if (!conv.participants) continue;
+      this.participantCache[conv.id] = conv.participants.reduce((map, p) => {
+        map[p.user_id] = p.display_name;
+        return map;
+      }, {});
+    }
+  }
+
   getDisplayNameFromMap(userId, participantMap) {
     if (!participantMap) return 'Unknown';
     if (userId === this.currentUserId) return 'You';
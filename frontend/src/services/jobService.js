@@ -16,6 +16,18 @@ const jobService = {
     return response.data;
   },
 
+  // Keyset page of applications: { items, next_cursor }
+  getJobApplicationsPage: async (jobId, params = {}) => {
+    const response = await api.get(`/jobs/${jobId}/applications`, { params: { limit: 50, ...params } });
+    return response.data;
+  },
+
+  // Funnel counts: { total, by_status: { status: n }, by_day: [ { date, count } ] }
+  getJobStats: async (jobId, params = {}) => {
+    const response = await api.get(`/jobs/${jobId}/stats`, { params });
+    return response.data;
+  },
+
   applyToJob: async (jobId, applicationData) => {
     const response = await api.post(`/jobs/${jobId}/apply`, applicationData);
     return response.data;
@@ -2,12 +2,13 @@ import api from './api';   // your axios instance
 import logger from '../utils/logger'; // optional: wrap console
 
 /**
- * Fetch all companies for marketplace listing.
+ * Fetch one page of companies for marketplace listing.
+ * @param {{limit?: number, after_id?: number, fields?: string, industry?: string, country?: string}} params
  * @returns {Promise<{id: number, name: string, bio: string}[]>}
  */
-export async function fetchCompanies() {
+export async function fetchCompanies(params = {}) {
   try {
-    const resp = await api.get('/marketplace/companies');
+    const resp = await api.get('/marketplace/companies', { params });
     return resp.data.companies;
   } catch (err) {
     logger.error('marketplaceService › fetchCompanies failed:', err);
@@ -17,12 +18,13 @@ export async function fetchCompanies() {
 }
 
 /**
- * Fetch all candidates for marketplace listing.
+ * Fetch one page of candidates for marketplace listing.
+ * @param {{limit?: number, after_id?: number, fields?: string, country?: string}} params
  * @returns {Promise<{id: number, full_name: string, bio: string}[]>}
  */
-export async function fetchCandidates() {
+export async function fetchCandidates(params = {}) {
   try {
-    const resp = await api.get('/marketplace/candidates');
+    const resp = await api.get('/marketplace/candidates', { params });
     return resp.data.candidates;
   } catch (err) {
     logger.error('marketplaceService › fetchCandidates failed:', err);
@@ -31,15 +33,31 @@ export async function fetchCandidates() {
 }
 
 /**
- * Fetch all jobs for marketplace listing.
+ * Fetch one page of jobs for marketplace listing.
+ * @param {{limit?: number, after_id?: number, fields?: string, remote?: boolean, employment_type?: string}} params
  * @returns {Promise<{id: number, title: string, location: string, employment_type: string, remote: boolean, posted_at: string, company_name: string}[]>}
  */
-export async function fetchJobs() {
+export async function fetchJobs(params = {}) {
   try {
-    const resp = await api.get('/marketplace/jobs');
+    const resp = await api.get('/marketplace/jobs', { params });
     return resp.data.jobs;
   } catch (err) {
     logger.error('marketplaceService › fetchJobs failed:', err);
     throw err;
   }
 }
+
+/**
+ * Fetch one page of any marketplace listing together with its cursor.
+ * @param {'companies'|'candidates'|'jobs'} view
+ * @returns {Promise<{items: object[], nextCursor: number|null}>}
+ */
+export async function fetchMarketplacePage(view, params = {}) {
+  try {
+    const resp = await api.get(`/marketplace/${view}`, { params });
+    return { items: resp.data[view], nextCursor: resp.data.next_cursor ?? null };
+  } catch (err) {
+    logger.error(`marketplaceService › fetchMarketplacePage(${view}) failed:`, err);
+    throw err;
+  }
+}
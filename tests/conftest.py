@@ -1,6 +1,8 @@
 import os
 import sys
 import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, ROOT)
@@ -17,11 +19,30 @@ def app():
         'WTF_CSRF_ENABLED': False,
         'SECRET_KEY': 'test-secret',
         'RATELIMIT_ENABLED': False,
+        'INSTRUMENTATION_ENABLED': False,
+        'SLOW_QUERY_THRESHOLD_MS': 100,
     })
     flask_app._got_first_request = False
     with flask_app.app_context():
         from backend.extensions import limiter
         limiter.enabled = False
+        # the app imports ``extensions`` from backend/ directly, so rate
+        # limit counters live on that copy; start every test with them empty
+        from extensions import limiter as app_limiter
+        app_limiter.reset()
+        # user ids are reused across the per-test in-memory databases
+        from blueprints.auth.routes import identity_cache
+        identity_cache.clear()
+        from blueprints.job.routes import job_count_cache
+        job_count_cache.clear()
+        from utils.candidate_profile import profile_cache, profile_versions
+        profile_cache.clear()
+        profile_versions.clear()
+        from utils.skills import skill_ids_cache
+        skill_ids_cache.clear()
+        from utils.instrumentation import registry, slow_queries
+        registry.clear()
+        slow_queries.clear()
         limiter.request_filter(lambda: True)
         limiter._check_request_limit = lambda *a, **k: None
         limiter.limit = lambda *a, **k: (lambda f: f)
@@ -43,3 +64,35 @@ def app():
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """Return a context manager collecting every SQL statement run inside it."""
+    @contextmanager
+    def _count():
+        statements = []
+
+        def record(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return _count
+
+
+@pytest.fixture
+def assert_max_queries(count_queries):
+    """Return a context manager failing the test if more than *limit* statements run."""
+    @contextmanager
+    def _assert(limit):
+        with count_queries() as statements:
+            yield statements
+        assert len(statements) <= limit, (
+            f"{len(statements)} statements executed, expected at most {limit}:\n"
+            + "\n".join(statements)
+        )
+    return _assert
@@ -57,3 +57,110 @@ def test_marketplace_error_handling(client, monkeypatch):
     resp = client.get('/api/marketplace/companies', environ_base={'wsgi.url_scheme':'https'})
     assert resp.status_code == 500
 
+
+
+def test_add_items_bulk_creates_accounts(client, app, monkeypatch, count_queries):
+    from db.models import CandidateProfile, Company, User
+    https = {'wsgi.url_scheme': 'https'}
+    assert client.post('/extra/add_items', json={}, environ_base=https).status_code == 404
+
+    monkeypatch.setitem(app.config, 'EXTRA_ENDPOINTS_ENABLED', True)
+    monkeypatch.setitem(app.config, 'ADD_ITEMS_CHUNK', 4)
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+    signup_client(client, 'taken')
+    payload = {
+        'clients': [{'username': f'client{n}', 'password': 'pw',
+                     'company': {'name': f'Co {n}', 'founded_date': '2001-02-03', 'bio': '<script>x</script>ok'}}
+                    for n in range(10)] + [
+            {'username': 'taken', 'password': 'pw', 'company': {'name': 'Fresh'}},
+            {'username': 'nopass'},
+        ],
+        'candidates': [{'username': f'cand{n}', 'password': 'pw',
+                        'profile': {'full_name': f'Cand {n}', 'email': f'c{n}@x.com'}}
+                       for n in range(10)] + [
+            {'username': 'cand0', 'password': 'pw', 'profile': {'email': 'dup@x.com'}},
+            {'username': 'noemail', 'password': 'pw', 'profile': {}},
+        ],
+    }
+    with count_queries() as statements:
+        resp = client.post('/extra/add_items', json=payload, environ_base=https)
+    assert resp.status_code == 201
+    data = resp.get_json()
+    assert data['created'] == {'clients': 10, 'candidates': 10}
+    assert [(e['section'], e['index']) for e in data['errors']] == [
+        ('candidates', 10), ('candidates', 11), ('clients', 10), ('clients', 11)]
+    # a few multi-row INSERTs per chunk, not one per account
+    assert len([s for s in statements if s.startswith('INSERT INTO user')]) == 5
+
+    company = Company.query.filter_by(name='Co 3').one()
+    assert company.founded_date.isoformat() == '2001-02-03'
+    assert '<script>' not in company.bio
+    assert CandidateProfile.query.filter_by(email='c4@x.com').one().full_name == 'Cand 4'
+    assert login(client, 'client3', 'pw').status_code == 200
+    assert User.query.filter_by(username='cand9').one().role == 'candidate'
+
+    for section in ({'clients': {'username': 'x'}}, {'candidates': 3}, {'clients': [], 'candidates': 'abc'}):
+        resp = client.post('/extra/add_items', json=section, environ_base=https)
+        assert resp.status_code == 400 and 'must be a list' in resp.get_json()['error']
+    assert client.post('/extra/add_jobs', json={'jobs': {'a': 1}}, environ_base=https).status_code == 400
+
+    # malformed rows are reported per row, never a 500
+    malformed = {
+        'clients': [
+            {'username': 'badco1', 'password': 'pw', 'company': {'founded_date': 'someday'}},
+            {'username': 'badco2', 'password': 'pw', 'company': 'x'},
+            {'username': ['badco3'], 'password': 'pw'},
+            {'username': 'badco4', 'password': 'pw', 'company': {'name': ['Co']}},
+        ],
+        'candidates': [{'username': 'badcand', 'password': 'pw', 'profile': {'email': ['e']}}],
+    }
+    resp = client.post('/extra/add_items', json=malformed, environ_base=https)
+    assert resp.status_code == 400
+    assert [(e['section'], e['index'], e['error']) for e in resp.get_json()['errors']] == [
+        ('candidates', 0, 'email must be a string'),
+        ('clients', 0, "Invalid isoformat string: 'someday'"),
+        ('clients', 1, 'company must be an object'),
+        ('clients', 2, 'username and password must be strings'),
+        ('clients', 3, 'name must be a string'),
+    ]
+
+
+def test_add_jobs_and_applications_in_bulk(client, app, monkeypatch):
+    https = {'wsgi.url_scheme': 'https'}
+    monkeypatch.setitem(app.config, 'EXTRA_ENDPOINTS_ENABLED', True)
+    monkeypatch.setitem(app.config, 'ADD_ITEMS_CHUNK', 3)
+    signup_client(client, 'bulkco')
+    company_id = login(client, 'bulkco').get_json()['company_id']
+    signup_candidate(client, 'bulkcand')
+    cand_id = login(client, 'bulkcand').get_json()['candidate_id']
+
+    jobs = [{'company_id': company_id, 'title': f'Bulk {n}', 'posted_at': '2024-01-01T10:00:00'} for n in range(7)]
+    jobs += [{'company_id': 9999, 'title': 'Orphan'}, {'title': 'No company'}]
+    resp = client.post('/extra/add_jobs', json={'jobs': jobs}, environ_base=https)
+    assert resp.status_code == 201
+    data = resp.get_json()
+    assert data['created'] == {'jobs': 7}
+    assert [e['index'] for e in data['errors']] == [7, 8]
+    job_ids = data['ids']
+    listed = client.get('/api/jobs?q=bulk&per_page=50', environ_base=https).get_json()
+    assert {j['id'] for j in listed['items']} == set(job_ids)
+
+    flags = ['false', '0', 'TRUE', True, 'no', 1]
+    resp = client.post('/extra/add_jobs', environ_base=https, json={'jobs': [
+        {'company_id': company_id, 'title': f'Flag {n}', 'remote': flag} for n, flag in enumerate(flags)]})
+    data = resp.get_json()
+    assert [e['index'] for e in data['errors']] == [4, 5]
+    remote = {j['id']: j['remote'] for j in client.get(f'/api/companies/{company_id}/jobs', environ_base=https).get_json()}
+    assert [remote[job_id] for job_id in data['ids']] == [False, False, True, True]
+
+    apps = [{'candidate_id': cand_id, 'job_position_id': jid} for jid in job_ids]
+    apps += [{'candidate_id': cand_id, 'job_position_id': job_ids[0]}, {'candidate_id': 9999, 'job_position_id': job_ids[0]}]
+    resp = client.post('/extra/add_applications', json={'applications': apps}, environ_base=https)
+    data = resp.get_json()
+    assert data['created'] == {'applications': 7}
+    assert [(e['index'], e['error']) for e in data['errors']] == [
+        (7, 'candidate has already applied to this job'), (8, 'candidate not found')]
+    profile = client.get(f'/api/candidate/{cand_id}/full', environ_base=https).get_json()
+    assert len(profile['applications']) == 7
+    assert client.post('/extra/add_applications', json={'applications': apps[:1]},
+                       environ_base=https).status_code == 400
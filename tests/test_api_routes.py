@@ -123,3 +123,81 @@ def test_marketplace_endpoints(client):
     resp = client.get('/api/marketplace/jobs', environ_base={'wsgi.url_scheme': 'https'})
     assert resp.status_code == 200
     assert any(j['company_name'] for j in resp.get_json()['jobs'])
+
+
+def test_marketplace_pagination_fields_and_filters(client, app):
+    from db.models import db, Company, JobPosition, User
+    owner = User(username='mpowner', role='client')
+    owner.set_password('pass')
+    db.session.add(owner)
+    db.session.flush()
+    for i in range(5):
+        company = Company(user_id=owner.id, name=f'MP{i}',
+                          industry='Finance' if i % 2 else 'Tech', country='RO')
+        db.session.add(company)
+        db.session.flush()
+        db.session.add(JobPosition(company_id=company.id, title=f'Job{i}',
+                                   remote=bool(i % 2), employment_type='Contract'))
+    db.session.commit()
+
+    seen, params = [], {'limit': 2}
+    while True:
+        page = client.get('/api/marketplace/companies', query_string=params,
+                          environ_base={'wsgi.url_scheme': 'https'}).get_json()
+        assert len(page['companies']) <= 2
+        seen.extend(c['name'] for c in page['companies'])
+        if not page['next_cursor']:
+            break
+        params = {'limit': 2, 'after_id': page['next_cursor']}
+    assert seen == [f'MP{i}' for i in range(5)]
+
+    resp = client.get('/api/marketplace/companies', query_string={'industry': 'Finance', 'fields': 'name,country,bogus'},
+                      environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert [c['name'] for c in resp['companies']] == ['MP1', 'MP3']
+    assert set(resp['companies'][0]) == {'id', 'name', 'country'}
+
+    resp = client.get('/api/marketplace/jobs', query_string={'remote': 'true', 'employment_type': 'Contract',
+                                                             'fields': 'title,company_name,remote'},
+                      environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert [j['title'] for j in resp['jobs']] == ['Job1', 'Job3']
+    assert all(j['remote'] for j in resp['jobs'])
+    resp = client.get('/api/marketplace/jobs', query_string={'remote': '1', 'employment_type': 'Contract'},
+                      environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert [j['title'] for j in resp['jobs']] == ['Job1', 'Job3']
+
+    # malformed values are rejected instead of silently dropped
+    for path, params in (('jobs', {'remote': 'yes'}), ('companies', {'after_id': 'abc'}),
+                         ('candidates', {'limit': 'many'}), ('companies', {'stream': '1', 'after_id': 'x'})):
+        resp = client.get(f'/api/marketplace/{path}', query_string=params, environ_base={'wsgi.url_scheme': 'https'})
+        assert resp.status_code == 400, params
+        assert 'must be' in resp.get_json()['error']
+
+    resp = client.get('/api/marketplace/candidates', query_string={'country': 'Nowhere'},
+                      environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert resp == {'candidates': [], 'next_cursor': None}
+
+
+def test_marketplace_ndjson_stream(client, app):
+    import json
+    from db.models import db, Company, User
+    owner = User(username='streamowner', role='client')
+    owner.set_password('pass')
+    db.session.add(owner)
+    db.session.flush()
+    for i in range(4):
+        db.session.add(Company(user_id=owner.id, name=f'S{i}', industry='Tech' if i < 3 else 'Retail'))
+    db.session.commit()
+
+    resp = client.get('/api/marketplace/companies', query_string={'stream': '1', 'industry': 'Tech'},
+                      environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r['name'] for r in rows] == ['S0', 'S1', 'S2']
+
+    resp = client.get('/api/marketplace/companies', query_string={'after_id': rows[0]['id'], 'fields': 'name'},
+                      headers={'Accept': 'application/x-ndjson'},
+                      environ_base={'wsgi.url_scheme': 'https'})
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r['name'] for r in rows] == ['S1', 'S2', 'S3']
+    assert set(rows[0]) == {'id', 'name'}
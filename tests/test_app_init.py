@@ -29,3 +29,144 @@ def test_error_handler_logs(client, app, caplog):
     assert 'Internal Server Error' in resp.get_data(as_text=True)
     assert any('Unhandled Exception' in r.message for r in caplog.records)
 
+
+
+def test_instrumentation_server_timing_and_metrics(client, app):
+    resp = client.get('/api/marketplace/companies', environ_base={'wsgi.url_scheme': 'https'})
+    assert 'Server-Timing' not in resp.headers
+    assert client.get('/api/_metrics', environ_base={'wsgi.url_scheme': 'https'}).status_code == 404
+
+    app.config['INSTRUMENTATION_ENABLED'] = True
+    for _ in range(2):
+        resp = client.get('/api/marketplace/companies', environ_base={'wsgi.url_scheme': 'https'})
+    timing = resp.headers['Server-Timing']
+    assert 'db;dur=' in timing and '"1 queries"' in timing and 'serialize;dur=' in timing
+
+    metrics = client.get('/api/_metrics', environ_base={'wsgi.url_scheme': 'https'})
+    assert metrics.status_code == 200
+    assert metrics.mimetype == 'text/plain'
+    body = metrics.get_data(as_text=True)
+    labels = 'endpoint="/api/marketplace/companies",method="GET"'
+    assert f'nigbot_http_requests_total{{{labels}}} 2' in body
+    assert f'nigbot_db_queries_total{{{labels}}} 2' in body
+    assert f'nigbot_http_request_duration_seconds_count{{{labels}}} 2' in body
+    assert '/api/_metrics' not in body
+
+
+def test_slow_query_log_groups_by_fingerprint(client, app):
+    app.config.update({'INSTRUMENTATION_ENABLED': True, 'SLOW_QUERY_THRESHOLD_MS': 0})
+    for company_id in (1, 2, 3):
+        client.get(f'/api/companies/{company_id}/jobs', environ_base={'wsgi.url_scheme': 'https'})
+
+    resp = client.get('/api/_metrics/slow_queries', environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.status_code == 200
+    queries = resp.get_json()['queries']
+    company_lookups = [q for q in queries if 'FROM companies' in q['fingerprint']]
+    assert len(company_lookups) == 1
+    entry = company_lookups[0]
+    assert entry['count'] == 3
+    assert entry['endpoints'] == {'/api/companies/<int:company_id>/jobs': 3}
+    # values (which may be credentials) are never exposed, only their types
+    assert entry['param_types'] == ['int']
+    assert entry['p50_ms'] <= entry['p99_ms'] <= entry['max_ms']
+
+
+def test_slow_query_log_hides_parameter_values(client, app):
+    import pytest
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from db.models import db
+    signup_candidate(client, 'secretuser', password='hunter2')
+    app.config.update({'INSTRUMENTATION_ENABLED': True, 'SLOW_QUERY_THRESHOLD_MS': 0})
+    login(client, 'secretuser', password='hunter2')
+
+    body = client.get('/api/_metrics/slow_queries', environ_base={'wsgi.url_scheme': 'https'}).get_data(as_text=True)
+    assert 'secretuser' not in body and 'hunter2' not in body
+
+    # a failing statement leaves no timing state on the connection
+    with db.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text('SELECT * FROM no_such_table'))
+        assert '_query_start' not in conn.info
+        assert conn.execute(text('SELECT 1')).scalar() == 1
+
+
+def test_fixtures_cli_generates_and_resumes(app):
+    from db.models import CandidateProfile, CandidateSkill, Conversation, JobPosition, Message, Participant, User, db
+    from extra.fixtures import progress_metadata
+    from sqlalchemy import func
+
+    runner = app.test_cli_runner()
+    args = ['fixtures', 'generate', '--run', 'unit', '--companies', '5', '--candidates', '40', '--jobs', '30',
+            '--messages', '400', '--skills', '20', '--batch-size', '16', '--workers', '0']
+    try:
+        result = runner.invoke(args=args)
+        assert result.exit_code == 0, result.output
+        assert User.query.filter(User.username.like('fx-unit-%')).count() == 45
+        assert CandidateProfile.query.count() == 40
+        assert JobPosition.query.count() == 30
+        assert CandidateSkill.query.count() > 0
+
+        conversations = Conversation.query.all()
+        assert len(conversations) == 16
+        assert sum(c.message_count for c in conversations) == Message.query.count()
+        assert all(db.session.get(Message, c.last_message_id).conversation_id == c.id for c in conversations)
+        unread = db.session.query(func.sum(Participant.unread_count)).scalar()
+        assert unread == Message.query.filter_by(is_read=False).count()
+
+        # every batch is recorded, so running it again writes nothing
+        again = runner.invoke(args=args)
+        assert 'Resuming' in again.output and 'batches already done' in again.output
+        assert CandidateProfile.query.count() == 40
+        status = runner.invoke(args=['fixtures', 'status', '--run', 'unit'])
+        assert 'conversations' in status.output and '1/1' in status.output
+
+        changed = runner.invoke(args=args[:-2] + ['--seed', '7', '--workers', '0'])
+        assert changed.exit_code != 0 and 'different parameters' in changed.output
+    finally:
+        progress_metadata.drop_all(db.engine)
+
+
+def test_fixtures_cli_keeps_paused_runs_resumable(app, monkeypatch):
+    from db.models import CandidateProfile, Company, User, db
+    from extra import fixtures
+
+    runner = app.test_cli_runner()
+    args = ['fixtures', 'generate', '--companies', '4', '--candidates', '10', '--jobs', '6',
+            '--messages', '0', '--skills', '5', '--batch-size', '4', '--workers', '0']
+    run_batch = fixtures.run_batch
+
+    def interrupted(url, params, entity, batch):
+        if entity == 'companies':
+            raise RuntimeError('interrupted')
+        return run_batch(url, params, entity, batch)
+
+    def pause(run):
+        monkeypatch.setattr(fixtures, 'run_batch', interrupted)
+        assert runner.invoke(args=args + ['--run', run]).exit_code != 0
+        monkeypatch.setattr(fixtures, 'run_batch', run_batch)
+
+    try:
+        profiles = CandidateProfile.query.count()
+        # a second run started while the first is paused reserves ids above it
+        pause('first')
+        assert runner.invoke(args=args + ['--run', 'second']).exit_code == 0
+        resumed = runner.invoke(args=args + ['--run', 'first'])
+        assert resumed.exit_code == 0, resumed.output
+        assert User.query.filter(User.username.like('fx-first-%')).count() == 14
+        assert CandidateProfile.query.count() == profiles + 20
+
+        # on SQLite an application insert can land in a paused run's range
+        pause('third')
+        owner = User(username='squatter', role='client', password_hash='x')
+        db.session.add(owner)
+        db.session.flush()
+        db.session.add(Company(user_id=owner.id, name='Squatter'))
+        db.session.commit()
+        blocked = runner.invoke(args=args + ['--run', 'third'])
+        assert blocked.exit_code != 0 and 'cannot be resumed' in blocked.output
+
+        no_skills = runner.invoke(args=args + ['--run', 'fourth', '--skills', '0'])
+        assert no_skills.exit_code != 0 and '--skills' in no_skills.output
+    finally:
+        fixtures.progress_metadata.drop_all(db.engine)
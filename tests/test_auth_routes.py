@@ -45,3 +45,82 @@ def test_invalid_login(client):
     signup(client, username='user2')
     resp = client.post('/api/auth/login', json={'username': 'user2', 'password': 'wrong'}, environ_base={'wsgi.url_scheme': 'https'}, follow_redirects=True)
     assert resp.status_code == 401
+
+
+def test_load_user_uses_identity_cache(client, app):
+    from blueprints.auth.routes import identity_cache, load_user
+    signup(client, username='cached')
+    login(client, username='cached')
+    user = User.query.filter_by(username='cached').first()
+
+    identity_cache.clear()
+    first = load_user(user.id)
+    second = load_user(str(user.id))
+    assert (first.id, first.username, first.role) == (user.id, 'cached', 'candidate')
+    assert second.is_authenticated and second.get_id() == str(user.id)
+    assert identity_cache.stats()['misses'] == 1
+    assert identity_cache.stats()['hits'] == 1
+
+    # a role change is written through the ORM and evicts the entry
+    user.role = 'client'
+    db.session.commit()
+    assert load_user(user.id).role == 'client'
+    assert load_user(9999) is None
+
+
+def test_me_served_from_session(client, count_queries):
+    signup(client, username='sess')
+    cand_id = login(client, username='sess').get_json()['candidate_id']
+    with count_queries() as statements:
+        resp = client.get('/api/auth/me', environ_base={'wsgi.url_scheme': 'https'})
+    data = resp.get_json()
+    assert data['username'] == 'sess'
+    assert data['candidate_id'] == cand_id
+    assert statements == []
+
+
+def test_me_refreshes_profile_created_after_login(client, app):
+    from db.company_models import Company
+    user = User(username='late', role='client')
+    user.set_password('pass')
+    db.session.add(user)
+    db.session.commit()
+    login(client, username='late')
+
+    resp = client.get('/api/auth/me', environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.get_json()['company_id'] is None
+
+    company = Company(user_id=user.id, name='LateCo')
+    db.session.add(company)
+    db.session.commit()
+    resp = client.get('/api/auth/me', environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.get_json()['company_id'] == company.id
+
+
+def test_login_drops_previous_identity_profile_ids(client):
+    signup(client, username='first')
+    assert login(client, username='first').get_json()['candidate_id']
+    user = User(username='noprofile', role='candidate')
+    user.set_password('pass')
+    db.session.add(user)
+    db.session.commit()
+
+    # same browser session, no logout in between
+    login(client, username='noprofile')
+    resp = client.get('/api/auth/me', environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.get_json()['username'] == 'noprofile'
+    assert resp.get_json()['candidate_id'] is None
+
+
+def test_login_rehashes_when_method_changes(client, app):
+    signup(client, username='rehash')
+    old_hash = User.query.filter_by(username='rehash').first().password_hash
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    try:
+        assert login(client, username='rehash').status_code == 200
+    finally:
+        app.config['PASSWORD_HASH_METHOD'] = 'scrypt:32768:8:1'
+    user = User.query.filter_by(username='rehash').first()
+    assert user.password_hash != old_hash
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+    assert user.check_password('pass')
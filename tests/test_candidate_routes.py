@@ -79,3 +79,203 @@ def test_candidate_public_private_and_patch(client, app):
     assert skill_ids[skill1_id] == 'Intermediate'
     assert skill_ids[skill2_id] == 'Expert'
 
+
+
+def test_candidate_full_profile_loads_one_query_per_collection(client, count_queries):
+    from datetime import date
+    from db.models import (db, CandidateSkill, Company, Education, EmploymentHistory,
+                           JobApplication, JobPosition, LegalDocument, Skill, User)
+    signup_candidate(client, 'heavy')
+    cand_id = login(client, 'heavy').get_json()['candidate_id']
+
+    owner = User(username='heavyco', role='client', password_hash='x')
+    db.session.add(owner)
+    db.session.flush()
+    company = Company(user_id=owner.id, name='HeavyCo')
+    db.session.add(company)
+    db.session.flush()
+    for n in range(4):
+        job = JobPosition(company_id=company.id, title=f'Job{n}')
+        skill = Skill(name=f'heavy-skill-{n}')
+        db.session.add_all([job, skill])
+        db.session.flush()
+        db.session.add_all([
+            JobApplication(candidate_id=cand_id, job_position_id=job.id),
+            CandidateSkill(candidate_id=cand_id, skill_id=skill.id),
+            EmploymentHistory(candidate_id=cand_id, company_name='X', position='Y', start_date=date(2020, 1, 1)),
+            LegalDocument(candidate_id=cand_id, doc_type='ID', file_path='/x'),
+            Education(candidate_id=cand_id, institution='Uni'),
+        ])
+    db.session.commit()
+    db.session.expunge_all()
+
+    from utils.candidate_profile import profile_cache, profile_versions
+    for url in (f'/api/candidate/{cand_id}/full', f'/api/candidate/{cand_id}/full/public'):
+        profile_cache.clear()
+        profile_versions.clear()
+        with count_queries() as statements:
+            data = client.get(url, environ_base={'wsgi.url_scheme': 'https'}).get_json()
+        # version check, the profile, then one SELECT per collection, none
+        # joined to another
+        assert len(statements) == 7, statements
+        assert all(len(data[key]) == 4 for key in ('employments', 'documents', 'applications', 'skills', 'educations'))
+        assert {a['company_name'] for a in data['applications']} == {'HeavyCo'}
+
+
+def test_candidate_full_profile_etag_and_cache(client, count_queries):
+    signup_candidate(client, 'etag')
+    cand_id = login(client, 'etag').get_json()['candidate_id']
+    url = f'/api/candidate/{cand_id}/full'
+
+    first = client.get(url, environ_base={'wsgi.url_scheme': 'https'})
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    # revalidation and repeat reads are served without the database
+    with count_queries() as statements:
+        resp = client.get(url, headers={'If-None-Match': etag}, environ_base={'wsgi.url_scheme': 'https'})
+        assert resp.status_code == 304
+        public = client.get(f'{url}/public', environ_base={'wsgi.url_scheme': 'https'})
+        assert public.get_json() == first.get_json()
+    assert statements == []
+
+    # writes bump the version, so the old ETag no longer matches
+    client.patch(url, json={'profile': {'city': 'Iasi'}}, environ_base={'wsgi.url_scheme': 'https'})
+    resp = client.get(url, headers={'If-None-Match': etag}, environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+    assert resp.get_json()['profile']['city'] == 'Iasi'
+
+    from utils.db_services.candidate_service import EducationService
+    EducationService.add_education(cand_id, institution='UBB')
+    resp = client.get(url, headers={'If-None-Match': resp.headers['ETag']}, environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.status_code == 200
+    assert [e['institution'] for e in resp.get_json()['educations']] == ['UBB']
+
+    assert client.get('/api/candidate/99999/full', environ_base={'wsgi.url_scheme': 'https'}).status_code == 404
+
+
+def test_candidate_full_profile_tracks_job_and_company_writes(client):
+    from db.models import db, Company, JobApplication, JobPosition, User
+    from utils.db_services.company_service import CompanyService
+    signup_candidate(client, 'applicant')
+    cand_id = login(client, 'applicant').get_json()['candidate_id']
+    owner = User(username='jobsco', role='client', password_hash='x')
+    db.session.add(owner)
+    db.session.flush()
+    company = Company(user_id=owner.id, name='JobsCo')
+    db.session.add(company)
+    db.session.flush()
+    job = JobPosition(company_id=company.id, title='Old title')
+    db.session.add(job)
+    db.session.flush()
+    db.session.add(JobApplication(candidate_id=cand_id, job_position_id=job.id))
+    db.session.commit()
+    company_id, job_id = company.id, job.id
+    url = f'/api/candidate/{cand_id}/full'
+
+    def revalidate(etag):
+        return client.get(url, headers={'If-None-Match': etag}, environ_base={'wsgi.url_scheme': 'https'})
+
+    etag = client.get(url, environ_base={'wsgi.url_scheme': 'https'}).headers['ETag']
+    client.patch(f'/api/jobs/{job_id}', json={'title': 'New title'}, environ_base={'wsgi.url_scheme': 'https'})
+    resp = revalidate(etag)
+    assert resp.status_code == 200
+    assert resp.get_json()['applications'][0]['job_title'] == 'New title'
+
+    CompanyService.update_company(company_id, name='RenamedCo')
+    resp = revalidate(resp.headers['ETag'])
+    assert resp.status_code == 200
+    assert resp.get_json()['applications'][0]['company_name'] == 'RenamedCo'
+
+    assert client.delete(f'/api/jobs/{job_id}', environ_base={'wsgi.url_scheme': 'https'}).status_code == 204
+    resp = revalidate(resp.headers['ETag'])
+    assert resp.status_code == 200
+    assert resp.get_json()['applications'] == []
+
+
+def test_candidate_patch_resolves_skills_in_bulk(client, count_queries):
+    from db.models import db, Skill
+    from utils.skills import skill_ids_cache
+    signup_candidate(client, 'skilled')
+    cand_id = login(client, 'skilled').get_json()['candidate_id']
+    known = [Skill(name=f'known-{n}') for n in range(5)]
+    db.session.add_all(known)
+    db.session.commit()
+    ids = [s.id for s in known]
+    url = f'/api/candidate/{cand_id}/full'
+
+    payload = {'skills': [{'skill_id': sid, 'proficiency': 'Expert'} for sid in ids] + [
+        {'skill_id': 99999},
+        {'name': 'known-0', 'proficiency': 'Beginner'},
+        {'name': ' Brand  New '},
+        {'name': 'Other New'},
+    ]}
+    with count_queries() as statements:
+        resp = client.patch(url, json=payload, environ_base={'wsgi.url_scheme': 'https'})
+    assert resp.status_code == 200
+    skill_selects = [s for s in statements if s.lstrip().upper().startswith('SELECT') and 'FROM skills' in s]
+    # name lookup, lookup of the created names, one IN query for the ids
+    assert len(skill_selects) == 3, skill_selects
+
+    skills = client.get(url, environ_base={'wsgi.url_scheme': 'https'}).get_json()['skills']
+    by_name = {s['name']: s['proficiency'] for s in skills}
+    assert set(by_name) == {f'known-{n}' for n in range(5)} | {'Brand New', 'Other New'}
+    assert by_name['known-0'] == 'Beginner'
+    assert Skill.query.filter_by(name='Brand New').count() == 1
+
+    # names are now served from the cache
+    assert skill_ids_cache.get('Brand New') is not None
+    with count_queries() as statements:
+        client.patch(url, json={'skills': payload['skills'][:5] + [{'name': 'Brand New', 'proficiency': 'Expert'},
+                                                                   {'name': 'Other New'}]},
+                     environ_base={'wsgi.url_scheme': 'https'})
+    assert not [s for s in statements if 'FROM skills' in s]
+    skills = client.get(url, environ_base={'wsgi.url_scheme': 'https'}).get_json()['skills']
+    assert {s['name']: s['proficiency'] for s in skills}['Brand New'] == 'Expert'
+
+
+def test_candidate_patch_syncs_collections_in_bulk(client, count_queries):
+    signup_candidate(client, 'bulk')
+    cand_id = login(client, 'bulk').get_json()['candidate_id']
+    url = f'/api/candidate/{cand_id}/full'
+    https = {'wsgi.url_scheme': 'https'}
+
+    rows = [{'company_name': f'Co{n}', 'position': 'Dev', 'start_date': '2020-01-01'} for n in range(50)]
+    with count_queries() as statements:
+        resp = client.patch(url, json={'employments': rows, 'skills': [{'name': 'python'}]}, environ_base=https)
+    assert resp.status_code == 200
+    assert resp.get_json()['changes']['employments'] == {'inserted': 50, 'updated': 0, 'deleted': 0}
+    inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT INTO EMPLOYMENT_HISTORIES')]
+    assert len(inserts) == 1
+
+    employments = client.get(url, environ_base=https).get_json()['employments']
+    keep = employments[:10]
+    for emp in keep:
+        emp['position'] = 'Lead'
+    # a foreign id is treated as a new row, never as someone else's row
+    payload = {'employments': keep + [{'id': 99999, 'company_name': 'New', 'position': 'CTO',
+                                       'start_date': '2024-05-01', 'candidate_id': 12345}],
+               'skills': []}
+    with count_queries() as statements:
+        resp = client.patch(url, json=payload, environ_base=https)
+    assert resp.get_json()['changes'] == {
+        'employments': {'inserted': 1, 'updated': 10, 'deleted': 40},
+        'skills': {'inserted': 0, 'updated': 0, 'deleted': 1},
+    }
+    writes = [s for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE EMPLOYMENT', 'DELETE'))]
+    assert len(writes) == 4, writes
+
+    data = client.get(url, environ_base=https).get_json()
+    assert data['skills'] == []
+    assert sorted(e['position'] for e in data['employments']) == ['CTO'] + ['Lead'] * 10
+    assert 99999 not in {e['id'] for e in data['employments']}
+
+    # a malformed date is a client error naming the field, and nothing is written
+    resp = client.patch(url, json={'profile': {'city': 'Nowhere'},
+                                   'employments': [{'company_name': 'Bad', 'position': 'X', 'start_date': 'soon'}]},
+                        environ_base=https)
+    assert resp.status_code == 400
+    assert 'start_date' in resp.get_json()['error']
+    data = client.get(url, environ_base=https).get_json()
+    assert data['profile']['city'] != 'Nowhere' and len(data['employments']) == 11
@@ -192,3 +192,128 @@ def test_send_message_bad_request(client):
     assert resp.status_code == 500
     assert b'Internal Server Error' in resp.data
 
+
+
+def _add_threads(owner, count, unread_each=2):
+    from db.models import Conversation, Participant, User
+    from backend.blueprints.chat.routes import record_message
+    for _ in range(count):
+        other = User(username=f'peer{uuid.uuid4().hex[:8]}', role='candidate')
+        other.set_password('p')
+        conv = Conversation()
+        db.session.add_all([other, conv])
+        db.session.flush()
+        db.session.add_all([
+            Participant(conversation_id=conv.id, user_id=owner.id),
+            Participant(conversation_id=conv.id, user_id=other.id),
+        ])
+        for i in range(unread_each):
+            record_message(conv, other.id, f'm{i}')
+        record_message(conv, owner.id, 'reply')
+    db.session.commit()
+
+
+def test_inbox_query_count_is_constant(client, app, count_queries):
+    from db.models import User
+    owner = User(username='inboxowner', role='client')
+    owner.set_password('pass')
+    db.session.add(owner)
+    db.session.commit()
+    login(client, 'inboxowner')
+
+    _add_threads(owner, 2)
+    with count_queries() as small:
+        resp = client.get('/api/conversations', environ_base={'wsgi.url_scheme': 'https'})
+    assert len(resp.get_json()) == 2
+
+    _add_threads(owner, 20)
+    with count_queries() as large:
+        resp = client.get('/api/conversations', environ_base={'wsgi.url_scheme': 'https'})
+    convs = resp.get_json()
+    assert len(convs) == 22
+    assert len(large) == len(small)
+    assert all(c['unread_count'] == 2 for c in convs)
+    assert all(c['last_message']['body'] == 'reply' for c in convs)
+    assert all(len(c['participants']) == 2 for c in convs)
+
+
+def test_conversation_summary_maintained_on_write(client, app):
+    from db.models import Conversation, Participant
+    conv_id, cand_id, cand_name, client_name = create_conversation_named(client)
+    login(client, cand_name)
+    for body in ('one', 'two'):
+        client.post(f'/api/conversations/{conv_id}/messages', json={'body': body},
+                    environ_base={'wsgi.url_scheme': 'https'})
+
+    conv = db.session.get(Conversation, conv_id)
+    assert conv.message_count == 2
+    assert db.session.get(Message, conv.last_message_id).body == 'two'
+
+    login(client, client_name)
+    inbox = client.get('/api/conversations', environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    row = next(c for c in inbox if c['id'] == conv_id)
+    assert row['unread_count'] == 2
+    assert row['last_message']['body'] == 'two'
+
+    client.post(f'/api/conversations/{conv_id}/mark_read', environ_base={'wsgi.url_scheme': 'https'})
+    inbox = client.get('/api/conversations', environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert next(c for c in inbox if c['id'] == conv_id)['unread_count'] == 0
+
+    client.delete(f'/api/conversations/{conv_id}', environ_base={'wsgi.url_scheme': 'https'})
+    db.session.expire_all()
+    remaining = Participant.query.filter_by(conversation_id=conv_id).all()
+    assert len(remaining) == 1 and remaining[0].unread_count == 0
+
+
+def test_participant_display_names_batched(client, count_queries):
+    conv_id, cand_id, cand_name, client_name = create_conversation_named(client)
+    login(client, cand_name)
+    with count_queries() as statements:
+        resp = client.get(f'/api/conversations/{conv_id}/participants',
+                          environ_base={'wsgi.url_scheme': 'https'})
+    names = {p['display_name'] for p in resp.get_json()}
+    assert names == {cand_name, f'{client_name}Co'}
+    # user loader + conversation + membership check + participants + names
+    assert len(statements) <= 5
+
+    inbox = client.get('/api/conversations', environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    row = next(c for c in inbox if c['id'] == conv_id)
+    assert {p['display_name'] for p in row['participants']} == names
+
+
+def test_keyset_message_pagination(client, count_queries):
+    conv_id, cand_id, cand_name, client_name = create_conversation_named(client)
+    login(client, cand_name)
+    for i in range(7):
+        client.post(f'/api/conversations/{conv_id}/messages', json={'body': f'm{i}'},
+                    environ_base={'wsgi.url_scheme': 'https'})
+
+    url = f'/api/conversations/{conv_id}/messages'
+    seen = []
+    params = {'limit': 3}
+    while True:
+        with count_queries() as statements:
+            page = client.get(url, query_string=params, environ_base={'wsgi.url_scheme': 'https'}).get_json()
+        assert not any('count(' in s.lower() for s in statements)
+        assert 'total' not in page
+        seen.extend(m['body'] for m in page['items'])
+        if not page['next_cursor']:
+            break
+        params = {'limit': 3, 'before_id': page['next_cursor']}
+    assert seen == [f'm{i}' for i in reversed(range(7))]
+
+    first_id = client.get(url, query_string={'limit': 7},
+                          environ_base={'wsgi.url_scheme': 'https'}).get_json()['items'][-1]['id']
+    newer = client.get(url, query_string={'after_id': first_id, 'limit': 2},
+                       environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert [m['body'] for m in newer['items']] == ['m1', 'm2']
+    assert newer['has_more'] is True
+
+    both = client.get(url, query_string={'after_id': first_id, 'before_id': first_id},
+                      environ_base={'wsgi.url_scheme': 'https'})
+    assert both.status_code == 400
+    unknown = client.get(url, query_string={'before_id': 999999}, environ_base={'wsgi.url_scheme': 'https'})
+    assert unknown.status_code == 400 and unknown.get_json()['error'] == 'Unknown cursor'
+    for bad in ({'before_id': 'abc'}, {'after_id': '1.5'}, {'limit': 'ten'}):
+        resp = client.get(url, query_string=bad, environ_base={'wsgi.url_scheme': 'https'})
+        assert resp.status_code == 400 and 'must be an integer' in resp.get_json()['error']
@@ -59,3 +59,58 @@ def test_update_company_validation_error(client):
     resp = client.patch(f'/api/client/{comp_id}', json={'latitude': 'bad'}, environ_base={'wsgi.url_scheme':'https'})
     assert resp.status_code == 400
 
+
+
+def test_client_dashboard_aggregates_with_flat_query_count(client, assert_max_queries):
+    from db.models import (db, CandidateProfile, Hire, JobApplication, JobPosition,
+                           Participant, User)
+    signup_client(client, 'dashco')
+    body = login(client, 'dashco').get_json()
+    company_id, user_id = body['company_id'], body['user_id']
+
+    def add_jobs(count, statuses):
+        for n in range(count):
+            job = JobPosition(company_id=company_id, title=f'Job{n}')
+            db.session.add(job)
+            db.session.flush()
+            for status in statuses:
+                person = User(username=f'dash{job.id}{status}', role='candidate', password_hash='x')
+                db.session.add(person)
+                db.session.flush()
+                cand = CandidateProfile(user_id=person.id, full_name='C', email=f'{person.username}@x.com')
+                db.session.add(cand)
+                db.session.flush()
+                db.session.add(JobApplication(candidate_id=cand.id, job_position_id=job.id, status=status))
+        db.session.commit()
+        return cand
+
+    cand = add_jobs(2, ['Applied', 'Interview'])
+    db.session.add(Hire(client_id=user_id, candidate_id=cand.id, status='active'))
+    db.session.add(Participant(conversation_id=1, user_id=user_id, unread_count=4))
+    db.session.commit()
+
+    with assert_max_queries(7):
+        resp = client.get('/api/client/', environ_base={'wsgi.url_scheme': 'https'})
+    data = resp.get_json()
+    assert data['companyId'] == company_id
+    assert data['stats'] == {
+        'job_count': 2,
+        'applications_by_status': {'Applied': 2, 'Interview': 2},
+        'application_count': 4,
+        'active_hires': 1,
+        'unread_messages': 4,
+    }
+    assert data['company']['job_positions'][0]['applications'] == {'Applied': 1, 'Interview': 1}
+    assert data['company']['job_positions_has_more'] is False
+
+    add_jobs(5, ['Applied', 'Offer', 'Rejected'])
+    with assert_max_queries(7):
+        resp = client.get('/api/client/', query_string={'jobs_limit': 3}, environ_base={'wsgi.url_scheme': 'https'})
+    data = resp.get_json()
+    assert len(data['company']['job_positions']) == 3
+    assert data['company']['job_positions_has_more'] is True
+    assert [job['applications'] for job in data['company']['job_positions']] == \
+        [{'Applied': 1, 'Offer': 1, 'Rejected': 1}] * 3
+    assert data['stats']['job_count'] == 7
+    assert data['stats']['application_count'] == 19
+    assert data['stats']['applications_by_status'] == {'Applied': 7, 'Interview': 2, 'Offer': 5, 'Rejected': 5}
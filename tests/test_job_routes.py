@@ -57,3 +57,151 @@ def test_duplicate_application(client):
     assert resp.status_code == 500
 
 
+
+
+def test_job_full_text_search_ranked_and_synced(client):
+    cid = create_company(client, 'ftsemp')
+    py = create_job(client, cid, title='Python Developer', description='Django and Flask',
+                    location='Cluj-Napoca').get_json()['id']
+    other = create_job(client, cid, title='Accountant', description='Some python scripting',
+                       location='Bucharest').get_json()['id']
+    create_job(client, cid, title='Designer', description='Figma', location='Cluj-Napoca')
+
+    def search(**params):
+        resp = client.get('/api/jobs', query_string=params, environ_base={'wsgi.url_scheme': 'https'})
+        return [item['id'] for item in resp.get_json()['items']]
+
+    # title hit ranks above a description-only hit; prefixes match
+    assert search(q='pyth') == [py, other]
+    # user input is never parsed as FTS syntax
+    assert search(q='python* ("') == [py, other]
+    assert search(q='python', location='cluj') == [py]
+    # a search with nothing searchable in it matches nothing, not everything
+    assert search(q='!!!') == []
+    assert search(location='--') == []
+
+    client.put(f'/api/jobs/{other}', json={'description': 'Spreadsheets'},
+               environ_base={'wsgi.url_scheme': 'https'})
+    client.delete(f'/api/jobs/{py}', environ_base={'wsgi.url_scheme': 'https'})
+    assert search(q='python') == []
+    assert search(q='spreadsheets') == [other]
+
+
+def test_job_reads_do_not_load_companies_per_row(client, assert_max_queries):
+    cid = create_company(client, 'eageremp')
+    other = create_company(client, 'eageremp2')
+    job_ids = [create_job(client, company).get_json()['id'] for company in [cid, other] * 10]
+    client.post('/api/auth/logout', environ_base={'wsgi.url_scheme': 'https'})
+
+    # page query + count, independent of how many companies are on the page
+    with assert_max_queries(2):
+        resp = client.get('/api/jobs', query_string={'per_page': 100}, environ_base={'wsgi.url_scheme': 'https'})
+    items = resp.get_json()['items']
+    assert len(items) == 20 and all(item['company_name'] for item in items)
+
+    with assert_max_queries(2):
+        resp = client.get('/api/jobs', query_string={'q': 'role'}, environ_base={'wsgi.url_scheme': 'https'})
+    assert len(resp.get_json()['items']) == 20
+
+    with assert_max_queries(1):
+        assert client.get(f'/api/jobs/{job_ids[0]}', environ_base={'wsgi.url_scheme': 'https'}).get_json()['company_name']
+
+    with assert_max_queries(2):
+        resp = client.get(f'/api/companies/{cid}/jobs', environ_base={'wsgi.url_scheme': 'https'})
+    assert len(resp.get_json()) == 10
+
+
+def test_job_list_count_modes(client, count_queries):
+    cid = create_company(client, 'countemp')
+    for _ in range(5):
+        create_job(client, cid, remote=True)
+    create_job(client, cid, remote=False)
+
+    def listing(**params):
+        with count_queries() as statements:
+            resp = client.get('/api/jobs', query_string={'remote': 'true', 'per_page': 2, **params},
+                              environ_base={'wsgi.url_scheme': 'https'})
+        counts = [s for s in statements if 'count(' in s.lower()]
+        return resp.get_json(), counts
+
+    body, counts = listing()
+    assert body['total_items'] == 5 and body['has_next'] and len(counts) == 1
+
+    body, counts = listing(count='none', page=3)
+    assert len(body['items']) == 1 and not body['has_next'] and not counts
+    assert 'total_items' not in body
+
+    body, counts = listing(count='cached')
+    assert body['total_items'] == 5 and body['total_pages'] == 3 and len(counts) == 1
+    body, counts = listing(count='cached', page=2)
+    assert body['total_items'] == 5 and body['has_next'] and not counts
+
+    # writes drop cached totals
+    create_job(client, cid, remote=True)
+    body, counts = listing(count='cached')
+    assert body['total_items'] == 6 and len(counts) == 1
+
+
+def test_job_list_async_count(client):
+    import eventlet
+    cid = create_company(client, 'asyncemp')
+    for _ in range(3):
+        create_job(client, cid)
+
+    def listing():
+        return client.get('/api/jobs', query_string={'count': 'async'},
+                          environ_base={'wsgi.url_scheme': 'https'}).get_json()
+
+    first = listing()
+    assert first['total_items'] is None and len(first['items']) == 3
+    for _ in range(50):
+        eventlet.sleep(0.01)
+        body = listing()
+        if body['total_items'] is not None:
+            break
+    assert body['total_items'] == 3
+
+
+def test_job_stats_and_paged_applications(client, assert_max_queries):
+    from datetime import datetime
+    from db.models import db, CandidateProfile, JobApplication, User
+    cid = create_company(client, 'statsemp')
+    job_id = create_job(client, cid).get_json()['id']
+    statuses = ['Applied', 'Applied', 'Interview', 'Rejected', 'Applied']
+    days = [datetime(2026, 1, 1, 9), datetime(2026, 1, 1, 17), datetime(2026, 1, 2),
+            datetime(2026, 1, 2), datetime(2026, 1, 3)]
+    for n, (status, applied_at) in enumerate(zip(statuses, days)):
+        person = User(username=f'stats{n}', role='candidate', password_hash='x')
+        db.session.add(person)
+        db.session.flush()
+        cand = CandidateProfile(user_id=person.id, full_name=f'Cand {n}', email=f'stats{n}@x.com')
+        db.session.add(cand)
+        db.session.flush()
+        db.session.add(JobApplication(candidate_id=cand.id, job_position_id=job_id,
+                                      status=status, applied_at=applied_at))
+    db.session.commit()
+
+    stats = client.get(f'/api/jobs/{job_id}/stats', environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert stats['total'] == 5
+    assert stats['by_status'] == {'Applied': 3, 'Interview': 1, 'Rejected': 1}
+    assert stats['by_day'] == [{'date': '2026-01-01', 'count': 2}, {'date': '2026-01-02', 'count': 2},
+                               {'date': '2026-01-03', 'count': 1}]
+
+    names, params = [], {'limit': 2}
+    while True:
+        with assert_max_queries(2):
+            page = client.get(f'/api/jobs/{job_id}/applications', query_string=params,
+                              environ_base={'wsgi.url_scheme': 'https'}).get_json()
+        names.extend(item['candidate_name'] for item in page['items'])
+        if not page['next_cursor']:
+            break
+        params = {'limit': 2, 'after_id': page['next_cursor']}
+    assert names == [f'Cand {n}' for n in range(5)]
+
+    page = client.get(f'/api/jobs/{job_id}/applications', query_string={'status': 'Applied'},
+                      environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert [item['candidate_name'] for item in page['items']] == ['Cand 0', 'Cand 1', 'Cand 4']
+
+    with assert_max_queries(2):
+        legacy = client.get(f'/api/jobs/{job_id}/applications', environ_base={'wsgi.url_scheme': 'https'}).get_json()
+    assert len(legacy) == 5
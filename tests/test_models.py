@@ -38,3 +38,52 @@ def test_job_application_relationships(app):
 
     assert app_obj.job_position is job
     assert app_obj in job.job_applications
+
+
+def _query_plan(query):
+    sql = str(query.statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_hot_lookups_use_indexes(app):
+    from db.models import EmploymentHistory, Hire, Participant
+    hot = {
+        # login -> resolve_profile_id
+        'ix_companies_user_id': db.session.query(Company.id).filter_by(user_id=1),
+        'ix_candidate_profiles_user_id': db.session.query(CandidateProfile.id).filter_by(user_id=1),
+        # hire_candidate duplicate check
+        'ix_hires_client_candidate_status': Hire.query.filter_by(client_id=1, candidate_id=2, status='active'),
+        # apply_to_job duplicate check
+        'uq_job_applications_candidate_job': JobApplication.query.filter_by(candidate_id=1, job_position_id=2),
+        'ix_job_applications_job_position_id': JobApplication.query.filter_by(job_position_id=2),
+        # company job listings / client dashboard
+        'ix_job_positions_company_id': JobPosition.query.filter_by(company_id=1),
+        'ix_participants_user_id': Participant.query.filter_by(user_id=1),
+        'ix_employment_histories_candidate_id': EmploymentHistory.query.filter_by(candidate_id=1),
+    }
+    for index, query in hot.items():
+        plan = _query_plan(query)
+        assert index in plan, plan
+
+
+def test_duplicate_application_rejected_by_database(app):
+    import pytest
+    from sqlalchemy.exc import IntegrityError
+    owner = User(username='uqowner', role='client', password_hash='x')
+    person = User(username='uqperson', role='candidate', password_hash='x')
+    db.session.add_all([owner, person])
+    db.session.flush()
+    company = Company(user_id=owner.id, name='UQ')
+    candidate = CandidateProfile(user_id=person.id, full_name='U Q', email='u@q.com')
+    db.session.add_all([company, candidate])
+    db.session.flush()
+    job = JobPosition(company_id=company.id, title='Dev')
+    db.session.add(job)
+    db.session.flush()
+    db.session.add(JobApplication(candidate_id=candidate.id, job_position_id=job.id))
+    db.session.commit()
+    db.session.add(JobApplication(candidate_id=candidate.id, job_position_id=job.id))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
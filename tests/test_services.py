@@ -206,3 +206,46 @@ def test_candidate_service_commit_failures_extended(app, monkeypatch):
     check(lambda: CandidateSkillService.remove_skill(profile.id, new_skill.id))
     check(lambda: EducationService.update_education(edu.id, degree='MS'))
     check(lambda: EducationService.delete_education(edu.id))
+
+
+def test_service_batch_commits_once(app, count_queries):
+    from sqlalchemy import event
+    from db.models import CandidateProfile
+    commits = []
+
+    def record_commit(session):
+        commits.append(1)
+    event.listen(db.session, 'after_commit', record_commit)
+    skills = [SkillService.create_skill(f'batch-{n}') for n in range(20)]
+    commits.clear()
+
+    with count_queries() as statements:
+        with CandidateProfileService.batch():
+            profile = CandidateProfileService.create_profile(user_id=7, full_name='Batch', email='batch@x.com')
+            for n in range(10):
+                EmploymentHistoryService.create_employment(
+                    candidate_id=profile.id, company_name=f'Co{n}', position='Dev', start_date=date(2020, 1, 1))
+            with CompanyService.batch():
+                company = CompanyService.create_company(user_id=8, name='Nested')
+                JobPositionService.create_job(company_id=company.id, title='Role')
+            for skill in skills:
+                CandidateSkillService.add_skill(profile.id, skill.id, proficiency='Mid')
+    assert len(commits) == 1
+    # one version bump for the whole batch, not one per call
+    assert len([s for s in statements if s.startswith('UPDATE candidate_profiles')]) == 1
+    db.session.expire_all()
+    profile = db.session.get(CandidateProfile, profile.id)
+    assert (len(profile.employments), len(profile.candidate_skills), profile.version) == (10, 20, 2)
+
+    # a failing block leaves nothing behind
+    with pytest.raises(RuntimeError):
+        with CandidateProfileService.batch():
+            EducationService.add_education(candidate_id=profile.id, institution='U')
+            raise RuntimeError('abort')
+    assert len(commits) == 1
+    assert EducationService.get_education(1) is None
+
+    # outside a batch every call still commits on its own
+    EducationService.add_education(candidate_id=profile.id, institution='U')
+    assert len(commits) == 2
+    event.remove(db.session, 'after_commit', record_commit)
@@ -3,6 +3,8 @@ from flask_socketio import SocketIO
 from flask_login import LoginManager
 from flask_limiter import Limiter
 
+from utils.cache import TTLCache
+from utils import passwords
 from utils.security import sanitize_html
 
 
@@ -19,3 +21,81 @@ def test_sanitize_html():
     assert '<b>bold</b>' in clean
     assert 'onclick' not in clean
     assert 'href="https://x.com"' in clean
+
+
+def test_ttl_cache_eviction_and_expiry():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)  # evicts least recently used ('b')
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    cache.invalidate('c')
+    assert cache.get('c', 'gone') == 'gone'
+
+    expired = TTLCache(ttl=0)
+    expired.set('x', 1)
+    assert expired.get('x') is None
+    assert expired.stats()['misses'] == 1
+
+
+def test_password_needs_rehash():
+    pwhash = passwords.hash_password('pw', method='pbkdf2:sha256:1000')
+    assert passwords.verify_password(pwhash, 'pw')
+    assert not passwords.needs_rehash(pwhash, 'pbkdf2:sha256:1000')
+    assert not passwords.needs_rehash(pwhash, 'pbkdf2:sha256')
+    assert passwords.needs_rehash(pwhash, 'pbkdf2:sha256:2000')
+    assert passwords.needs_rehash(pwhash, 'scrypt')
+
+
+def test_password_hashing_offloaded_to_thread_pool(app, monkeypatch):
+    calls = []
+    real_execute = passwords.tpool.execute
+
+    def execute(func, *args):
+        calls.append(func.__name__)
+        return real_execute(func, *args)
+
+    monkeypatch.setattr(passwords.tpool, 'execute', execute)
+    pwhash = passwords.hash_password('pw', method='pbkdf2:sha256:1000')
+    assert passwords.verify_password(pwhash, 'pw')
+    assert calls == ['generate_password_hash', 'check_password_hash']
+
+    calls.clear()
+    app.config['PASSWORD_HASH_OFFLOAD'] = False
+    try:
+        passwords.verify_password(pwhash, 'pw')
+    finally:
+        app.config['PASSWORD_HASH_OFFLOAD'] = True
+    assert calls == []
+
+
+def test_hash_passwords_in_parallel_keeps_order(app):
+    words = [f'pw{n}' for n in range(12)]
+    for offload in (True, False):
+        app.config['PASSWORD_HASH_OFFLOAD'] = offload
+        try:
+            hashes = passwords.hash_passwords(words, workers=4, method='pbkdf2:sha256:1000')
+        finally:
+            app.config['PASSWORD_HASH_OFFLOAD'] = True
+        assert [passwords.verify_password(h, w) for h, w in zip(hashes, words)] == [True] * len(words)
+        assert not passwords.needs_rehash(hashes[0], 'pbkdf2:sha256:1000')
+
+
+def test_query_fingerprint_and_slow_log_eviction():
+    from utils.instrumentation import SlowQueryLog, fingerprint
+    assert fingerprint("SELECT * FROM jobs WHERE title LIKE '%py%' AND id IN (1, 2, 3) LIMIT 20") == \
+        fingerprint("SELECT *  FROM jobs\nWHERE title LIKE 'x' AND id IN (?) LIMIT ?") == \
+        "SELECT * FROM jobs WHERE title LIKE ? AND id IN (?+) LIMIT ?"
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?+)"
+
+    log = SlowQueryLog(top_n=2)
+    log.record("SELECT a FROM t WHERE id = 1", (), 0.5, '/a')
+    log.record("SELECT a FROM t WHERE id = 2", (), 0.1, '/b')
+    log.record("SELECT b FROM u", (), 0.1, '/b')
+    log.record("SELECT c FROM v", (), 0.3, '/c')  # evicts the cheapest entry
+    top = log.top()
+    assert [row['fingerprint'] for row in top] == ["SELECT a FROM t WHERE id = ?", "SELECT c FROM v"]
+    assert top[0]['count'] == 2 and top[0]['total_ms'] == 600.0
+    assert top[0]['endpoints'] == {'/a': 1, '/b': 1}